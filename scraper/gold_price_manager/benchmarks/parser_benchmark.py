@@ -0,0 +1,116 @@
+"""
+Ayrıştırıcı karşılaştırma ölçümü - UzmanPara sayfasının tam ve hızlı ayrıştırma yollarını karşılaştırır.
+
+Kullanım (gold_price_manager dizininden):
+    python -m benchmarks.parser_benchmark [--html SAYFA.html] [--repeat N]
+
+--html verilmezse benchmarks/fixtures/uzmanpara_sample.html kullanılır; --live ile canlı sayfa çekilir.
+"""
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import config
+from data_sources.uzmanpara_parser import stream_price_table
+from data_sources.uzmanpara_source import UzmanParaSource
+
+DEFAULT_FIXTURE = Path(__file__).parent / 'fixtures' / 'uzmanpara_sample.html'
+
+
+class _StaticResponse:
+    """
+    process_data için yalnızca .content taşıyan yanıt nesnesi.
+    """
+
+    def __init__(self, content):
+        self.content = content
+
+
+def measure(source, content, repeat):
+    """
+    Bir ayrıştırıcı modunun süresini ve en yüksek bellek kullanımını ölçer.
+
+    Args:
+        source (UzmanParaSource): Ölçülecek moda ayarlı kaynak.
+        content (bytes): Sayfa içeriği.
+        repeat (int): Tekrar sayısı.
+
+    Returns:
+        dict: Sonuç, süre istatistikleri (ms) ve en yüksek bellek (KB).
+    """
+    response = _StaticResponse(content)
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = source.process_data(response)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    source.process_data(response)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'result': result,
+        'median_ms': statistics.median(timings),
+        'min_ms': min(timings),
+        'peak_kb': peak / 1024,
+    }
+
+
+def measure_stream(content, chunk_size):
+    """
+    Akış modunda tablo bitene kadar okunan bayt sayısını ve süreyi ölçer.
+
+    Args:
+        content (bytes): Sayfa içeriği.
+        chunk_size (int): Parça boyutu.
+
+    Returns:
+        tuple: (okunan_bayt, süre_ms) çifti.
+    """
+    started = time.perf_counter()
+    _, bytes_read, _ = stream_price_table(
+        content[offset:offset + chunk_size] for offset in range(0, len(content), chunk_size)
+    )
+    return bytes_read, (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='UzmanPara ayrıştırıcı karşılaştırması')
+    parser.add_argument('--html', type=Path, default=DEFAULT_FIXTURE, help='Ölçümde kullanılacak HTML dosyası')
+    parser.add_argument('--live', action='store_true', help='Canlı sayfayı çekip kullan')
+    parser.add_argument('--repeat', type=int, default=50, help='Tekrar sayısı')
+    args = parser.parse_args()
+
+    if args.live:
+        content = UzmanParaSource(streaming=False).fetch_data().content
+    else:
+        content = args.html.read_bytes()
+
+    full = measure(UzmanParaSource(parser_mode='full'), content, args.repeat)
+    fast = measure(UzmanParaSource(parser_mode='fast'), content, args.repeat)
+
+    identical = full['result'] == fast['result'] and list(full['result']) == list(fast['result'])
+
+    print(f"Sayfa boyutu: {len(content)} byte, altın türü: {len(full['result'])}")
+    print(f"{'mod':<6}{'medyan (ms)':>14}{'en az (ms)':>14}{'tepe bellek (KB)':>20}")
+    for name, stats in (('full', full), ('fast', fast)):
+        print(f"{name:<6}{stats['median_ms']:>14.3f}{stats['min_ms']:>14.3f}{stats['peak_kb']:>20.1f}")
+    print(f"Hızlanma: {full['median_ms'] / fast['median_ms']:.1f}x, "
+          f"bellek: {full['peak_kb'] / fast['peak_kb']:.1f}x daha az")
+    print(f"Çıktılar aynı: {'evet' if identical else 'HAYIR'}")
+
+    bytes_read, stream_ms = measure_stream(content, config.STREAM_CHUNK_SIZE)
+    print(f"Akış modu: {bytes_read}/{len(content)} byte okundu "
+          f"({config.STREAM_CHUNK_SIZE} byte parçalar), {stream_ms:.3f} ms")
+
+    return 0 if identical else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""
+Uçtan uca işlem hattı ölçümü - Toplama, doğrulama, kaydetme ve hesaplama adımlarını ağ ve MongoDB
+sunucusu olmadan (kayıttan oynatma kaynağı ve bellek içi veritabanıyla) ölçer.
+
+Kullanım (gold_price_manager dizininden):
+    python -m benchmarks.pipeline_benchmark [--scale 1 --scale 100] [--repeat N] [--fail-on-regression]
+
+Ölçek çarpanı kayıtlı sayfadaki altın türü sayısını çoğaltır (100: sayfa başına ~2300 tür). Sonuçlar
+her çalıştırmada --history dosyasına eklenir ve aynı ölçekteki bir önceki çalıştırmayla karşılaştırılır.
+"""
+import os
+
+# Ölçüm sunucusuz ve sessiz çalışır (yapılandırma içe aktarılmadan önce ayarlanmalıdır)
+os.environ.setdefault('MONGO_CONNECTION_STRING', 'memory://benchmark')
+os.environ.setdefault('LOG_LEVEL', 'ERROR')
+os.environ.setdefault('LOG_FILE', os.devnull)
+
+import argparse
+import json
+import platform
+import random
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import config
+from data_sources.interface import reset_sources
+from data_sources.replay_source import ReplayResponse, ReplaySource
+from data_sources.uzmanpara_source import UzmanParaSource
+from processors.data_validator import DataValidator
+from processors.percentage_calculator import PercentageCalculator
+from utils.db_handler import DatabaseHandler
+from utils.validators import validate_price_data
+
+FIXTURE_DIR = Path(__file__).parent / 'fixtures'
+DEFAULT_HISTORY = Path(__file__).parent / 'results' / 'pipeline_history.jsonl'
+
+# Altın fiyat tablosunun satırları (döviz tablosunun satırlarında sınıf yoktur)
+_GOLD_ROW_PATTERN = re.compile(r'<tr class="(?:even|odd)">.*?</tr>', re.DOTALL)
+_GOLD_NAME_PATTERN = re.compile(r'title="([^"]+)"')
+
+
+def scale_fixture(content, factor):
+    """
+    Kayıtlı sayfadaki altın fiyat satırlarını yeni adlarla çoğaltır.
+
+    Args:
+        content (bytes): Kayıtlı sayfa.
+        factor (int): Çarpan; 1 ise sayfa değişmez.
+
+    Returns:
+        bytes: Ölçeklenmiş sayfa.
+    """
+    if factor <= 1:
+        return content
+
+    text = content.decode('utf-8')
+    rows = list(_GOLD_ROW_PATTERN.finditer(text))
+    copies = []
+    for copy_number in range(1, factor):
+        for match in rows:
+            row = match.group(0)
+            name = _GOLD_NAME_PATTERN.search(row).group(1)
+            copies.append(row.replace(name, f"{name} {copy_number}"))
+
+    insert_at = rows[-1].end()
+    return (text[:insert_at] + '\n' + '\n'.join(copies) + text[insert_at:]).encode('utf-8')
+
+
+def seed_history(db_handler, prices, days, seed=42):
+    """
+    Bugünden önceki günler için rastgele yürüyüşle fiyat geçmişi oluşturur.
+
+    Args:
+        db_handler (DatabaseHandler): Bellek içi veritabanı işleyicisi.
+        prices (dict): Bugünün fiyatları.
+        days (int): Geçmiş gün sayısı.
+        seed (int): Rastgele sayı tohumu.
+    """
+    rng = random.Random(seed)
+    today = datetime.strptime(db_handler.current_date(), config.DATE_FORMAT)
+    current = {gold_type: dict(values) for gold_type, values in prices.items()}
+
+    for offset in range(1, days + 1):
+        for values in current.values():
+            factor = 1 + rng.gauss(0, 0.004)
+            values['Alış Fiyatı'] = round(values['Alış Fiyatı'] / factor, 2)
+            values['Satış Fiyatı'] = round(values['Satış Fiyatı'] / factor, 2)
+        date = (today - timedelta(days=offset)).strftime(config.DATE_FORMAT)
+        db_handler.insert_gold_prices(current, date)
+
+
+def time_stage(func, repeat):
+    """
+    Fonksiyonu tekrar tekrar çalıştırıp medyan süreyi döndürür.
+
+    Args:
+        func (callable): Ölçülecek fonksiyon.
+        repeat (int): Tekrar sayısı.
+
+    Returns:
+        float: Medyan süre (ms).
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def run_scale(scale, repeat):
+    """
+    Tüm adımları verilen ölçekte ölçer.
+
+    Args:
+        scale (int): Altın türü çarpanı.
+        repeat (int): Adım başına tekrar sayısı.
+
+    Returns:
+        tuple: (altın_türü_sayısı, {adım: medyan_ms}) çifti.
+    """
+    content = scale_fixture((FIXTURE_DIR / 'uzmanpara_sample.html').read_bytes(), scale)
+
+    with tempfile.TemporaryDirectory() as fixture_dir:
+        (Path(fixture_dir) / 'page.html').write_bytes(content)
+        replay = ReplaySource(fixture_dir=fixture_dir, speed=0)
+        parser = UzmanParaSource(parser_mode='fast', streaming=False)
+        response = ReplayResponse(content, 'benchmark')
+        prices = parser.process_data(response)
+
+        # Her ölçek kendi bellek içi veritabanını kullanır
+        db_handler = DatabaseHandler(connection_string=f"memory://benchmark-{scale}")
+        seed_history(db_handler, prices, config.VALIDATION_WINDOW_SIZE)
+        validator = DataValidator(db_handler)
+        calculator = PercentageCalculator(db_handler)
+        today = db_handler.current_date()
+        latest_doc = {'date': today, 'data': prices}
+
+        stages = {
+            'replay_get_data': lambda: replay.get_data(),
+            'process_data': lambda: parser.process_data(response),
+            'validate_price_data': lambda: validate_price_data(prices),
+            'data_validator': lambda: validator.validate_complete_dataset(prices),
+            'insert_gold_prices': lambda: db_handler.insert_gold_prices(prices, today),
+            'insert_intraday_prices': lambda: db_handler.insert_intraday_prices({replay.name: prices}),
+            'percentage_calculator': lambda: calculator.process_daily_differences(latest_doc),
+        }
+        results = {name: time_stage(func, repeat) for name, func in stages.items()}
+
+        # Uçtan uca: kaynak -> doğrulama -> kaydetme -> hesaplama (değişiklik algılama kapalı)
+        import main
+        config.ACTIVE_SOURCES = ['ReplaySource']
+        config.REPLAY_FIXTURE_DIR = fixture_dir
+        config.REPLAY_SPEED = 0
+        config.CHANGE_DETECTION_ENABLED = False
+        # Kaynak örnekleri döngüler arasında saklandığından yeni fikstür dizini için yeniden oluşturulur
+        reset_sources()
+        results['full_cycle'] = time_stage(lambda: main.run_full_process(db_handler), repeat)
+
+    return len(prices), results
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_previous(history_path, scale):
+    """
+    Geçmiş dosyasından aynı ölçekteki son çalıştırmayı döndürür.
+
+    Args:
+        history_path (Path): JSON satırları dosyası.
+        scale (int): Ölçek.
+
+    Returns:
+        dict or None: Son kayıt.
+    """
+    if not history_path.exists():
+        return None
+
+    previous = None
+    with history_path.open(encoding='utf-8') as history_file:
+        for line in history_file:
+            if line.strip():
+                entry = json.loads(line)
+                if entry.get('scale') == scale:
+                    previous = entry
+    return previous
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Uçtan uca işlem hattı ölçümü')
+    parser.add_argument('--scale', type=int, action='append',
+                        help='Altın türü çarpanı (tekrarlanabilir), varsayılan: 1 ve 100')
+    parser.add_argument('--repeat', type=int, default=10, help='Adım başına tekrar sayısı')
+    parser.add_argument('--history', type=Path, default=DEFAULT_HISTORY, help='Sonuç geçmişi dosyası (JSON satırları)')
+    parser.add_argument('--no-record', action='store_true', help='Sonuçları geçmiş dosyasına ekleme')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Gerileme sayılacak yavaşlama oranı, varsayılan: 0.25 (%%25)')
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help='Gerileme varsa sıfırdan farklı çıkış kodu döndür')
+    args = parser.parse_args()
+
+    regressions = []
+    for scale in args.scale or [1, 100]:
+        gold_types, results = run_scale(scale, args.repeat)
+        previous = load_previous(args.history, scale)
+
+        print(f"\nÖlçek {scale}x: {gold_types} altın türü, {config.VALIDATION_WINDOW_SIZE} günlük geçmiş")
+        print(f"{'adım':<24}{'medyan (ms)':>14}{'önceki (ms)':>14}{'değişim':>10}")
+        for name, median_ms in results.items():
+            before = (previous or {}).get('stages', {}).get(name)
+            if before:
+                change = median_ms / before - 1
+                flag = '  GERİLEME' if change > args.threshold else ''
+                if flag:
+                    regressions.append(f"{scale}x {name}")
+                print(f"{name:<24}{median_ms:>14.3f}{before:>14.3f}{change:>+10.0%}{flag}")
+            else:
+                print(f"{name:<24}{median_ms:>14.3f}{'-':>14}{'-':>10}")
+
+        if not args.no_record:
+            args.history.parent.mkdir(parents=True, exist_ok=True)
+            entry = {
+                'timestamp': datetime.now().strftime(config.DATETIME_FORMAT),
+                'commit': git_commit(),
+                'python': platform.python_version(),
+                'scale': scale,
+                'gold_types': gold_types,
+                'repeat': args.repeat,
+                'stages': results,
+            }
+            with args.history.open('a', encoding='utf-8') as history_file:
+                history_file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    if regressions:
+        print(f"\nGerileme (>{args.threshold:.0%}): {', '.join(regressions)}")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
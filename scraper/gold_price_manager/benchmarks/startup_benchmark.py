@@ -0,0 +1,142 @@
+"""
+Başlangıç süresi ölçümü - Her komut satırı modunu ayrı bir süreçte main.main() üzerinden bir kez
+çalıştırıp içe aktarma ve ilk çalıştırma süresini ölçer.
+
+Kullanım (gold_price_manager dizininden):
+    python -m benchmarks.startup_benchmark [--repeat N] [--mode MOD]
+
+Modlar gerçek giriş yolundan çalıştırıldığı için main.py'nin tembel yüklemeleri (numpy, bs4, requests)
+ayrıca listelenmez. Ağ yerine kayıtlı sayfaları sunan ReplaySource, MongoDB yerine bellek içi veritabanı
+kullanılır; hesaplama modlarının veri bulması için veritabanına önceden birkaç günlük fiyat yazılır.
+Zamanlayıcı modu tüm işler bir kez çalışınca durdurulur.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent
+
+# Mod başına main.py komut satırı argümanları
+MODE_ARGUMENTS = {
+    'collect': ['--collect'],
+    'calculate': ['--calculate'],
+    'full': ['--full'],
+    'returns': ['--returns'],
+    'backfill': ['--backfill'],
+    'rebuild-cache': ['--rebuild-cache'],
+    'schedule': ['--schedule', '--run-now'],
+}
+
+HEAVY_MODULES = ('pandas', 'numpy', 'bs4', 'pymongo', 'requests')
+
+# Hesaplama modlarının okuyacağı geçmiş gün sayısı (bugün dahil)
+SEED_DAYS = 3
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+import config
+from datetime import date, timedelta
+from utils.db_handler import DatabaseHandler
+
+# Ağ yerine kayıtlı sayfalar kullanılır; geçmiş fiyatlar süreye katılmadan bellek içi veritabanına yazılır
+config.ACTIVE_SOURCES = ['ReplaySource']
+seed_handler = DatabaseHandler()
+today = date.fromisoformat(seed_handler.current_date())
+for offset in range({seed_days}):
+    price = 2450.0 + offset
+    seed_handler.insert_gold_prices({{'Gram Altın': {{'Alış Fiyatı': price, 'Satış Fiyatı': price + 10}}}},
+                                    (today - timedelta(days={seed_days} - 1 - offset)).isoformat())
+
+if '--schedule' in {arguments!r}:
+    # Zamanlayıcı, --run-now ile başlatılan işlerin hepsi bir kez bitince durdurulur
+    from utils.scheduler import Scheduler
+    run_job = Scheduler._run_job
+
+    def run_job_once(self, job):
+        run_job(self, job)
+        if all(scheduled.runs for scheduled in self.jobs):
+            self.stop()
+
+    Scheduler._run_job = run_job_once
+
+sys.argv = ['main.py'] + {arguments!r}
+run_started = time.perf_counter()
+exit_code = main.main()
+finished = time.perf_counter()
+print(json.dumps({{'import_ms': (imported - started) * 1000,
+                   'run_ms': (finished - run_started) * 1000,
+                   'exit_code': exit_code,
+                   'loaded': [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+
+def measure_mode(mode, repeat):
+    """
+    Bir modun başlangıç süresini temiz süreçlerde ölçer.
+
+    Args:
+        mode (str): Komut satırı modu.
+        repeat (int): Tekrar sayısı.
+
+    Returns:
+        dict: Medyan süreç, içe aktarma ve çalıştırma süreleri (ms), başarısız çalıştırma sayısı ve
+            yüklenen ağır modüller.
+    """
+    code = _PROBE.format(arguments=MODE_ARGUMENTS[mode], seed_days=SEED_DAYS, heavy=HEAVY_MODULES)
+
+    process_timings, import_timings, run_timings, loaded = [], [], [], []
+    failures = 0
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            env = dict(os.environ, LOG_FILE=os.devnull, LOG_LEVEL='ERROR',
+                       MONGO_CONNECTION_STRING='memory://startup', PRICE_CACHE_DIR=cache_dir, REPLAY_SPEED='0')
+            started = time.perf_counter()
+            output = subprocess.run([sys.executable, '-c', code], cwd=PACKAGE_DIR, env=env,
+                                    capture_output=True, text=True, check=True).stdout
+            process_timings.append((time.perf_counter() - started) * 1000)
+        result = json.loads(output.strip().splitlines()[-1])
+        import_timings.append(result['import_ms'])
+        run_timings.append(result['run_ms'])
+        failures += result['exit_code'] != 0
+        loaded = result['loaded']
+
+    return {
+        'process_ms': statistics.median(process_timings),
+        'import_ms': statistics.median(import_timings),
+        'run_ms': statistics.median(run_timings),
+        'failures': failures,
+        'loaded': loaded,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Komut satırı modlarının başlangıç süresi')
+    parser.add_argument('--repeat', type=int, default=5, help='Mod başına tekrar sayısı')
+    parser.add_argument('--mode', choices=sorted(MODE_ARGUMENTS), action='append',
+                        help='Yalnızca bu modları ölç (tekrarlanabilir)')
+    args = parser.parse_args()
+
+    print(f"{'mod':<15}{'süreç (ms)':>12}{'içe aktarma (ms)':>18}{'çalıştırma (ms)':>17}  "
+          f"yüklenen ağır modüller")
+    failed = False
+    for mode in args.mode or MODE_ARGUMENTS:
+        stats = measure_mode(mode, args.repeat)
+        note = f"  ({stats['failures']} başarısız çalıştırma)" if stats['failures'] else ''
+        print(f"{mode:<15}{stats['process_ms']:>12.1f}{stats['import_ms']:>18.1f}{stats['run_ms']:>17.1f}  "
+              f"{', '.join(stats['loaded']) or '-'}{note}")
+        failed = failed or bool(stats['failures'])
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
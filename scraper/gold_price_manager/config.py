@@ -14,9 +14,33 @@ MONGO_CONNECTION_STRING = os.getenv('MONGO_CONNECTION_STRING', 'mongodb://localh
 MONGO_DATABASE = os.getenv('MONGO_DATABASE', 'gold_prices')
 MONGO_COLLECTION_PRICES = os.getenv('MONGO_COLLECTION_PRICES', 'prices')
 MONGO_COLLECTION_PERCENTAGES = os.getenv('MONGO_COLLECTION_PERCENTAGES', 'daily_percentage')
+MONGO_COLLECTION_STATE = os.getenv('MONGO_COLLECTION_STATE', 'pipeline_state')
+MONGO_COLLECTION_RETURNS = os.getenv('MONGO_COLLECTION_RETURNS', 'returns')
+MONGO_COLLECTION_INTRADAY = os.getenv('MONGO_COLLECTION_INTRADAY', 'prices_intraday')
+MONGO_COLLECTION_PROVENANCE = os.getenv('MONGO_COLLECTION_PROVENANCE', 'prices_provenance')
+
+# MongoDB Bağlantı Havuzu
+MONGO_MAX_POOL_SIZE = int(os.getenv('MONGO_MAX_POOL_SIZE', 10))
+MONGO_MIN_POOL_SIZE = int(os.getenv('MONGO_MIN_POOL_SIZE', 0))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv('MONGO_MAX_IDLE_TIME_MS', 300000))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', 10000))
+MONGO_HEALTHCHECK_INTERVAL_SECONDS = int(os.getenv('MONGO_HEALTHCHECK_INTERVAL_SECONDS', 60))
+MONGO_INDEX_RETRY_SECONDS = int(os.getenv('MONGO_INDEX_RETRY_SECONDS', 3600))  # Oluşturulamayan indekslerin yeniden denenme aralığı
 
 # Veri Kaynakları
 UZMANPARA_URL = os.getenv('UZMANPARA_URL', 'https://uzmanpara.milliyet.com.tr/altin-fiyatlari/')
+UZMANPARA_PARSER = os.getenv('UZMANPARA_PARSER', 'fast')  # 'fast': yalnızca hedef tablo, 'full': BeautifulSoup
+UZMANPARA_STREAMING = os.getenv('UZMANPARA_STREAMING', 'true').lower() == 'true'  # 'full' ayrıştırıcı modunda kullanılmaz
+STREAM_CHUNK_SIZE = int(os.getenv('STREAM_CHUNK_SIZE', 16384))  # Akış modunda okunan parça boyutu (byte)
+
+# Veri Kaynağı Eklentileri ('SinifAdi=paket.modul:SinifAdi' biçiminde, ';' ile ayrılır)
+SOURCE_PLUGINS = os.getenv('SOURCE_PLUGINS', '')
+SOURCE_ENTRY_POINT_GROUP = os.getenv('SOURCE_ENTRY_POINT_GROUP', 'gold_price_manager.sources')  # Kurulu paket giriş noktaları
+
+# Kayıttan Oynatma Kaynağı (ReplaySource; ağa çıkmadan kayıtlı sayfaları sunar)
+REPLAY_FIXTURE_DIR = os.getenv('REPLAY_FIXTURE_DIR', str(Path(__file__).parent / 'benchmarks' / 'fixtures'))
+REPLAY_SPEED = float(os.getenv('REPLAY_SPEED', 1.0))  # Oynatma hızı çarpanı, 0: beklemeden
+REPLAY_LATENCY_SECONDS = float(os.getenv('REPLAY_LATENCY_SECONDS', 0.5))  # 1x hızda çekim başına gecikme
 
 # HTTP İstek Ayarları
 HEADERS = {
@@ -25,14 +49,97 @@ HEADERS = {
                   "Chrome/118.0.0.0 Safari/537.36"
 }
 
+# HTTP Bağlantı Ayarları
+HTTP_CONNECT_TIMEOUT_SECONDS = float(os.getenv('HTTP_CONNECT_TIMEOUT_SECONDS', 10))
+HTTP_READ_TIMEOUT_SECONDS = float(os.getenv('HTTP_READ_TIMEOUT_SECONDS', 30))
+HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', 4))  # Ana makine başına açık bağlantı sayısı
+HTTP_CONDITIONAL_REQUESTS = os.getenv('HTTP_CONDITIONAL_REQUESTS', 'true').lower() == 'true'
+
 # Loglama Ayarları
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
 LOG_FILE = os.getenv('LOG_FILE', 'gold_price_manager.log')
+LOG_SAMPLE_RATE = float(os.getenv('LOG_SAMPLE_RATE', 1.0))  # INFO ve altı için çağrı noktası başına geçirilen oran
+
+# Ölçüm Ayarları (log_function_call ile sarılan fonksiyonların süreleri)
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'false').lower() == 'true'
+METRICS_FORMAT = os.getenv('METRICS_FORMAT', 'json')  # 'json' veya 'prometheus'
+METRICS_FILE = os.getenv('METRICS_FILE', '')  # Boşsa yalnızca döngü özeti loglanır
 
 # Uygulama Ayarları
 CHECK_INTERVAL_MINUTES = int(os.getenv('CHECK_INTERVAL_MINUTES', 1440))  # Varsayılan: 24 saat
 RETRY_ATTEMPTS = int(os.getenv('RETRY_ATTEMPTS', 3))
-RETRY_DELAY_SECONDS = int(os.getenv('RETRY_DELAY_SECONDS', 60))
+RETRY_DELAY_SECONDS = float(os.getenv('RETRY_DELAY_SECONDS', 2))  # İlk yeniden denemenin en uzun beklemesi; her denemede iki katına çıkar
+RETRY_MAX_DELAY_SECONDS = float(os.getenv('RETRY_MAX_DELAY_SECONDS', 60))  # Tek beklemenin üst sınırı
+CYCLE_DEADLINE_SECONDS = float(os.getenv('CYCLE_DEADLINE_SECONDS', 600))  # Döngü başına yeniden deneme bütçesi, 0: sınırsız
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', 5))  # Devreyi açan art arda hata sayısı
+CIRCUIT_RESET_SECONDS = float(os.getenv('CIRCUIT_RESET_SECONDS', 300))  # Açık devrenin yeniden deneme öncesi beklemesi
+
+# Anlık Görüntü Önbelleği (fiyat belgeleri için süreç içi okuma önbelleği)
+SNAPSHOT_CACHE_ENABLED = os.getenv('SNAPSHOT_CACHE_ENABLED', 'true').lower() == 'true'
+SNAPSHOT_CACHE_MAX_ENTRIES = int(os.getenv('SNAPSHOT_CACHE_MAX_ENTRIES', 64))
+# Geçmiş günlerin belgeleri için TTL; varsayılan iki kontrol aralığıdır, böylece sonraki döngü de önbellekten okur
+SNAPSHOT_CACHE_TTL_SECONDS = float(os.getenv('SNAPSHOT_CACHE_TTL_SECONDS', CHECK_INTERVAL_MINUTES * 60 * 2))
+# En son kayıt (ve o günün belgesi) yalnızca bu süre önbellekten döner; başka süreçlerin yazdıkları en geç bu sürede görülür
+SNAPSHOT_CACHE_LATEST_TTL_SECONDS = float(os.getenv('SNAPSHOT_CACHE_LATEST_TTL_SECONDS', 30))
+
+# Veri Çekme Ayarları
+FETCH_MODE = os.getenv('FETCH_MODE', 'concurrent')  # 'concurrent' veya 'sequential'
+FETCH_MAX_WORKERS = int(os.getenv('FETCH_MAX_WORKERS', 8))
+SOURCE_DEADLINE_SECONDS = float(os.getenv('SOURCE_DEADLINE_SECONDS', 300))  # Kaynak başına üst süre
+
+# Veri Tutarlılık Doğrulaması (piyasa geneli hareketten arındırılmış getirilerin tür başına medyan/MAD z-skoru)
+VALIDATION_WINDOW_SIZE = int(os.getenv('VALIDATION_WINDOW_SIZE', 30))  # Karşılaştırılacak son kayıt sayısı
+VALIDATION_MIN_HISTORY = int(os.getenv('VALIDATION_MIN_HISTORY', 5))  # Altında sabit eşik kullanılır
+VALIDATION_Z_THRESHOLD = float(os.getenv('VALIDATION_Z_THRESHOLD', 6.0))
+VALIDATION_MIN_SCALE = float(os.getenv('VALIDATION_MIN_SCALE', 0.005))  # En küçük oynaklık (log getiri)
+VALIDATION_FALLBACK_THRESHOLD = float(os.getenv('VALIDATION_FALLBACK_THRESHOLD', 0.3))  # Sabit eşik (%30), ret sınırı
+VALIDATION_MAX_ANOMALY_RATIO = float(os.getenv('VALIDATION_MAX_ANOMALY_RATIO', 0.2))  # Veri setini reddetme oranı
+
+# Çok Kaynaklı Fiyat Birleştirme (birden fazla kaynak aynı altın türüne fiyat verdiğinde)
+QUOTE_CONSENSUS_METHOD = os.getenv('QUOTE_CONSENSUS_METHOD', 'median')  # 'median', 'trimmed' veya 'priority'
+QUOTE_TRIM_RATIO = float(os.getenv('QUOTE_TRIM_RATIO', 0.2))  # Budanmış ortalamada her uçtan atılan oran
+QUOTE_SOURCE_PRIORITIES = os.getenv('QUOTE_SOURCE_PRIORITIES', '')  # 'Kaynak=ağırlık;...', varsayılan ağırlık 1
+QUOTE_OUTLIER_THRESHOLD = float(os.getenv('QUOTE_OUTLIER_THRESHOLD', 0.02))  # Medyandan aykırı sayılma oranı (%2)
+QUOTE_OUTLIER_MIN_SOURCES = int(os.getenv('QUOTE_OUTLIER_MIN_SOURCES', 3))  # Aykırılık için gereken kaynak sayısı
+QUOTE_SOURCE_DROP_RATIO = float(os.getenv('QUOTE_SOURCE_DROP_RATIO', 0.5))  # Kaynağı döngüden çıkaran aykırı oranı
+QUOTE_PROVENANCE_ENABLED = os.getenv('QUOTE_PROVENANCE_ENABLED', 'true').lower() == 'true'  # Kaynak teklifleri saklanır
+
+# Değişiklik Algılama (aynı gün için fiyatlar değişmediyse yazma ve sonraki adımlar atlanır)
+CHANGE_DETECTION_ENABLED = os.getenv('CHANGE_DETECTION_ENABLED', 'true').lower() == 'true'
+
+# Yüzde Hesaplama Ayarları
+INCREMENTAL_CALCULATION = os.getenv('INCREMENTAL_CALCULATION', 'false').lower() == 'true'
+
+# Getiri Hesaplama Ayarları (Nd: gün, Nw: hafta, Nm: ay, Ny: yıl, ytd: yılbaşından bugüne)
+RETURN_HORIZONS = [h.strip() for h in os.getenv('RETURN_HORIZONS', '1d,7d,30d,ytd,1y').split(',') if h.strip()]
+RETURN_LOOKBACK_SLACK_DAYS = int(os.getenv('RETURN_LOOKBACK_SLACK_DAYS', 10))  # Baz kaydı için ek geriye bakış
+
+# Geçmiş Yeniden Hesaplama Ayarları
+BACKFILL_BATCH_SIZE = int(os.getenv('BACKFILL_BATCH_SIZE', 500))  # Okuma ve toplu yazma parti boyutu
+
+# Gün İçi Fiyat Kaydı (her toplama kaynak başına zaman damgasıyla saatlik kovalara eklenir)
+INTRADAY_ENABLED = os.getenv('INTRADAY_ENABLED', 'false').lower() == 'true'
+INTRADAY_BUCKET_MINUTES = int(os.getenv('INTRADAY_BUCKET_MINUTES', 60))  # Kova süresi; 60'ı bölmeli veya katı olmalı
+INTRADAY_RETENTION_DAYS = int(os.getenv('INTRADAY_RETENTION_DAYS', 0))  # 0: süresiz sakla
+
+# Fiyat Geçmişi Önbelleği (bellek eşlemli sütunlu dosya)
+PRICE_CACHE_ENABLED = os.getenv('PRICE_CACHE_ENABLED', 'false').lower() == 'true'
+PRICE_CACHE_DIR = os.getenv('PRICE_CACHE_DIR', str(Path(__file__).parent / 'cache' / 'price_history'))
+PRICE_CACHE_INITIAL_ROWS = int(os.getenv('PRICE_CACHE_INITIAL_ROWS', 1024))  # İlk ayrılan tarih kapasitesi
+
+# Ham Sayfa Arşivi (çekilen sayfalar içerik özetiyle tekilleştirilip sıkıştırılarak saklanır)
+PAGE_ARCHIVE_ENABLED = os.getenv('PAGE_ARCHIVE_ENABLED', 'false').lower() == 'true'
+PAGE_ARCHIVE_DIR = os.getenv('PAGE_ARCHIVE_DIR', str(Path(__file__).parent / 'cache' / 'page_archive'))
+PAGE_ARCHIVE_CODEC = os.getenv('PAGE_ARCHIVE_CODEC', 'zstd')  # 'zstd' (zstandard paketi gerekir) veya 'gzip'
+PAGE_ARCHIVE_LEVEL = int(os.getenv('PAGE_ARCHIVE_LEVEL', 3))  # Sıkıştırma düzeyi (gzip için en fazla 9)
+PAGE_ARCHIVE_QUEUE_SIZE = int(os.getenv('PAGE_ARCHIVE_QUEUE_SIZE', 100))  # Dolunca sayfalar beklemeden atlanır
+
+# Zamanlayıcı Ayarları (--schedule modu; işler 'ad=zamanlama' biçiminde ';' ile ayrılır)
+# Zamanlama: 5 alanlı cron ifadesi, '@hourly', '@daily' veya '@every 30s/5m/1h/1d'
+SCHEDULE_JOBS = os.getenv('SCHEDULE_JOBS', 'collect=*/1 * * * *;calculate=0 * * * *')
+SCHEDULE_JITTER_SECONDS = float(os.getenv('SCHEDULE_JITTER_SECONDS', 0))  # Çalıştırma başına en fazla rastgele gecikme
+SCHEDULE_MISFIRE_POLICY = os.getenv('SCHEDULE_MISFIRE_POLICY', 'run_once')  # 'skip', 'run_once' veya 'run_all'
+SCHEDULE_MISFIRE_GRACE_SECONDS = float(os.getenv('SCHEDULE_MISFIRE_GRACE_SECONDS', 60))  # Kaçırılmış sayılma eşiği
 
 # Tarih formatı
 DATE_FORMAT = '%Y-%m-%d'
@@ -2,31 +2,41 @@
 Veri kaynakları için temel sınıf - Tüm veri kaynakları bu sınıfı genişletmelidir.
 """
 from abc import ABC, abstractmethod
-import time
-import requests
+import copy
+import threading
 from requests.exceptions import RequestException
 
 import config
+from utils.http_client import get_session, default_timeout
 from utils.logger import setup_logger, log_function_call
+from utils.resilience import call_with_retry, get_breaker
 
 logger = setup_logger(__name__)
 
+# URL başına koşullu istek doğrulayıcıları (ETag / Last-Modified) ve son işlenmiş veri.
+# Kaynak örnekleri her döngüde yeniden oluşturulabildiği için modül düzeyinde tutulur.
+_conditional_cache = {}
+_conditional_lock = threading.Lock()
+
 
 class BaseDataSource(ABC):
     """
     Veri kaynakları için soyut temel sınıf.
     """
 
-    def __init__(self, name, url=None, headers=None):
+    def __init__(self, name, url=None, headers=None, deadline_seconds=None):
         """
         Args:
             name (str): Veri kaynağının adı.
             url (str, optional): Veri kaynağının URL'si.
             headers (dict, optional): HTTP istek başlıkları.
+            deadline_seconds (float, optional): Paralel çekimde kaynağa tanınan en uzun süre.
+                Varsayılan: config.SOURCE_DEADLINE_SECONDS.
         """
         self.name = name
         self.url = url
         self.headers = headers or config.HEADERS
+        self.deadline_seconds = deadline_seconds or config.SOURCE_DEADLINE_SECONDS
 
     @abstractmethod
     def fetch_data(self):
@@ -57,49 +67,40 @@ class BaseDataSource(ABC):
         """
         pass
 
-    def retry_fetch(self, max_attempts=config.RETRY_ATTEMPTS, delay_seconds=config.RETRY_DELAY_SECONDS):
+    def retry_fetch(self, policy=None):
         """
-        Hata durumunda yeniden deneme mekanizması ile veri çeker.
+        Hata durumunda üstel beklemeli yeniden deneme ile veri çeker. Kaynağın devre kesicisi
+        açıksa istek gönderilmeden hata fırlatılır.
 
         Args:
-            max_attempts (int): Maksimum deneme sayısı.
-            delay_seconds (int): Denemeler arası bekleme süresi (saniye).
+            policy (RetryPolicy, optional): Yeniden deneme politikası. Varsayılan: yapılandırmadaki değerler.
 
         Returns:
             dict: Çekilen veriler.
 
         Raises:
-            RequestException: Tüm denemeler başarısız olursa.
+            RequestException: Tüm denemeler veya döngü süre bütçesi tükenirse.
+            CircuitOpenError: Kaynağın devresi açıksa.
         """
-        attempts = 0
-        last_exception = None
-
-        while attempts < max_attempts:
-            try:
-                logger.info(f"[{self.name}] Veriler çekiliyor ({attempts + 1}/{max_attempts})...")
-                return self.fetch_data()
-            except RequestException as e:
-                attempts += 1
-                last_exception = e
-                logger.warning(f"[{self.name}] Veri çekme hatası: {str(e)}. "
-                               f"Deneme {attempts}/{max_attempts}...")
+        breaker = get_breaker(f"source:{self.name}")
 
-                if attempts < max_attempts:
-                    logger.info(f"[{self.name}] {delay_seconds} saniye bekleniyor...")
-                    time.sleep(delay_seconds)
+        def fetch():
+            logger.info(f"[{self.name}] Veriler çekiliyor...")
+            return self.fetch_data()
 
-        logger.error(f"[{self.name}] Maksimum deneme sayısına ulaşıldı. Son hata: {str(last_exception)}")
-        raise last_exception
+        return call_with_retry(fetch, (RequestException,), self.name, policy, breaker)
 
     @log_function_call
-    def get_http_response(self, url=None, method='GET', **kwargs):
+    def get_http_response(self, url=None, method='GET', conditional=False, **kwargs):
         """
-        HTTP isteği gönderir ve yanıtı döndürür.
+        Paylaşılan oturum üzerinden HTTP isteği gönderir ve yanıtı döndürür.
 
         Args:
             url (str, optional): İstek URL'si. Belirtilmezse self.url kullanılır.
             method (str): HTTP metodu ('GET', 'POST', vs.).
-            **kwargs: requests.request metodu için ek parametreler.
+            conditional (bool): True ise önceki yanıtın ETag / Last-Modified değerleriyle
+                koşullu GET gönderilir; içerik değişmediyse sunucu 304 döndürür.
+            **kwargs: requests.Session.request metodu için ek parametreler.
 
         Returns:
             requests.Response: HTTP yanıtı.
@@ -111,34 +112,118 @@ class BaseDataSource(ABC):
         if not request_url:
             raise ValueError("URL belirtilmedi.")
 
-        logger.debug(f"[{self.name}] HTTP {method} isteği: {request_url}")
+        logger.debug("[%s] HTTP %s isteği: %s", self.name, method, request_url)
 
         # Headers sağlanmamışsa varsayılan headers kullan
         if 'headers' not in kwargs:
             kwargs['headers'] = self.headers
+        kwargs.setdefault('timeout', default_timeout())
+
+        # Önceki yanıtın doğrulayıcılarını ekle
+        if conditional and method.upper() == 'GET':
+            entry = _conditional_cache.get(request_url)
+            if entry:
+                headers = dict(kwargs['headers'])
+                if entry.get('etag'):
+                    headers['If-None-Match'] = entry['etag']
+                if entry.get('last_modified'):
+                    headers['If-Modified-Since'] = entry['last_modified']
+                kwargs['headers'] = headers
 
         # HTTP isteği gönder
-        response = requests.request(method, request_url, **kwargs)
+        response = get_session(request_url).request(method, request_url, **kwargs)
 
-        # Durum kodunu kontrol et
+        # Durum kodunu kontrol et (304 hata sayılmaz)
         response.raise_for_status()
 
-        logger.debug(f"[{self.name}] HTTP isteği başarılı: {response.status_code}")
+        # Yönlendirmelerden bağımsız önbellek anahtarı
+        response.source_url = request_url
+
+        logger.debug("[%s] HTTP isteği başarılı: %s", self.name, response.status_code)
         return response
 
+    @staticmethod
+    def is_not_modified(raw_data):
+        """
+        Ham verinin koşullu isteğe verilmiş 304 yanıtı olup olmadığını kontrol eder.
+
+        Args:
+            raw_data: fetch_data tarafından döndürülen ham veri.
+
+        Returns:
+            bool: Yanıt 304 Not Modified ise True.
+        """
+        return getattr(raw_data, 'status_code', None) == 304
+
+    def _remember_response(self, raw_data, processed_data):
+        """
+        Yanıtın doğrulayıcılarını ve işlenmiş veriyi sonraki koşullu istekler için saklar.
+
+        Args:
+            raw_data: fetch_data tarafından döndürülen ham veri.
+            processed_data (dict): process_data sonucu.
+        """
+        headers = getattr(raw_data, 'headers', None)
+        request_url = getattr(raw_data, 'source_url', None) or self.url
+        if headers is None or not processed_data:
+            return
+
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+
+        with _conditional_lock:
+            _conditional_cache[request_url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'data': processed_data,
+            }
+
+    def _cached_result(self, raw_data):
+        """
+        304 yanıtı için önceki işlenmiş veriyi döndürür.
+
+        Args:
+            raw_data: fetch_data tarafından döndürülen 304 yanıtı.
+
+        Returns:
+            dict or None: Önceki işlenmiş verinin kopyası.
+        """
+        request_url = getattr(raw_data, 'source_url', None) or self.url
+        entry = _conditional_cache.get(request_url)
+        if not entry:
+            return None
+        return copy.deepcopy(entry['data'])
+
     @log_function_call
     def get_data(self):
         """
         Veri kaynağından veri çeker ve işler.
 
+        Kaynak 304 Not Modified döndürürse process_data atlanır ve önceki sonuç kullanılır.
+
         Returns:
             dict: İşlenmiş veri.
         """
         try:
             raw_data = self.retry_fetch()
+
+            # Ham sayfa işlenmeden önce arşiv kuyruğuna eklenir; ayrıştırma hatasında da saklanmış olur
+            if config.PAGE_ARCHIVE_ENABLED and not self.is_not_modified(raw_data):
+                from utils.page_archive import archive_page
+                archive_page(self.name, raw_data)
+
+            if self.is_not_modified(raw_data):
+                cached_data = self._cached_result(raw_data)
+                if cached_data is not None:
+                    logger.info(f"[{self.name}] İçerik değişmemiş (304), önceki sonuç kullanılıyor.")
+                    return cached_data
+
             processed_data = self.process_data(raw_data)
+            self._remember_response(raw_data, processed_data)
             logger.info(f"[{self.name}] Veriler başarıyla çekildi ve işlendi.")
             return processed_data
         except Exception as e:
             logger.error(f"[{self.name}] Veri çekme ve işleme hatası: {str(e)}")
-            raise
\ No newline at end of file
+            raise
@@ -1,8 +1,17 @@
 """
 Veri kaynakları arayüz modülü - Tüm veri kaynaklarına tek bir noktadan erişim sağlar.
+
+Kaynak adları sırasıyla şu kayıtlardan çözülür:
+1. register_source ile veya config.SOURCE_PLUGINS ile bildirilen kaynaklar,
+2. Kurulu paketlerin config.SOURCE_ENTRY_POINT_GROUP grubundaki giriş noktaları,
+3. Yerleşik kaynaklar ve data_sources altında '<ad>_source' adlı modüller.
+
+Çözülen sınıflar önbelleğe alınır. Aktif kaynak örnekleri döngüler boyunca yeniden kullanılır, böylece
+oturum ve önbellek gibi kaynak durumları korunur.
 """
 import importlib
-import inspect
+import threading
+from importlib.metadata import entry_points
 
 import config
 from data_sources.base_source import BaseDataSource
@@ -10,38 +19,144 @@ from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Depoyla gelen kaynaklar ('modül:Sınıf')
+_BUILTIN_SOURCES = {
+    'UzmanParaSource': 'data_sources.uzmanpara_source:UzmanParaSource',
+    'ReplaySource': 'data_sources.replay_source:ReplaySource',
+}
 
-def get_data_source(source_name):
+_registered = {}     # Kaynak adı -> sınıf veya 'modül:Sınıf'
+_entry_points = None  # Kaynak adı -> EntryPoint (ilk kullanımda okunur)
+_class_cache = {}
+_instances = {}
+_lock = threading.RLock()
+
+
+def register_source(source_name, target):
+    """
+    Veri kaynağını adıyla kaydeder; kayıtlı ad ACTIVE_SOURCES içinde kullanılabilir.
+
+    Args:
+        source_name (str): ACTIVE_SOURCES içinde kullanılacak ad.
+        target (type or str): BaseDataSource alt sınıfı veya 'paket.modül:Sınıf' yolu.
+    """
+    with _lock:
+        _registered[source_name] = target
+        _class_cache.pop(source_name, None)
+        _instances.pop(source_name, None)
+
+
+def _parse_plugins(spec):
     """
-    İsme göre veri kaynağı oluşturur.
+    'Ad=paket.modül:Sınıf;...' biçimindeki eklenti tanımını ayrıştırır. Ad verilmezse sınıf adı kullanılır.
 
     Args:
-        source_name (str): Veri kaynağı sınıfının adı.
+        spec (str): Eklenti tanımı.
 
     Returns:
-        BaseDataSource: Veri kaynağı örneği.
+        dict: {kaynak_adı: 'modül:Sınıf'} sözlüğü.
+    """
+    plugins = {}
+    for item in filter(None, (part.strip() for part in spec.split(';'))):
+        name, _, target = item.rpartition('=')
+        target = target.strip()
+        if ':' not in target:
+            logger.warning(f"Geçersiz kaynak eklentisi tanımı atlandı: '{item}' ('modül:Sınıf' bekleniyor)")
+            continue
+        plugins[name.strip() or target.rsplit(':', 1)[1]] = target
+    return plugins
+
+
+for _name, _target in _parse_plugins(config.SOURCE_PLUGINS).items():
+    _registered.setdefault(_name, _target)
+
+
+def _load_entry_points():
+    global _entry_points
+    if _entry_points is None:
+        try:
+            try:
+                group = entry_points(group=config.SOURCE_ENTRY_POINT_GROUP)
+            except TypeError:
+                # Python 3.8/3.9: entry_points() grup sözlüğü döndürür
+                group = entry_points().get(config.SOURCE_ENTRY_POINT_GROUP, ())
+            _entry_points = {ep.name: ep for ep in group}
+        except Exception as e:
+            logger.warning(f"Kaynak giriş noktaları okunamadı: {str(e)}")
+            _entry_points = {}
+        if _entry_points:
+            logger.info(f"Giriş noktalarından {len(_entry_points)} veri kaynağı bulundu: "
+                        f"{', '.join(sorted(_entry_points))}")
+    return _entry_points
+
+
+def _import_target(target):
+    module_path, _, class_name = target.partition(':')
+    module = importlib.import_module(module_path)
+    try:
+        return getattr(module, class_name)
+    except AttributeError:
+        raise AttributeError(f"'{module_path}' modülünde '{class_name}' sınıfı bulunamadı") from None
+
+
+def get_source_class(source_name):
+    """
+    Kaynak adını sınıfa çözer; sonuç önbelleğe alınır.
+
+    Args:
+        source_name (str): Veri kaynağının adı.
+
+    Returns:
+        type: BaseDataSource alt sınıfı.
 
     Raises:
         ImportError: Belirtilen modül bulunamazsa.
         AttributeError: Belirtilen sınıf bulunamazsa.
         TypeError: Sınıf BaseDataSource'dan türetilmemişse.
     """
-    try:
-        # Modül adı (snake_case dönüşümü)
-        module_name = source_name.replace("Source", "").lower() + "_source"
-        module_path = f"data_sources.{module_name}"
+    source_class = _class_cache.get(source_name)
+    if source_class is not None:
+        return source_class
+
+    with _lock:
+        target = _registered.get(source_name)
+        if target is None and source_name in _load_entry_points():
+            target = _entry_points[source_name].load()
+        if target is None:
+            # Eski adlandırma kuralı: MySource -> data_sources.my_source
+            module_name = source_name.replace("Source", "").lower() + "_source"
+            target = _BUILTIN_SOURCES.get(source_name, f"data_sources.{module_name}:{source_name}")
 
-        # Modülü dinamik olarak içe aktar
-        module = importlib.import_module(module_path)
+        source_class = _import_target(target) if isinstance(target, str) else target
+        if not (isinstance(source_class, type) and issubclass(source_class, BaseDataSource)) \
+                or source_class is BaseDataSource:
+            raise TypeError(f"'{source_name}' bir BaseDataSource alt sınıfı değil")
 
-        # Sınıfı bul
-        for name, obj in inspect.getmembers(module, inspect.isclass):
-            if name == source_name and issubclass(obj, BaseDataSource) and obj != BaseDataSource:
-                # Sınıfın bir örneğini oluştur ve döndür
-                logger.info(f"Veri kaynağı sınıfı oluşturuluyor: {source_name}")
-                return obj()
+        _class_cache[source_name] = source_class
+        logger.debug("Veri kaynağı sınıfı çözüldü: %s -> %s.%s", source_name,
+                     source_class.__module__, source_class.__name__)
+        return source_class
+
+
+def get_data_source(source_name):
+    """
+    İsme göre yeni bir veri kaynağı örneği oluşturur.
+
+    Args:
+        source_name (str): Veri kaynağının adı.
+
+    Returns:
+        BaseDataSource: Veri kaynağı örneği.
 
-        raise AttributeError(f"'{module_path}' modülünde '{source_name}' sınıfı bulunamadı")
+    Raises:
+        ImportError: Belirtilen modül bulunamazsa.
+        AttributeError: Belirtilen sınıf bulunamazsa.
+        TypeError: Sınıf BaseDataSource'dan türetilmemişse.
+    """
+    try:
+        source_class = get_source_class(source_name)
+        logger.info(f"Veri kaynağı sınıfı oluşturuluyor: {source_name}")
+        return source_class()
 
     except (ImportError, AttributeError, TypeError) as e:
         logger.error(f"Veri kaynağı yüklenirken hata: {str(e)}")
@@ -50,17 +165,35 @@ def get_data_source(source_name):
 
 def get_all_active_sources():
     """
-    Aktif veri kaynaklarının listesini döndürür.
+    Aktif veri kaynaklarının listesini döndürür. Örnekler ilk çağrıda oluşturulur ve sonraki
+    döngülerde yeniden kullanılır; yüklenemeyen kaynaklar bir sonraki çağrıda tekrar denenir.
 
     Returns:
-        list: Veri kaynağı örneklerinin listesi.
+        list: Veri kaynağı örneklerinin listesi (config.ACTIVE_SOURCES sırasıyla).
     """
     sources = []
-    for source_name in config.ACTIVE_SOURCES:
-        try:
-            source = get_data_source(source_name)
+    with _lock:
+        for source_name in config.ACTIVE_SOURCES:
+            source = _instances.get(source_name)
+            if source is None:
+                try:
+                    source = _instances[source_name] = get_data_source(source_name)
+                except Exception as e:
+                    logger.error(f"'{source_name}' veri kaynağı yüklenemedi: {str(e)}")
+                    continue
             sources.append(source)
-        except Exception as e:
-            logger.error(f"'{source_name}' veri kaynağı yüklenemedi: {str(e)}")
 
-    return sources
\ No newline at end of file
+        # Etkin listeden çıkarılan kaynakların örnekleri bırakılır
+        for source_name in set(_instances) - set(config.ACTIVE_SOURCES):
+            del _instances[source_name]
+
+    return sources
+
+
+def reset_sources():
+    """
+    Saklanan kaynak örneklerini bırakır; sonraki get_all_active_sources çağrısı yenilerini oluşturur.
+    Kaynakların okuduğu yapılandırma değiştiğinde kullanılır.
+    """
+    with _lock:
+        _instances.clear()
@@ -0,0 +1,105 @@
+"""
+Kayıttan oynatma veri kaynağı - Diske kaydedilmiş UzmanPara sayfalarını ağa çıkmadan sırayla sunar.
+
+Çevrimdışı çalıştırma ve ölçümler içindir; ACTIVE_SOURCES içine 'ReplaySource' yazılarak kullanılır.
+"""
+import threading
+import time
+from pathlib import Path
+
+import config
+from data_sources.base_source import BaseDataSource
+from data_sources.uzmanpara_source import UzmanParaSource
+from utils.logger import setup_logger, log_function_call
+
+logger = setup_logger(__name__)
+
+
+class ReplayResponse:
+    """
+    Kayıtlı sayfa için requests.Response'un process_data tarafından kullanılan alanlarını taşıyan yanıt.
+    """
+
+    __slots__ = ('content', 'status_code', 'headers', 'source_url')
+
+    def __init__(self, content, source_url):
+        self.content = content
+        self.status_code = 200
+        self.headers = {}
+        self.source_url = source_url
+
+
+class ReplaySource(BaseDataSource):
+    """
+    Kayıtlı HTML sayfalarını dosya adı sırasıyla döngüsel olarak sunan veri kaynağı.
+
+    Her çekimde config.REPLAY_LATENCY_SECONDS / hız kadar beklenerek ağ gecikmesi taklit edilir;
+    hız 0 ise beklenmez. Sayfalar UzmanPara ayrıştırıcısıyla işlenir.
+    """
+
+    def __init__(self, fixture_dir=None, speed=None, latency_seconds=None, parser_mode=None):
+        """
+        Args:
+            fixture_dir (str, optional): Kayıtlı sayfaların (*.html) dizini. Varsayılan: config.REPLAY_FIXTURE_DIR.
+            speed (float, optional): Oynatma hızı çarpanı. Varsayılan: config.REPLAY_SPEED.
+            latency_seconds (float, optional): 1x hızda çekim başına gecikme.
+                Varsayılan: config.REPLAY_LATENCY_SECONDS.
+            parser_mode (str, optional): 'fast' veya 'full'. Varsayılan: config.UZMANPARA_PARSER.
+
+        Raises:
+            FileNotFoundError: Dizinde kayıtlı sayfa yoksa.
+        """
+        fixture_dir = Path(fixture_dir or config.REPLAY_FIXTURE_DIR)
+        super().__init__(name="Replay", url=fixture_dir.as_uri())
+
+        self.fixtures = sorted(fixture_dir.glob('*.html'))
+        if not self.fixtures:
+            raise FileNotFoundError(f"'{fixture_dir}' dizininde kayıtlı sayfa (*.html) bulunamadı.")
+
+        self.speed = config.REPLAY_SPEED if speed is None else speed
+        self.latency_seconds = config.REPLAY_LATENCY_SECONDS if latency_seconds is None else latency_seconds
+        self._parser = UzmanParaSource(parser_mode=parser_mode, streaming=False)
+        self._contents = {}
+        self._position = 0
+        self._lock = threading.Lock()
+
+    def next_fixture(self):
+        """
+        Returns:
+            pathlib.Path: Sıradaki kayıtlı sayfa; son sayfadan sonra başa dönülür.
+        """
+        with self._lock:
+            fixture = self.fixtures[self._position % len(self.fixtures)]
+            self._position += 1
+        return fixture
+
+    @log_function_call
+    def fetch_data(self):
+        """
+        Sıradaki kayıtlı sayfayı okur (sayfalar ilk okumadan sonra bellekte tutulur).
+
+        Returns:
+            ReplayResponse: Sayfa içeriğini taşıyan yanıt.
+        """
+        fixture = self.next_fixture()
+        if self.speed > 0 and self.latency_seconds > 0:
+            time.sleep(self.latency_seconds / self.speed)
+
+        content = self._contents.get(fixture)
+        if content is None:
+            content = self._contents[fixture] = fixture.read_bytes()
+
+        logger.debug("[%s] Kayıtlı sayfa sunuluyor: %s (%d byte)", self.name, fixture.name, len(content))
+        return ReplayResponse(content, fixture.as_uri())
+
+    def process_data(self, raw_data):
+        """
+        Kayıtlı sayfayı UzmanPara ayrıştırıcısıyla işler.
+
+        Args:
+            raw_data (ReplayResponse): fetch_data sonucu.
+
+        Returns:
+            dict: İşlenmiş altın fiyat verileri.
+        """
+        return self._parser.process_data(raw_data)
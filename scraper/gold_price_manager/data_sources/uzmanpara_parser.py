@@ -0,0 +1,329 @@
+"""
+UzmanPara tablo ayrıştırıcısı - Sayfanın tamamı için ağaç kurmadan yalnızca fiyat tablosunu ayrıştırır.
+"""
+import codecs
+import re
+from html.parser import HTMLParser
+
+# Fiyat tablosunu içeren kutunun sınıf değeri ve sayfadaki sırası
+TARGET_CLASS = 'box box7 box11'
+TARGET_INDEX = 1
+
+# Ayrıştırıcıya bir seferde verilen karakter sayısı
+FEED_CHUNK_SIZE = 8192
+
+# BeautifulSoup'un alt öğe kabul etmeyen (kapanışsız) etiketleri
+VOID_TAGS = frozenset([
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen', 'link', 'menuitem', 'meta',
+    'param', 'source', 'track', 'wbr', 'basefont', 'bgsound', 'command', 'frame', 'image', 'isindex',
+    'nextid', 'spacer',
+])
+
+# .text sonucuna dahil edilmeyen içerikler
+_SKIPPED_TEXT_TAGS = frozenset(['script', 'style', 'template'])
+
+# Betik, stil ve yorum blokları atlanır; yalnızca gerçek kutu etiketleri sayılır
+_TARGET_DIV_PATTERN = re.compile(
+    r'(?P<skip><script\b.*?</script\s*>|<style\b.*?</style\s*>|<!--.*?-->)'
+    r'|(?P<div><div\b[^>]*?\bclass\s*=\s*(["\'])\s*box\s+box7\s+box11\s*\3)',
+    re.IGNORECASE | re.DOTALL
+)
+_DECLARED_ENCODING_PATTERN = re.compile(
+    br'<\s*meta[^>]+charset\s*=\s*["\']?([^>]*?)[ /;\'">]',
+    re.IGNORECASE
+)
+_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF32_LE, 'utf-32le'),
+    (codecs.BOM_UTF32_BE, 'utf-32be'),
+    (codecs.BOM_UTF16_LE, 'utf-16le'),
+    (codecs.BOM_UTF16_BE, 'utf-16be'),
+)
+
+
+def detect_encoding(head):
+    """
+    Sayfanın karakter kodlamasını BeautifulSoup ile aynı öncelik sırasıyla belirler:
+    BOM, belgede bildirilen kodlama, utf-8, windows-1252.
+
+    Args:
+        head (bytes): Sayfanın başlangıç baytları (en az ilk 2 KB önerilir).
+
+    Returns:
+        tuple: (kodlama_adı, bom_uzunluğu) çifti.
+    """
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding, len(bom)
+
+    match = _DECLARED_ENCODING_PATTERN.search(head, 0, max(2048, int(len(head) * 0.05)))
+    if match:
+        declared = match.group(1).decode('ascii', 'replace').strip().lower()
+        try:
+            return codecs.lookup(declared).name, 0
+        except LookupError:
+            pass
+
+    return 'utf-8', 0
+
+
+def decode_html(content):
+    """
+    Ham sayfa baytlarını metne çevirir.
+
+    Args:
+        content (bytes): Ham sayfa içeriği.
+
+    Returns:
+        str: Çözülmüş sayfa metni.
+    """
+    encoding, bom_length = detect_encoding(content[:4096])
+    body = content[bom_length:]
+    for candidate in (encoding, 'utf-8', 'windows-1252'):
+        try:
+            return body.decode(candidate)
+        except (UnicodeDecodeError, LookupError):
+            continue
+    return body.decode('utf-8', 'replace')
+
+
+class PriceTableParser(HTMLParser):
+    """
+    Hedef kutudaki tablo satırlarını hücre metinleri olarak toplayan artımlı ayrıştırıcı.
+
+    BeautifulSoup'un html.parser ağacıyla aynı sonucu üretmek için kapanış etiketleri
+    en yakın açık eşleşen etikete kadar açık öğeleri kapatır, eşleşmeyen kapanışlar yok sayılır.
+    feed() ile parça parça beslenebilir; hedef kutu kapandığında done True olur.
+    """
+
+    def __init__(self, target_index=TARGET_INDEX):
+        """
+        Args:
+            target_index (int): Sayfadaki eşleşen kutular arasında hedefin sırası (0 tabanlı).
+        """
+        super().__init__(convert_charrefs=True)
+        self.target_index = target_index
+        self.matched_count = 0
+        self.done = False
+        self.rows = []
+        self._stack = []      # Hedef kutu içindeki açık öğeler: (etiket, hücre_veya_satır)
+        self._open_cells = 0
+        self._skip_depth = 0
+
+    @property
+    def in_target(self):
+        """
+        Returns:
+            bool: Ayrıştırıcı hedef kutunun içindeyse True.
+        """
+        return bool(self._stack)
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+
+        if not self._stack:
+            if tag == 'div' and self._is_target(attrs):
+                if self.matched_count == self.target_index:
+                    self._stack.append(('div', None))
+                self.matched_count += 1
+            return
+
+        if tag in VOID_TAGS:
+            return
+
+        item = None
+        if tag == 'tr':
+            item = []
+            self.rows.append(item)
+        elif tag == 'td':
+            item = []
+            # Hücre, açık olan tüm satırların alt öğesidir
+            for open_tag, open_item in self._stack:
+                if open_tag == 'tr':
+                    open_item.append(item)
+            self._open_cells += 1
+        elif tag in _SKIPPED_TEXT_TAGS:
+            self._skip_depth += 1
+
+        self._stack.append((tag, item))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self.done or not self._stack:
+            return
+
+        for position in range(len(self._stack) - 1, -1, -1):
+            if self._stack[position][0] == tag:
+                break
+        else:
+            return
+
+        for open_tag, _ in self._stack[position:]:
+            if open_tag == 'td':
+                self._open_cells -= 1
+            elif open_tag in _SKIPPED_TEXT_TAGS:
+                self._skip_depth -= 1
+        del self._stack[position:]
+
+        if not self._stack:
+            self.done = True
+
+    def handle_data(self, data):
+        if not self._open_cells or self._skip_depth:
+            return
+        # Metin, açık olan tüm hücrelerin .text değerine eklenir
+        for open_tag, open_item in self._stack:
+            if open_tag == 'td':
+                open_item.append(data)
+
+    @staticmethod
+    def _is_target(attrs):
+        for name, value in attrs:
+            if name == 'class' and value is not None:
+                return ' '.join(value.split()) == TARGET_CLASS
+        return False
+
+    def cell_rows(self):
+        """
+        Başlık satırı hariç, her satırın hücre metinlerini döndürür.
+
+        Returns:
+            list: Her satır için hücre metinleri listesi.
+        """
+        return [[''.join(cell) for cell in row] for row in self.rows[1:]]
+
+
+def parse_price_table(content, target_index=TARGET_INDEX):
+    """
+    Hedef fiyat tablosunu sayfanın yalnızca ilgili bölümünü ayrıştırarak okur.
+
+    Hedef kutunun başlangıcı düzenli ifadeyle bulunur, belirteçleme o noktadan başlar
+    ve kutu kapandığında durur.
+
+    Args:
+        content (bytes or str): Sayfa içeriği.
+        target_index (int): Eşleşen kutular arasında hedefin sırası (0 tabanlı).
+
+    Returns:
+        list or None: Başlık satırı hariç hücre metinleri; hedef kutu bulunamazsa None.
+    """
+    text = decode_html(content) if isinstance(content, bytes) else content
+
+    start = None
+    count = 0
+    for match in _TARGET_DIV_PATTERN.finditer(text):
+        if match.group('div') is None:
+            continue
+        if count == target_index:
+            start = match.start()
+            break
+        count += 1
+    if start is None:
+        return None
+
+    # Kutu kapanınca sayfanın geri kalanı belirteçlenmez
+    parser = PriceTableParser(target_index=0)
+    position = start
+    while not parser.done and position < len(text):
+        parser.feed(text[position:position + FEED_CHUNK_SIZE])
+        position += FEED_CHUNK_SIZE
+    parser.close()
+    if not parser.matched_count:
+        return None
+
+    return parser.cell_rows()
+
+
+class StreamedTable:
+    """
+    Akış halinde okunan sayfadan çıkarılan tablo ve yanıt bilgileri.
+    """
+
+    def __init__(self, rows, bytes_read, stopped_early, status_code=200, headers=None, source_url=None, content=None):
+        """
+        Args:
+            rows (list or None): Başlık satırı hariç hücre metinleri; hedef kutu bulunamadıysa None.
+            bytes_read (int): İndirilen bayt sayısı.
+            stopped_early (bool): Hedef kutu kapandığı için okuma sayfa bitmeden bırakıldıysa True;
+                bu durumda okunan baytlar sayfanın yalnızca başıdır.
+            status_code (int): HTTP durum kodu.
+            headers (dict, optional): HTTP yanıt başlıkları.
+            source_url (str, optional): İstek URL'si.
+            content (bytes, optional): Okunan baytlar (tablo bulunamadıysa sayfanın tamamı).
+        """
+        self.rows = rows
+        self.bytes_read = bytes_read
+        self.stopped_early = stopped_early
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.source_url = source_url
+        self.content = content
+
+
+def capture_chunks(chunks, sink):
+    """
+    Akış halinde okunan parçaları değiştirmeden geçirirken listeye de ekler.
+
+    Args:
+        chunks (iterable): Bayt parçaları.
+        sink (list): Parçaların ekleneceği liste.
+
+    Yields:
+        bytes: Gelen parça.
+    """
+    for chunk in chunks:
+        sink.append(chunk)
+        yield chunk
+
+
+def stream_price_table(chunks, target_index=TARGET_INDEX):
+    """
+    Bayt parçalarını geldikçe ayrıştırır, hedef kutu kapanınca okumayı bırakır.
+
+    Kodlama ilk 4 KB'tan belirlenir; sonraki parçalar artımlı çözücüyle metne çevrilir.
+
+    Args:
+        chunks (iterable): Sayfa içeriğinin bayt parçaları.
+        target_index (int): Eşleşen kutular arasında hedefin sırası (0 tabanlı).
+
+    Returns:
+        tuple: (satırlar, okunan_bayt, erken_durduruldu) üçlüsü. Hedef kutu bulunamazsa satırlar None.
+    """
+    parser = PriceTableParser(target_index=target_index)
+    decoder = None
+    head = b''
+    bytes_read = 0
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        bytes_read += len(chunk)
+
+        if decoder is None:
+            # Kodlamayı belirlemek için ilk baytları biriktir
+            head += chunk
+            if len(head) < 4096:
+                continue
+            encoding, bom_length = detect_encoding(head)
+            decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+            chunk, head = head[bom_length:], b''
+
+        parser.feed(decoder.decode(chunk))
+        if parser.done:
+            break
+    else:
+        # Sayfa 4 KB'tan kısaysa veya sona kadar okunduysa kalanları işle
+        if decoder is None:
+            encoding, bom_length = detect_encoding(head)
+            decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+            head = head[bom_length:]
+        parser.feed(decoder.decode(head, final=True))
+        parser.close()
+
+    rows = parser.cell_rows() if parser.matched_count > target_index else None
+    return rows, bytes_read, parser.done
@@ -1,10 +1,11 @@
 """
 UzmanPara veri kaynağı - uzmanpara.milliyet.com.tr sitesinden altın fiyatlarını çeker.
 """
-from bs4 import BeautifulSoup
-
 import config
 from data_sources.base_source import BaseDataSource
+from data_sources.uzmanpara_parser import (
+    TARGET_CLASS, TARGET_INDEX, StreamedTable, capture_chunks, parse_price_table, stream_price_table
+)
 from utils.logger import setup_logger, log_function_call
 
 logger = setup_logger(__name__)
@@ -14,15 +15,25 @@ class UzmanParaSource(BaseDataSource):
     """
     UzmanPara.milliyet.com.tr sitesinden altın fiyatlarını çeken veri kaynağı.
     """
-    def __init__(self):
+    def __init__(self, parser_mode=None, streaming=None):
         """
         UzmanParaSource sınıfını başlatır.
+
+        Args:
+            parser_mode (str, optional): 'fast' (yalnızca hedef tablo) veya 'full' (BeautifulSoup).
+                Varsayılan: config.UZMANPARA_PARSER.
+            streaming (bool, optional): True ise sayfa parça parça okunur ve tablo bitince bağlantı kapatılır.
+                Varsayılan: config.UZMANPARA_STREAMING. Akış modu hızlı ayrıştırıcıyı kullandığından
+                'full' modunda sayfa her zaman tam indirilir.
         """
         super().__init__(
             name="UzmanPara",
             url=config.UZMANPARA_URL,
             headers=config.HEADERS
         )
+        self.parser_mode = parser_mode or config.UZMANPARA_PARSER
+        streaming = config.UZMANPARA_STREAMING if streaming is None else streaming
+        self.streaming = streaming and self.parser_mode != 'full'
 
     @log_function_call
     def fetch_data(self):
@@ -30,19 +41,114 @@ class UzmanParaSource(BaseDataSource):
         UzmanPara sitesinden veri çeker.
 
         Returns:
-            requests.Response: HTTP yanıtı.
+            requests.Response or StreamedTable: HTTP yanıtı veya akış modunda ayrıştırılmış tablo.
         """
-        response = self.get_http_response()
-        logger.info(f"[{self.name}] Web sayfası başarıyla çekildi: {len(response.content)} byte")
+        if self.streaming:
+            return self.fetch_streaming()
+
+        response = self.get_http_response(conditional=config.HTTP_CONDITIONAL_REQUESTS)
+        if self.is_not_modified(response):
+            logger.info(f"[{self.name}] Web sayfası değişmemiş (304).")
+        else:
+            logger.info(f"[{self.name}] Web sayfası başarıyla çekildi: {len(response.content)} byte")
         return response
 
+    def fetch_streaming(self):
+        """
+        Sayfayı parça parça indirir, parçaları artımlı ayrıştırıcıya verir ve hedef tablo
+        kapanınca bağlantıyı kapatır; sayfanın geri kalanı indirilmez.
+
+        Returns:
+            StreamedTable or requests.Response: Ayrıştırılmış tablo veya 304 yanıtı.
+        """
+        response = self.get_http_response(conditional=config.HTTP_CONDITIONAL_REQUESTS, stream=True)
+        try:
+            if self.is_not_modified(response):
+                logger.info(f"[{self.name}] Web sayfası değişmemiş (304).")
+                return response
+
+            # Okunan baytlar saklanır: tablo bulunamazsa tam ayrıştırmaya, arşiv açıksa arşive aktarılır
+            captured = []
+            chunks = capture_chunks(response.iter_content(chunk_size=config.STREAM_CHUNK_SIZE), captured)
+
+            rows, bytes_read, stopped_early = stream_price_table(chunks)
+        finally:
+            # Okunmayan gövde bağlantıyla birlikte bırakılır
+            response.close()
+
+        logger.info(f"[{self.name}] Web sayfası akış halinde okundu: {bytes_read} byte"
+                    f"{', tablo bitince durduruldu' if stopped_early else ''}")
+        return StreamedTable(
+            rows=rows,
+            bytes_read=bytes_read,
+            stopped_early=stopped_early,
+            status_code=response.status_code,
+            headers=response.headers,
+            source_url=getattr(response, 'source_url', None),
+            content=b''.join(captured)
+        )
+
+    @staticmethod
+    def extract_rows_full(content):
+        """
+        Sayfanın tamamını BeautifulSoup ile ayrıştırıp hedef tablonun satırlarını döndürür.
+
+        Args:
+            content (bytes): Sayfa içeriği.
+
+        Returns:
+            list: Başlık satırı hariç, her satırın hücre metinleri.
+        """
+        # BeautifulSoup yalnızca tam ayrıştırma modunda (veya yedek yolda) yüklenir
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(content, 'html.parser')
+
+        # Hedef tabloyu bul (ikinci kutu)
+        target_div = soup.find_all('div', class_=TARGET_CLASS)[TARGET_INDEX]
+        rows = target_div.find_all('tr')[1:]  # İlk satır başlık olduğu için atla
+
+        return [[cell.text for cell in row.find_all('td')] for row in rows]
+
+    def extract_rows(self, raw_data):
+        """
+        Seçili ayrıştırıcı moduyla hedef tablonun satırlarını döndürür.
+
+        Hızlı mod veya akış halinde okuma hedef tabloyu bulamazsa okunan baytlar tam ayrıştırmayla
+        yeniden denenir; tablo bulunamadığında akış sayfa sonuna kadar okunmuş olur.
+
+        Args:
+            raw_data (requests.Response or StreamedTable): fetch_data sonucu.
+
+        Returns:
+            list: Başlık satırı hariç, her satırın hücre metinleri.
+
+        Raises:
+            ValueError: Akış halinde okunan sayfada hedef tablo bulunamaz ve sayfa içeriği yoksa.
+        """
+        content = raw_data.content
+        if isinstance(raw_data, StreamedTable):
+            if raw_data.rows is not None:
+                return raw_data.rows
+            if not content:
+                raise ValueError("Akış halinde okunan sayfada hedef tablo bulunamadı.")
+            logger.warning(f"[{self.name}] Akış halinde okunan sayfada hedef tablo bulunamadı, "
+                           f"tam ayrıştırma deneniyor.")
+        elif self.parser_mode == 'fast':
+            rows = parse_price_table(content)
+            if rows is not None:
+                return rows
+            logger.warning(f"[{self.name}] Hızlı ayrıştırıcı hedef tabloyu bulamadı, tam ayrıştırma deneniyor.")
+
+        return self.extract_rows_full(content)
+
     @log_function_call
     def process_data(self, response):
         """
         UzmanPara sitesinden çekilen verileri işler.
 
         Args:
-            response (requests.Response): HTTP yanıtı.
+            response (requests.Response or StreamedTable): HTTP yanıtı veya akış modunda ayrıştırılmış tablo.
 
         Returns:
             dict: İşlenmiş altın fiyat verileri.
@@ -50,31 +156,25 @@ class UzmanParaSource(BaseDataSource):
         prices_data = {}
 
         try:
-            # HTML içeriğini ayrıştır
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            # Hedef tabloyu bul (ikinci kutu)
-            target_div = soup.find_all('div', class_='box box7 box11')[1]
-            rows = target_div.find_all('tr')[1:]  # İlk satır başlık olduğu için atla
+            # HTML içeriğini ayrıştır ve hedef tablonun satırlarını al
+            rows = self.extract_rows(response)
 
             logger.info(f"[{self.name}] Hedef tablo başarıyla ayrıştırıldı: {len(rows)} satır bulundu")
 
             # Her satırı işle
-            for row in rows:
+            for cells in rows:
                 try:
-                    cells = row.find_all('td')
-
                     # Yeterli hücre var mı kontrol et
                     if len(cells) < 4:
                         logger.warning(f"[{self.name}] Yetersiz hücre sayısı bulundu, satır atlanıyor")
                         continue
 
                     # Veri ayıklama
-                    gold_type = cells[1].text.strip()
+                    gold_type = cells[1].strip()
 
                     # TL işaretini kaldır ve nokta/virgül düzeltmesi yap
-                    buy_price_text = cells[3].text.strip().replace('.', '').replace(' TL', '').replace(',', '.')
-                    sell_price_text = cells[2].text.strip().replace('.', '').replace(' TL', '').replace(',', '.')
+                    buy_price_text = cells[3].strip().replace('.', '').replace(' TL', '').replace(',', '.')
+                    sell_price_text = cells[2].strip().replace('.', '').replace(' TL', '').replace(',', '.')
 
                     # Sayısal değere dönüştür
                     try:
@@ -91,8 +191,8 @@ class UzmanParaSource(BaseDataSource):
                         'Satış Fiyatı': sell_price,
                     }
 
-                    logger.debug(f"[{self.name}] Fiyat bilgisi çekildi: {gold_type}, "
-                                f"Alış: {buy_price}, Satış: {sell_price}")
+                    logger.debug("[%s] Fiyat bilgisi çekildi: %s, Alış: %s, Satış: %s",
+                                 self.name, gold_type, buy_price, sell_price)
 
                 except Exception as e:
                     logger.error(f"[{self.name}] Satır işleme hatası: {str(e)}")
@@ -4,122 +4,335 @@ Ana uygulama modülü - Altın fiyat verilerini toplama, işleme ve veritabanın
 import sys
 import time
 import argparse
-from datetime import datetime
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime, timezone
 
 import config
 from utils.logger import setup_logger, log_function_call
-from utils.db_handler import DatabaseHandler
-from data_sources.interface import get_all_active_sources
-from processors.data_validator import DataValidator
-from processors.percentage_calculator import PercentageCalculator
+from utils.db_handler import DatabaseHandler, close_all_clients
+from utils.http_client import close_all_sessions
+from utils.metrics import registry as metrics, summarize_cycle
+from utils.resilience import breaker_states, cycle_deadline
 
 logger = setup_logger(__name__)
 
 
+def iter_sequential(data_sources):
+    """
+    Veri kaynaklarını sırayla çalıştırır.
+
+    Args:
+        data_sources (list): Veri kaynağı örnekleri.
+
+    Yields:
+        tuple: (kaynak, fiyat_verisi) çiftleri. Başarısız kaynaklar atlanır.
+    """
+    for source in data_sources:
+        try:
+            logger.info(f"'{source.name}' kaynağından veri çekiliyor...")
+            yield source, source.get_data()
+        except Exception as e:
+            logger.error(f"'{source.name}' kaynağından veri çekme hatası: {str(e)}")
+
+
+def iter_concurrent(data_sources, max_workers=config.FETCH_MAX_WORKERS):
+    """
+    Veri kaynaklarını iş parçacığı havuzunda paralel çalıştırır ve sonuçları geldikçe döndürür.
+
+    Her kaynağın kendi süre sınırı (deadline_seconds) vardır; süresini aşan kaynağın
+    sonucu beklenmez, diğer kaynakların sonuçları etkilenmez.
+
+    Args:
+        data_sources (list): Veri kaynağı örnekleri.
+        max_workers (int): En fazla iş parçacığı sayısı.
+
+    Yields:
+        tuple: (kaynak, fiyat_verisi) çiftleri, tamamlanma sırasıyla.
+    """
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(data_sources))),
+                                  thread_name_prefix='source')
+    started_at = time.monotonic()
+    deadlines = {}
+
+    try:
+        for source in data_sources:
+            logger.info(f"'{source.name}' kaynağından veri çekiliyor...")
+            # Döngü süre bütçesi kaynak iş parçacığına bağlamla aktarılır
+            future = executor.submit(contextvars.copy_context().run, source.get_data)
+            deadlines[future] = (source, started_at + source.deadline_seconds)
+
+        pending = set(deadlines)
+        while pending:
+            # En yakın süre sınırına kadar ilk tamamlanan sonucu bekle
+            nearest_deadline = min(deadlines[future][1] for future in pending)
+            timeout = max(0.0, nearest_deadline - time.monotonic())
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                source = deadlines[future][0]
+                try:
+                    yield source, future.result()
+                except Exception as e:
+                    logger.error(f"'{source.name}' kaynağından veri çekme hatası: {str(e)}")
+
+            # Süresi dolan kaynakları bırak
+            now = time.monotonic()
+            expired = {future for future in pending if deadlines[future][1] <= now}
+            for future in expired:
+                future.cancel()
+                source = deadlines[future][0]
+                logger.error(f"'{source.name}' kaynağı {source.deadline_seconds} saniyelik süre sınırını aştı, "
+                             f"sonucu beklenmeyecek.")
+            pending -= expired
+
+    finally:
+        # Süresi dolan iş parçacıklarını beklemeden havuzu kapat
+        executor.shutdown(wait=False)
+
+
 @log_function_call
-def fetch_gold_prices():
+def fetch_source_prices():
     """
-    Tüm aktif kaynaklardan altın fiyatlarını toplar.
+    Tüm aktif kaynaklardan altın fiyatlarını kaynak bazında toplar.
+
+    config.FETCH_MODE 'concurrent' ise kaynaklar paralel çekilir ve sonuçlar geldikçe eklenir.
 
     Returns:
-        dict: Toplanan altın fiyat verileri.
+        dict or None: {kaynak_adı: fiyat_verisi} sözlüğü (config.ACTIVE_SOURCES sırasıyla).
+            Hiçbir kaynaktan veri alınamazsa None.
     """
     logger.info("Tüm aktif veri kaynaklarından altın fiyatları çekiliyor...")
 
-    # Tüm aktif veri kaynaklarını al
+    # Tüm aktif veri kaynaklarını al (requests ve ayrıştırıcılar yalnızca toplama modlarında yüklenir)
+    from data_sources.interface import get_all_active_sources
     data_sources = get_all_active_sources()
     if not data_sources:
         logger.error("Aktif veri kaynağı bulunamadı!")
         return None
 
-    # Her kaynaktan veri çek ve birleştir
-    all_prices = {}
-    for source in data_sources:
-        try:
-            logger.info(f"'{source.name}' kaynağından veri çekiliyor...")
-            source_prices = source.get_data()
-
-            # Veri kontrolü
-            if not source_prices:
-                logger.warning(f"'{source.name}' kaynağından veri alınamadı.")
-                continue
-
-            logger.info(f"'{source.name}' kaynağından {len(source_prices)} altın türü fiyatı alındı.")
+    if config.FETCH_MODE == 'concurrent':
+        results = iter_concurrent(data_sources)
+    else:
+        results = iter_sequential(data_sources)
 
-            # Farklı kaynaklardan farklı altın türleri olabilir, birleştir
-            all_prices.update(source_prices)
+    received = {}
+    for source, source_prices in results:
+        # Veri kontrolü
+        if not source_prices:
+            logger.warning(f"'{source.name}' kaynağından veri alınamadı.")
+            continue
 
-        except Exception as e:
-            logger.error(f"'{source.name}' kaynağından veri çekme hatası: {str(e)}")
+        logger.info(f"'{source.name}' kaynağından {len(source_prices)} altın türü fiyatı alındı.")
+        received[source.name] = source_prices
 
-    if not all_prices:
+    if not received:
         logger.error("Hiçbir kaynaktan veri alınamadı!")
         return None
 
-    logger.info(f"Toplam {len(all_prices)} farklı altın türü için fiyat verisi çekildi.")
-    return all_prices
+    # Tamamlanma sırası değil kaynak sırası korunur; birleştirme sonucu çekim kipinden bağımsızdır
+    return {source.name: received[source.name] for source in data_sources if source.name in received}
+
+
+def consolidate_source_prices(source_prices):
+    """
+    Birden fazla kaynaktan gelen fiyatları altın türü bazında uzlaşı fiyatına indirger.
+
+    Args:
+        source_prices (dict): {kaynak_adı: fiyat_verisi} sözlüğü.
+
+    Returns:
+        tuple: (fiyat_verisi, Consolidation) çifti; tek kaynak varsa fiyatlar olduğu gibi döner ve
+            birleştirme yapılmadığı için ikinci öğe None olur.
+    """
+    if len(source_prices) == 1:
+        prices = next(iter(source_prices.values()))
+        logger.info(f"Toplam {len(prices)} farklı altın türü için fiyat verisi çekildi.")
+        return prices, None
+
+    # numpy yalnızca birden fazla kaynak olduğunda yüklenir
+    from processors.quote_consolidator import QuoteConsolidator
+    consolidation = QuoteConsolidator().consolidate(source_prices)
+    logger.info(f"Toplam {len(consolidation.prices)} farklı altın türü için fiyat verisi çekildi.")
+    return consolidation.prices, consolidation
+
+
+def merge_source_prices(source_prices):
+    """
+    Kaynak bazındaki fiyatları tek sözlükte birleştirir; aynı altın türü birden fazla kaynakta
+    varsa config.QUOTE_CONSENSUS_METHOD ile uzlaşı fiyatı hesaplanır.
+
+    Args:
+        source_prices (dict): {kaynak_adı: fiyat_verisi} sözlüğü.
+
+    Returns:
+        dict: Birleştirilmiş fiyat verileri.
+    """
+    return consolidate_source_prices(source_prices)[0]
 
 
 @log_function_call
-def run_gold_price_collection():
+def fetch_gold_prices():
     """
-    Altın fiyat toplama işlemini çalıştırır.
+    Tüm aktif kaynaklardan altın fiyatlarını toplar ve birleştirir.
 
     Returns:
-        bool: İşlem başarılıysa True, değilse False.
+        dict: Toplanan altın fiyat verileri.
+    """
+    source_prices = fetch_source_prices()
+    return merge_source_prices(source_prices) if source_prices else None
+
+
+def record_intraday_prices(db_handler, source_prices, collected_at, date):
+    """
+    Kaynak bazındaki okumaları gün içi kovalara ekler; hata yalnızca uyarı olarak günlüğe yazılır.
+
+    Args:
+        db_handler (DatabaseHandler): Veritabanı işleyicisi.
+        source_prices (dict): {kaynak_adı: fiyat_verisi} sözlüğü.
+        collected_at (datetime): Okuma zamanı (UTC).
+        date (str): Okumanın ait olduğu gün (YYYY-MM-DD).
+    """
+    if not config.INTRADAY_ENABLED:
+        return
+    try:
+        db_handler.insert_intraday_prices(source_prices, collected_at, date)
+    except Exception as e:
+        logger.warning(f"Gün içi fiyatlar kaydedilemedi: {str(e)}")
+
+
+@log_function_call
+def collect_gold_prices(db_handler=None):
+    """
+    Altın fiyatlarını toplar, doğrular ve kaydeder.
+
+    Args:
+        db_handler (DatabaseHandler, optional): Döngüler boyunca kullanılan işleyici.
+            Verilmezse paylaşılan istemci üzerinden yenisi oluşturulur.
+
+    Returns:
+        dict or None: Anlık görüntü ({'date', 'data', 'changed'}); fiyatlar aynı gün için son
+            kayıttan beri değişmediyse 'changed' False olur, hiçbir şey yazılmaz ve 'processed' o kayıt
+            için yüzde hesaplamasının tamamlanıp tamamlanmadığını gösterir. İşlem başarısızsa None.
     """
     logger.info("Altın fiyat toplama işlemi başlatılıyor...")
 
     try:
-        # Veritabanı bağlantısı oluştur
-        db_handler = DatabaseHandler()
+        # Veritabanı işleyicisi (bağlantılar paylaşılan havuzdan gelir)
+        db_handler = db_handler or DatabaseHandler()
 
-        # Veri topla
-        prices = fetch_gold_prices()
-        if not prices:
+        # Veri topla (kaynak bazındaki sonuçlar gün içi kayıt için saklanır)
+        source_prices = fetch_source_prices()
+        if not source_prices:
             logger.error("Fiyat verisi toplanamadı. İşlem sonlandırılıyor.")
-            return False
+            return None
+        collected_at = datetime.now(timezone.utc)
+        prices, consolidation = consolidate_source_prices(source_prices)
+        snapshot = {'date': db_handler.current_date(), 'data': prices, 'changed': True}
+
+        # Aynı gün için son yazılan fiyatlarla aynıysa yazma, doğrulama ve önbellek güncellemesini atla
+        change_detector = None
+        if config.CHANGE_DETECTION_ENABLED:
+            from utils.change_detector import ChangeDetector
+            change_detector = ChangeDetector(db_handler)
+            if change_detector.is_unchanged(snapshot['date'], prices):
+                logger.info("Fiyatlar son kayıttan beri değişmedi, yazma atlandı.")
+                # Uzlaşı fiyatı aynı kalsa da kaynak okumaları değişmiş olabilir; gün içi kayıt atlanmaz
+                record_intraday_prices(db_handler, source_prices, collected_at, snapshot['date'])
+                try:
+                    change_detector.record_heartbeat()
+                except Exception as e:
+                    logger.warning(f"Son görülme zamanı kaydedilemedi: {str(e)}")
+                snapshot['changed'] = False
+                snapshot['processed'] = change_detector.processed
+                return snapshot
 
         # Veri doğrula
+        from processors.data_validator import DataValidator
         validator = DataValidator(db_handler)
         if not validator.validate_complete_dataset(prices):
             logger.error("Veri doğrulama başarısız. İşlem sonlandırılıyor.")
-            return False
+            return None
 
         # Veritabanına kaydet
-        db_handler.insert_gold_prices(prices)
+        db_handler.insert_gold_prices(prices, snapshot['date'])
         logger.info("Altın fiyatları başarıyla veritabanına kaydedildi.")
 
-        # Bağlantıyı kapat
-        db_handler.close()
-
-        return True
+        if change_detector is not None:
+            try:
+                change_detector.record_write(snapshot['date'], prices)
+            except Exception as e:
+                logger.warning(f"Anlık görüntü parmak izi kaydedilemedi: {str(e)}")
+
+        # Kaynak tekliflerini ve aykırılık işaretlerini köken koleksiyonuna yaz (hata günlük kaydı geçersiz kılmaz)
+        if consolidation is not None and config.QUOTE_PROVENANCE_ENABLED:
+            try:
+                db_handler.upsert_quote_provenance(
+                    snapshot['date'], consolidation.provenance_document(snapshot['date'], collected_at))
+            except Exception as e:
+                logger.warning(f"Fiyat kökeni kaydedilemedi: {str(e)}")
+
+        # Gün içi okumaları kaynak bazında kovalara ekle (hata günlük kaydı geçersiz kılmaz)
+        record_intraday_prices(db_handler, source_prices, collected_at, snapshot['date'])
+
+        # Yerel fiyat geçmişi önbelleğine ekle (hata toplama işlemini başarısız saymaz)
+        if config.PRICE_CACHE_ENABLED:
+            from utils.price_history_cache import PriceHistoryCache
+            try:
+                PriceHistoryCache().append(snapshot['date'], prices)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Fiyat önbelleği güncellenemedi: {str(e)}")
+
+        return snapshot
 
     except Exception as e:
         logger.error(f"Altın fiyat toplama işlemi sırasında hata: {str(e)}")
-        return False
+        return None
+
+
+@log_function_call
+def run_gold_price_collection(db_handler=None):
+    """
+    Altın fiyat toplama işlemini çalıştırır.
+
+    Args:
+        db_handler (DatabaseHandler, optional): Döngüler boyunca kullanılan işleyici.
+            Verilmezse paylaşılan istemci üzerinden yenisi oluşturulur.
+
+    Returns:
+        bool: İşlem başarılıysa True, değilse False.
+    """
+    return collect_gold_prices(db_handler) is not None
 
 
 @log_function_call
-def run_percentage_calculation():
+def run_percentage_calculation(db_handler=None, incremental=False, snapshot=None):
     """
     Yüzde değişim hesaplama işlemini çalıştırır.
 
+    Args:
+        db_handler (DatabaseHandler, optional): Döngüler boyunca kullanılan işleyici.
+            Verilmezse paylaşılan istemci üzerinden yenisi oluşturulur.
+        incremental (bool): True ise yalnızca kontrol noktasından sonra yeni/değişen günler hesaplanır.
+        snapshot (dict, optional): Aynı döngüde toplanan anlık görüntü; verilirse en son kayıt
+            veritabanından tekrar okunmaz.
+
     Returns:
         bool: İşlem başarılıysa True, değilse False.
     """
     logger.info("Yüzde değişim hesaplama işlemi başlatılıyor...")
 
     try:
-        # Veritabanı bağlantısı oluştur
-        db_handler = DatabaseHandler()
+        # Veritabanı işleyicisi (bağlantılar paylaşılan havuzdan gelir)
+        db_handler = db_handler or DatabaseHandler()
 
         # Yüzde değişimi hesapla
+        from processors.percentage_calculator import PercentageCalculator
         calculator = PercentageCalculator(db_handler)
-        result = calculator.process_daily_differences()
-
-        # Bağlantıyı kapat
-        db_handler.close()
+        if incremental:
+            result = calculator.process_incremental(snapshot)
+        else:
+            result = calculator.process_daily_differences(snapshot)
 
         if result is not None:
             logger.info("Yüzde değişim hesaplama işlemi başarıyla tamamlandı.")
@@ -134,34 +347,193 @@ def run_percentage_calculation():
 
 
 @log_function_call
-def run_full_process():
+def run_percentage_backfill(db_handler=None, start_date=None, end_date=None):
+    """
+    Tüm fiyat geçmişi için günlük yüzde değişimlerini yeniden hesaplar.
+
+    Args:
+        db_handler (DatabaseHandler, optional): Döngüler boyunca kullanılan işleyici.
+        start_date (str, optional): İlk hesaplanacak tarih (YYYY-MM-DD).
+        end_date (str, optional): Son hesaplanacak tarih (YYYY-MM-DD).
+
+    Returns:
+        bool: İşlem başarılıysa True, değilse False.
+    """
+    logger.info("Geçmiş yüzde değişim hesaplama işlemi başlatılıyor...")
+
+    try:
+        from processors.percentage_backfill import PercentageBackfill
+        backfill = PercentageBackfill(db_handler or DatabaseHandler())
+        written = backfill.run(start_date, end_date)
+
+        logger.info(f"Geçmiş yüzde değişim hesaplama işlemi tamamlandı: {written} belge yazıldı.")
+        return True
+
+    except Exception as e:
+        logger.error(f"Geçmiş yüzde değişim hesaplama işlemi sırasında hata: {str(e)}")
+        return False
+
+
+@log_function_call
+def run_cache_rebuild(db_handler=None):
+    """
+    Yerel fiyat geçmişi önbelleğini veritabanındaki tüm geçmişten yeniden oluşturur.
+
+    Args:
+        db_handler (DatabaseHandler, optional): Döngüler boyunca kullanılan işleyici.
+
+    Returns:
+        bool: İşlem başarılıysa True, değilse False.
+    """
+    logger.info("Fiyat geçmişi önbelleği yeniden oluşturuluyor...")
+
+    try:
+        from utils.price_history_cache import PriceHistoryCache
+        rows = PriceHistoryCache().rebuild(db_handler or DatabaseHandler())
+        logger.info(f"Fiyat geçmişi önbelleği hazır: {rows} tarih ({config.PRICE_CACHE_DIR})")
+        return True
+
+    except Exception as e:
+        logger.error(f"Fiyat geçmişi önbelleği oluşturulurken hata: {str(e)}")
+        return False
+
+
+@log_function_call
+def run_return_calculation(db_handler=None):
+    """
+    Yapılandırılmış tüm zaman ufukları için getirileri hesaplar.
+
+    Args:
+        db_handler (DatabaseHandler, optional): Döngüler boyunca kullanılan işleyici.
+
+    Returns:
+        bool: İşlem başarılıysa True, değilse False.
+    """
+    logger.info(f"Getiri hesaplama işlemi başlatılıyor: {', '.join(config.RETURN_HORIZONS)}")
+
+    try:
+        from processors.return_calculator import ReturnCalculator
+        calculator = ReturnCalculator(db_handler or DatabaseHandler())
+        result = calculator.process_returns()
+
+        if result is not None:
+            logger.info("Getiri hesaplama işlemi başarıyla tamamlandı.")
+            return True
+        else:
+            logger.warning("Getiri hesaplama işlemi sonuç üretmedi.")
+            return False
+
+    except Exception as e:
+        logger.error(f"Getiri hesaplama işlemi sırasında hata: {str(e)}")
+        return False
+
+
+@log_function_call
+def run_full_process(db_handler=None, incremental=False):
     """
     Tam işlem döngüsünü çalıştırır: veri toplama ve yüzde hesaplama.
 
+    Args:
+        db_handler (DatabaseHandler, optional): Döngüler boyunca kullanılan işleyici.
+        incremental (bool): True ise yüzde hesaplaması artımlı yapılır.
+
     Returns:
         bool: İşlem başarılıysa True, değilse False.
     """
     logger.info("Tam altın fiyat işleme döngüsü başlatılıyor...")
 
     # Fiyatları topla
-    price_result = run_gold_price_collection()
-    if not price_result:
+    snapshot = collect_gold_prices(db_handler)
+    if snapshot is None:
         logger.error("Fiyat toplama işlemi başarısız olduğundan tam döngü tamamlanamadı.")
         return False
 
-    # Biraz bekle (işlemlerin veritabanına tamamen yazılması için)
-    time.sleep(2)
+    # Fiyatlar değişmediyse ve hesaplama daha önce tamamlandıysa yüzde değişimleri de değişmez
+    if not snapshot['changed'] and snapshot['processed']:
+        logger.info("Fiyatlar değişmediği için yüzde hesaplaması atlandı.")
+        return True
 
-    # Yüzde değişimleri hesapla
-    percentage_result = run_percentage_calculation()
+    # Yüzde değişimleri hesapla (yeni anlık görüntü bellekten aktarılır, yalnızca önceki gün okunur)
+    percentage_result = run_percentage_calculation(db_handler, incremental, snapshot)
     if not percentage_result:
         logger.warning("Yüzde değişim hesaplama başarısız oldu, ancak fiyat toplama işlemi başarılıydı.")
         return False
 
+    if config.CHANGE_DETECTION_ENABLED:
+        from utils.change_detector import ChangeDetector
+        try:
+            ChangeDetector(db_handler or DatabaseHandler()).mark_processed(snapshot['date'], snapshot['data'])
+        except Exception as e:
+            logger.warning(f"Hesaplama durumu kaydedilemedi: {str(e)}")
+
     logger.info("Tam işlem döngüsü başarıyla tamamlandı.")
     return True
 
 
+def build_scheduled_jobs(db_handler, job_specs, incremental=False):
+    """
+    Zamanlama tanımlarından zamanlayıcı işlerini oluşturur. Tüm işler aynı veritabanı işleyicisini
+    ve bağlantı havuzunu paylaşır.
+
+    Args:
+        db_handler (DatabaseHandler): Paylaşılan işleyici.
+        job_specs (str): 'ad=zamanlama;ad=zamanlama' biçiminde iş tanımları.
+        incremental (bool): True ise yüzde hesaplaması artımlı yapılır.
+
+    Returns:
+        list: Job nesneleri.
+
+    Raises:
+        ValueError: İş adı bilinmiyorsa veya zamanlama geçersizse.
+    """
+    from utils.scheduler import Job, parse_job_specs
+
+    runners = {
+        'collect': lambda: run_gold_price_collection(db_handler),
+        'calculate': lambda: run_percentage_calculation(db_handler, incremental),
+        'full': lambda: run_full_process(db_handler, incremental),
+        'returns': lambda: run_return_calculation(db_handler),
+        'rebuild-cache': lambda: run_cache_rebuild(db_handler),
+    }
+
+    jobs = []
+    for name, schedule in parse_job_specs(job_specs):
+        if name not in runners:
+            raise ValueError(f"Bilinmeyen iş: '{name}'. Geçerli işler: {', '.join(runners)}")
+        jobs.append(Job(name, runners[name], schedule,
+                        jitter_seconds=config.SCHEDULE_JITTER_SECONDS,
+                        misfire_policy=config.SCHEDULE_MISFIRE_POLICY,
+                        misfire_grace_seconds=config.SCHEDULE_MISFIRE_GRACE_SECONDS))
+    return jobs
+
+
+def run_scheduler(db_handler, job_specs, incremental=False, run_immediately=False):
+    """
+    İşleri kendi zamanlamalarıyla tek süreçte, SIGINT/SIGTERM gelene kadar çalıştırır.
+
+    Args:
+        db_handler (DatabaseHandler): Paylaşılan işleyici.
+        job_specs (str): İş tanımları.
+        incremental (bool): True ise yüzde hesaplaması artımlı yapılır.
+        run_immediately (bool): True ise tüm işler başlangıçta bir kez çalıştırılır.
+
+    Returns:
+        bool: Zamanlayıcı düzgün sonlandıysa True, iş tanımları geçersizse False.
+    """
+    from utils.scheduler import Scheduler
+
+    try:
+        jobs = build_scheduled_jobs(db_handler, job_specs, incremental)
+    except ValueError as e:
+        logger.error(f"Zamanlama tanımı geçersiz: {str(e)}")
+        return False
+
+    scheduler = Scheduler(jobs)
+    scheduler.install_signal_handlers()
+    scheduler.run(run_immediately=run_immediately)
+    return True
+
+
 def setup_arguments():
     """
     Komut satırı argümanlarını ayarlar.
@@ -179,12 +551,31 @@ def setup_arguments():
                             help='Sadece yüzde değişim hesapla')
     mode_group.add_argument('--full', action='store_true',
                             help='Tam döngü çalıştır (toplama + hesaplama)')
+    mode_group.add_argument('--returns', action='store_true',
+                            help='Tüm zaman ufukları (1g/7g/30g/YBB/1y) için getirileri hesapla')
+    mode_group.add_argument('--backfill', action='store_true',
+                            help='Tüm geçmiş için günlük yüzde değişimlerini yeniden hesapla')
+    mode_group.add_argument('--rebuild-cache', action='store_true',
+                            help='Yerel fiyat geçmişi önbelleğini veritabanından yeniden oluştur')
+    mode_group.add_argument('--schedule', action='store_true',
+                            help='İşleri kendi zamanlamalarıyla tek süreçte sürekli çalıştır (--jobs)')
 
     # Diğer seçenekler
     parser.add_argument('--interval', type=int,
                         help=f'Kontrol aralığı (dakika), varsayılan: {config.CHECK_INTERVAL_MINUTES}')
     parser.add_argument('--loops', type=int, default=1,
                         help='Çalıştırılacak döngü sayısı, sürekli için 0 girin')
+    parser.add_argument('--incremental', action='store_true', default=config.INCREMENTAL_CALCULATION,
+                        help='Yüzde değişimi yalnızca kontrol noktasından sonra yeni/değişen günler için hesapla')
+    parser.add_argument('--jobs', default=config.SCHEDULE_JOBS,
+                        help="--schedule için iş tanımları (ör. 'collect=*/1 * * * *;calculate=@hourly'), "
+                             f"varsayılan: '{config.SCHEDULE_JOBS}'")
+    parser.add_argument('--run-now', action='store_true',
+                        help='--schedule modunda tüm işleri başlangıçta bir kez hemen çalıştır')
+    parser.add_argument('--start-date',
+                        help='--backfill için ilk tarih (YYYY-MM-DD), varsayılan: en eski kayıt')
+    parser.add_argument('--end-date',
+                        help='--backfill için son tarih (YYYY-MM-DD), varsayılan: en yeni kayıt')
 
     return parser.parse_args()
 
@@ -207,6 +598,26 @@ def main():
         run_mode = "calculate"
     elif args.full:
         run_mode = "full"
+    elif args.returns:
+        run_mode = "returns"
+    elif args.backfill:
+        run_mode = "backfill"
+    elif args.rebuild_cache:
+        run_mode = "rebuild-cache"
+    elif args.schedule:
+        run_mode = "schedule"
+
+    # Zamanlayıcı modunda döngü yerine her iş kendi zamanlamasıyla çalışır
+    if run_mode == "schedule":
+        logger.info(f"Çalıştırma modu: schedule, İşler: {args.jobs}")
+        try:
+            return 0 if run_scheduler(DatabaseHandler(), args.jobs, args.incremental, args.run_now) else 1
+        except Exception as e:
+            logger.error(f"Zamanlayıcı çalışırken beklenmeyen hata: {str(e)}", exc_info=True)
+            return 1
+        finally:
+            close_all_sessions()
+            close_all_clients()
 
     # Aralık ve döngü ayarları
     interval_minutes = args.interval or config.CHECK_INTERVAL_MINUTES
@@ -217,6 +628,9 @@ def main():
                 f"Kontrol aralığı: {interval_minutes} dakika, "
                 f"Maksimum döngü: {'sınırsız' if max_loops <= 0 else max_loops}")
 
+    # Tüm döngüler boyunca tek işleyici ve paylaşılan bağlantı havuzu kullanılır
+    db_handler = DatabaseHandler()
+
     try:
         # Ana döngü
         while max_loops <= 0 or current_loop < max_loops:
@@ -226,14 +640,24 @@ def main():
             logger.info(f"Döngü {current_loop}{' / ' + str(max_loops) if max_loops > 0 else ''} başlatılıyor. "
                         f"Saat: {loop_start_time.strftime('%H:%M:%S')}")
 
-            # Seçilen moda göre işlemi çalıştır
+            if metrics.enabled:
+                metrics.start_cycle(run_mode)
+
+            # Seçilen moda göre işlemi çalıştır (yeniden denemeler döngü süre bütçesini aşamaz)
             success = False
-            if run_mode == "collect":
-                success = run_gold_price_collection()
-            elif run_mode == "calculate":
-                success = run_percentage_calculation()
-            elif run_mode == "full":
-                success = run_full_process()
+            with cycle_deadline():
+                if run_mode == "collect":
+                    success = run_gold_price_collection(db_handler)
+                elif run_mode == "calculate":
+                    success = run_percentage_calculation(db_handler, args.incremental)
+                elif run_mode == "full":
+                    success = run_full_process(db_handler, args.incremental)
+                elif run_mode == "returns":
+                    success = run_return_calculation(db_handler)
+                elif run_mode == "backfill":
+                    success = run_percentage_backfill(db_handler, args.start_date, args.end_date)
+                elif run_mode == "rebuild-cache":
+                    success = run_cache_rebuild(db_handler)
 
             # Sonuç durumunu logla
             if success:
@@ -241,6 +665,28 @@ def main():
             else:
                 logger.error(f"Döngü {current_loop} başarısız oldu.")
 
+            cache_stats = db_handler.cache_stats()
+            if cache_stats:
+                logger.info(f"Anlık görüntü önbelleği: {cache_stats['hits']} isabet, "
+                            f"{cache_stats['misses']} ıskalama (oran: {cache_stats['hit_ratio']:.0%}), "
+                            f"{cache_stats['entries']} kayıt")
+
+            # Kapalı olmayan devre kesicileri bildir
+            for name, state in breaker_states().items():
+                if state['state'] != 'closed':
+                    logger.warning(f"Devre kesici '{name}': {state['state']} "
+                                   f"({state['consecutive_failures']} art arda hata, "
+                                   f"{state['rejected_total']} reddedilen çağrı)")
+
+            # Döngü ölçümlerini özetle ve dışa aktar
+            if metrics.enabled:
+                cycle = metrics.end_cycle(failed=not success)
+                logger.info(f"Döngü {current_loop} süreleri: {summarize_cycle(cycle)}")
+                try:
+                    metrics.dump()
+                except OSError as e:
+                    logger.warning(f"Ölçümler yazılamadı: {str(e)}")
+
             # Son döngüyse çık
             if max_loops > 0 and current_loop >= max_loops:
                 logger.info(f"Maksimum döngü sayısına ({max_loops}) ulaşıldı. Uygulama sonlandırılıyor.")
@@ -269,6 +715,9 @@ def main():
     except Exception as e:
         logger.error(f"Uygulama çalışırken beklenmeyen hata: {str(e)}", exc_info=True)
         return 1
+    finally:
+        close_all_sessions()
+        close_all_clients()
 
     logger.info("Uygulama başarıyla sonlandı.")
     return 0
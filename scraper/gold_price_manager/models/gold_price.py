@@ -10,6 +10,8 @@ class GoldPriceDetail:
     Bir altın türü için alış ve satış fiyatlarını tutan sınıf.
     """
 
+    __slots__ = ('buying_price', 'selling_price')
+
     def __init__(self, buying_price: float, selling_price: float):
         """
         Args:
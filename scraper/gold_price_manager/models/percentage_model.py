@@ -10,6 +10,8 @@ class PercentageDetail:
     Bir altın türü için alış ve satış fiyatlarının yüzde değişimlerini tutan sınıf.
     """
 
+    __slots__ = ('buying_percentage', 'selling_percentage')
+
     def __init__(self, buying_percentage: float, selling_percentage: float):
         """
         Args:
@@ -0,0 +1,132 @@
+"""
+Fiyat matrisi modülü - Fiyat belgelerini tarih × altın türü × (alış, satış) yoğun dizisine dönüştürür.
+"""
+import numpy as np
+
+# Matrisin son eksenindeki fiyat alanları
+PRICE_FIELDS = ('Alış Fiyatı', 'Satış Fiyatı')
+
+
+def percentage_change(base, current):
+    """
+    Yüzde değişimi hesaplar; baz sıfır veya değerlerden biri eksikse NaN döndürür.
+
+    Args:
+        base (numpy.ndarray): Baz alınan fiyatlar.
+        current (numpy.ndarray): Karşılaştırılan fiyatlar (aynı şekilde).
+
+    Returns:
+        numpy.ndarray: Yüzde değişimler.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(
+            (base != 0) & ~np.isnan(base) & ~np.isnan(current),
+            (current - base) / base * 100,
+            np.nan
+        )
+
+
+class PriceMatrix:
+    """
+    Tarih sırasına dizilmiş fiyat geçmişini yoğun bir NumPy dizisi olarak tutan sınıf.
+
+    values[i, j, k]: i. tarihte j. altın türünün k. fiyat alanı (PRICE_FIELDS sırasıyla); eksikse NaN.
+    """
+
+    def __init__(self, dates, gold_types, values):
+        """
+        Args:
+            dates (list): Artan sırada tarihler (YYYY-MM-DD).
+            gold_types (list): Sütun sırasıyla altın türleri.
+            values (numpy.ndarray): (tarih, altın türü, 2) boyutlu fiyat dizisi.
+        """
+        self.dates = list(dates)
+        self.gold_types = list(gold_types)
+        self.values = values
+        self.type_index = {gold_type: position for position, gold_type in enumerate(self.gold_types)}
+
+    @classmethod
+    def from_documents(cls, documents):
+        """
+        Tarihe göre artan sırada gelen fiyat belgelerinden tek geçişte matris oluşturur.
+
+        Args:
+            documents (iterable): {'date': ..., 'data': {...}} biçiminde belgeler (imleç olabilir).
+
+        Returns:
+            PriceMatrix: Oluşturulan matris.
+        """
+        dates = []
+        type_index = {}
+        rows, columns, buys, sells = [], [], [], []
+
+        for row, document in enumerate(documents):
+            dates.append(document['date'])
+            for gold_type, prices in document.get('data', {}).items():
+                column = type_index.setdefault(gold_type, len(type_index))
+                rows.append(row)
+                columns.append(column)
+                buys.append(prices.get(PRICE_FIELDS[0], np.nan))
+                sells.append(prices.get(PRICE_FIELDS[1], np.nan))
+
+        values = np.full((len(dates), len(type_index), len(PRICE_FIELDS)), np.nan)
+        if rows:
+            values[rows, columns, 0] = buys
+            values[rows, columns, 1] = sells
+
+        return cls(dates, list(type_index), values)
+
+    def __len__(self):
+        return len(self.dates)
+
+    @property
+    def date_array(self):
+        """
+        Returns:
+            numpy.ndarray: Tarihlerin datetime64[D] dizisi.
+        """
+        return np.array(self.dates, dtype='datetime64[D]')
+
+    @property
+    def present(self):
+        """
+        Returns:
+            numpy.ndarray: (tarih, altın türü) boyutlu; tür o tarihte kayıtlıysa True.
+        """
+        return ~np.isnan(self.values).all(axis=2)
+
+    def exact_offsets(self, days):
+        """
+        Her tarih için tam olarak 'days' gün önceki satırın indeksini bulur.
+
+        Args:
+            days (int): Geriye gidilecek gün sayısı.
+
+        Returns:
+            numpy.ndarray: Satır indeksleri; o gün kayıt yoksa -1.
+        """
+        dates = self.date_array
+        if not len(dates):
+            return np.empty(0, dtype=np.intp)
+
+        targets = dates - np.timedelta64(days, 'D')
+        positions = np.searchsorted(dates, targets)
+        clipped = np.minimum(positions, len(dates) - 1)
+        found = (positions < len(dates)) & (dates[clipped] == targets)
+        return np.where(found, positions, -1)
+
+    def columns_to_dict(self, columns, values):
+        """
+        Seçili sütunları {altın_türü: {alan: değer}} sözlüğüne çevirir.
+
+        Args:
+            columns (numpy.ndarray): Sütun indeksleri.
+            values (numpy.ndarray): (sütun, 2) boyutlu değerler.
+
+        Returns:
+            dict: Belgede saklanacak sözlük.
+        """
+        result = {}
+        for column, (buy, sell) in zip(columns.tolist(), values.tolist()):
+            result[self.gold_types[column]] = {PRICE_FIELDS[0]: buy, PRICE_FIELDS[1]: sell}
+        return result
@@ -0,0 +1,271 @@
+"""
+Sıkıştırılmış anlık görüntü modeli - Bir tarihteki alış/satış değerlerini ortak altın türü indeksiyle
+iki bitişik float dizisinde tutar.
+"""
+from array import array
+from typing import Dict, Any, Optional, Iterator, Tuple
+
+import numpy as np
+
+from models.gold_price import GoldPriceDetail
+from models.percentage_model import PercentageDetail
+
+BUYING_FIELD = 'Alış Fiyatı'
+SELLING_FIELD = 'Satış Fiyatı'
+
+
+class GoldTypeIndex:
+    """
+    Altın türü adlarını sabit sıra numaralarına eşleyen, yalnızca büyüyen ortak indeks.
+
+    Aynı indeksi paylaşan anlık görüntüler tür adlarını tekrar saklamaz; n. değer her zaman n. türe aittir.
+    """
+
+    __slots__ = ('_positions', '_names')
+
+    def __init__(self, gold_types=()):
+        """
+        Args:
+            gold_types (iterable): Başlangıç altın türleri.
+        """
+        self._positions: Dict[str, int] = {}
+        self._names = []
+        for gold_type in gold_types:
+            self.position(gold_type)
+
+    def position(self, gold_type: str) -> int:
+        """
+        Altın türünün sıra numarasını döndürür; tür yoksa indekse ekler.
+
+        Args:
+            gold_type (str): Altın türü.
+
+        Returns:
+            int: Sıra numarası.
+        """
+        position = self._positions.get(gold_type)
+        if position is None:
+            position = len(self._names)
+            self._positions[gold_type] = position
+            self._names.append(gold_type)
+        return position
+
+    def get(self, gold_type: str) -> Optional[int]:
+        """
+        Args:
+            gold_type (str): Altın türü.
+
+        Returns:
+            int or None: Sıra numarası; tür indekste yoksa None.
+        """
+        return self._positions.get(gold_type)
+
+    def name(self, position: int) -> str:
+        return self._names[position]
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __contains__(self, gold_type: str) -> bool:
+        return gold_type in self._positions
+
+
+# Ayrıca indeks verilmeyen anlık görüntülerin paylaştığı varsayılan indeks
+DEFAULT_INDEX = GoldTypeIndex()
+
+
+class PriceSnapshot:
+    """
+    Belirli bir tarihteki altın türlerinin alış/satış değerlerini iki float64 dizisinde tutan sınıf.
+
+    Dizilerin n. elemanı indeksin n. altın türüne aittir; present dizisi türün belgede bulunup
+    bulunmadığını işaretler (değerin NaN olması türün yokluğu anlamına gelmez).
+    """
+
+    __slots__ = ('id', 'date', 'index', 'buying', 'selling', 'present')
+
+    # Belgede değerlerin tutulduğu alan ve tür başına ayrıntı sınıfı
+    DATA_KEY = 'data'
+    DETAIL_CLASS = GoldPriceDetail
+
+    def __init__(
+            self,
+            date: str,
+            index: GoldTypeIndex,
+            buying,
+            selling,
+            present,
+            id: Optional[str] = None
+    ):
+        """
+        Args:
+            date (str): Tarih (YYYY-MM-DD formatında).
+            index (GoldTypeIndex): Altın türü indeksi.
+            buying: Alış değerleri (array('d') veya float64 numpy dizisi).
+            selling: Satış değerleri (aynı uzunlukta).
+            present: Türün belgede bulunup bulunmadığı (array('B') veya bool/uint8 numpy dizisi).
+            id (str, optional): MongoDB belge ID'si.
+        """
+        self.id = id
+        self.date = date
+        self.index = index
+        self.buying = buying
+        self.selling = selling
+        self.present = present
+
+    @classmethod
+    def from_values(
+            cls,
+            date: str,
+            values: Dict[str, Dict[str, float]],
+            index: Optional[GoldTypeIndex] = None,
+            id: Optional[str] = None
+    ) -> 'PriceSnapshot':
+        """
+        {altın_türü: {'Alış Fiyatı': ..., 'Satış Fiyatı': ...}} sözlüğünden anlık görüntü oluşturur.
+
+        Args:
+            date (str): Tarih.
+            values (dict): Altın türü başına değerler.
+            index (GoldTypeIndex, optional): Ortak indeks. Varsayılan: DEFAULT_INDEX.
+            id (str, optional): MongoDB belge ID'si.
+
+        Returns:
+            PriceSnapshot: Oluşturulan nesne.
+        """
+        index = index if index is not None else DEFAULT_INDEX
+        positions = [index.position(gold_type) for gold_type in values]
+
+        size = len(index)
+        buying = array('d', [np.nan]) * size
+        selling = array('d', [np.nan]) * size
+        present = array('B', [0]) * size
+        for position, detail in zip(positions, values.values()):
+            buying[position] = detail.get(BUYING_FIELD, 0.0)
+            selling[position] = detail.get(SELLING_FIELD, 0.0)
+            present[position] = 1
+
+        return cls(date, index, buying, selling, present, id=id)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], index: Optional[GoldTypeIndex] = None) -> 'PriceSnapshot':
+        """
+        MongoDB belgesinden anlık görüntü oluşturur.
+
+        Args:
+            data (dict): MongoDB belgesi.
+            index (GoldTypeIndex, optional): Ortak indeks.
+
+        Returns:
+            PriceSnapshot: Oluşturulan nesne.
+        """
+        return cls.from_values(
+            date=data.get('date', ''),
+            values=data.get(cls.DATA_KEY, {}),
+            index=index,
+            id=str(data.get('_id', ''))
+        )
+
+    @classmethod
+    def from_numpy(
+            cls,
+            date: str,
+            buying: np.ndarray,
+            selling: np.ndarray,
+            index: GoldTypeIndex,
+            present: Optional[np.ndarray] = None,
+            id: Optional[str] = None
+    ) -> 'PriceSnapshot':
+        """
+        NumPy dizilerinden kopyalamadan anlık görüntü oluşturur (diziler float64 ve bitişikse).
+
+        Args:
+            date (str): Tarih.
+            buying (numpy.ndarray): Alış değerleri.
+            selling (numpy.ndarray): Satış değerleri.
+            index (GoldTypeIndex): Dizilerin sıralandığı indeks.
+            present (numpy.ndarray, optional): Türün bulunup bulunmadığı. Varsayılan: değerlerden
+                en az biri NaN değilse bulunur.
+            id (str, optional): MongoDB belge ID'si.
+
+        Returns:
+            PriceSnapshot: Oluşturulan nesne.
+        """
+        buying = np.ascontiguousarray(buying, dtype=np.float64)
+        selling = np.ascontiguousarray(selling, dtype=np.float64)
+        if present is None:
+            present = ~(np.isnan(buying) & np.isnan(selling))
+        present = np.ascontiguousarray(present, dtype=np.uint8)
+        return cls(date, index, buying, selling, present, id=id)
+
+    def to_numpy(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Alış ve satış dizilerini kopyalamadan NumPy görünümü olarak döndürür.
+
+        Returns:
+            tuple: (alış, satış) float64 dizileri; indeksin anlık görüntüden sonra eklenen türleri dahil değildir.
+        """
+        return np.frombuffer(self.buying, dtype=np.float64), np.frombuffer(self.selling, dtype=np.float64)
+
+    def _positions(self) -> Iterator[int]:
+        return (position for position, flag in enumerate(self.present) if flag)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Nesneyi MongoDB belgesine dönüştürür. Altın türleri indeks sırasıyla yazılır.
+
+        Returns:
+            dict: MongoDB belgesi.
+        """
+        values = {}
+        for position in self._positions():
+            values[self.index.name(position)] = {
+                BUYING_FIELD: float(self.buying[position]),
+                SELLING_FIELD: float(self.selling[position])
+            }
+
+        return {
+            'date': self.date,
+            self.DATA_KEY: values
+        }
+
+    def get_price(self, gold_type: str):
+        """
+        Belirli bir altın türünün ayrıntısını döndürür.
+
+        Args:
+            gold_type (str): Altın türü.
+
+        Returns:
+            GoldPriceDetail or PercentageDetail or None: Ayrıntı veya bulunamazsa None.
+        """
+        position = self.index.get(gold_type)
+        if position is None or position >= len(self.present) or not self.present[position]:
+            return None
+        return self.DETAIL_CLASS(float(self.buying[position]), float(self.selling[position]))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._positions())
+
+    def __str__(self) -> str:
+        """
+        Nesneyi string'e dönüştürür.
+
+        Returns:
+            str: Nesne string temsili.
+        """
+        return f"{type(self).__name__}(date={self.date}, gold_types={len(self)})"
+
+
+class PercentageSnapshot(PriceSnapshot):
+    """
+    Yüzde değişim belgelerinin (percentage_difference) sıkıştırılmış karşılığı.
+    """
+
+    __slots__ = ()
+
+    DATA_KEY = 'percentage_difference'
+    DETAIL_CLASS = PercentageDetail
@@ -1,15 +1,30 @@
 """
 Veri doğrulama modülü - Altın fiyat verilerinin tutarlılığını kontrol eder.
 """
+import warnings
 from datetime import datetime
 
+import numpy as np
+
 import config
 from utils.logger import setup_logger, log_function_call
 from utils.validators import validate_price_data
 from utils.db_handler import DatabaseHandler
+from models.price_matrix import PriceMatrix, PRICE_FIELDS
 
 logger = setup_logger(__name__)
 
+# Ürün başına tutarlılık kararları
+VERDICT_OK = 0
+VERDICT_ANOMALY = 1
+VERDICT_NEW = 2  # Karşılaştırılacak geçmiş fiyat yok
+
+# MAD'i normal dağılımın standart sapmasına çeviren katsayı
+MAD_TO_SIGMA = 1.4826
+
+# Piyasa geneli hareketi hesaplamak için gereken en az ürün sayısı
+MIN_CROSS_SECTION = 3
+
 
 class DataValidator:
     """
@@ -39,10 +54,118 @@ class DataValidator:
             logger.error(f"Veri format doğrulaması başarısız: {error_message}")
         return valid
 
+    @staticmethod
+    def _common_move(returns, axis):
+        """
+        Aynı gözlemdeki ürünlerin medyan getirisini (piyasa geneli hareket) döndürür; karşılaştırılacak
+        ürün sayısı MIN_CROSS_SECTION'dan azsa 0 döner.
+        """
+        counts = (~np.isnan(returns)).sum(axis=axis, keepdims=True)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            common = np.nanmedian(returns, axis=axis, keepdims=True)
+        return np.where(counts >= MIN_CROSS_SECTION, np.nan_to_num(common), 0.0)
+
+    @staticmethod
+    def evaluate_consistency(prices_data, history, current_date=None):
+        """
+        Yeni fiyatları son anlık görüntülerle tek vektörel geçişte karşılaştırır.
+
+        Altın türleri birlikte hareket ettiği için getirilerden önce aynı günün ürünler arası medyanı
+        (piyasa geneli hareket) çıkarılır; z-skoru yalnızca ürüne özgü sapmayı ölçer. Kayıtlar arasında
+        birden fazla gün varsa getiriler geçen günün kareköküyle ölçeklenir. Her altın türü ve fiyat alanı
+        için bu artık getirilerin medyanı ve MAD'i hesaplanır. Yeterli geçmişi olmayan türlerde sabit
+        değişim eşiği kullanılır.
+
+        Args:
+            prices_data (dict): Doğrulanacak fiyat verileri.
+            history (PriceMatrix): Tarihe göre artan sırada son anlık görüntüler.
+            current_date (str, optional): Yeni fiyatların tarihi (YYYY-MM-DD). Verilmezse son kayıttan
+                bir gün sonrası kabul edilir.
+
+        Returns:
+            dict: 'products' (ürün adları), 'verdicts' (ürün başına VERDICT_* kodları),
+                'rejected' (değişimi sabit eşiği aşan veya fiyatı sıfır/negatif olan ürünler),
+                'scores' (en büyük z-skoru; sabit eşikte değişim oranı, yeni üründe NaN),
+                'previous' (son bilinen fiyatlar) ve 'current' (yeni fiyatlar) dizileri.
+        """
+        products = list(prices_data)
+        current = np.array([[prices_data[product][field] for field in PRICE_FIELDS] for product in products],
+                           dtype=np.float64).reshape(len(products), len(PRICE_FIELDS))
+        columns = np.array([history.type_index.get(product, -1) for product in products], dtype=np.intp)
+        known = columns >= 0
+
+        values = history.values
+        dates = history.date_array
+        if not len(history) or not values.shape[1]:
+            values = np.full((1, 1, len(PRICE_FIELDS)), np.nan)
+            dates = np.array([current_date or '1970-01-01'], dtype='datetime64[D]')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            logs = np.log(np.where(values > 0, values, np.nan))
+
+        # Günlük ölçeğe getirilmiş, piyasa geneli hareketten arındırılmış geçmiş getiriler
+        gaps = np.maximum(np.diff(dates).astype(np.float64), 1.0)[:, np.newaxis, np.newaxis]
+        returns = np.diff(logs, axis=0)
+        returns = (returns - DataValidator._common_move(returns, axis=1)) / np.sqrt(gaps)
+
+        # Tür ve alan başına son bilinen fiyat ve tarihi
+        rows = np.arange(len(values))[:, np.newaxis, np.newaxis]
+        last_rows = np.where(~np.isnan(values), rows, -1).max(axis=0)
+        previous = np.take_along_axis(values, np.maximum(last_rows, 0)[np.newaxis], axis=0)[0]
+        previous = np.where(last_rows >= 0, previous, np.nan)
+        target = np.datetime64(current_date, 'D') if current_date else dates[-1] + np.timedelta64(1, 'D')
+        elapsed = np.maximum((target - dates[np.maximum(last_rows, 0)]).astype(np.float64), 1.0)
+
+        # Tür ve alan başına sağlam istatistikler (medyan ve ölçeklenmiş MAD)
+        observations = (~np.isnan(returns)).sum(axis=0)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            median = np.nanmedian(returns, axis=0)
+            mad = np.nanmedian(np.abs(returns - median), axis=0)
+        scale = np.maximum(MAD_TO_SIGMA * np.nan_to_num(mad), config.VALIDATION_MIN_SCALE)
+
+        safe_columns = np.where(known, columns, 0)
+        previous = np.where(known[:, np.newaxis], previous[safe_columns], np.nan)
+        median, scale, elapsed = median[safe_columns], scale[safe_columns], elapsed[safe_columns]
+        robust = known[:, np.newaxis] & (observations[safe_columns] >= config.VALIDATION_MIN_HISTORY)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change = np.log(np.where(current > 0, current, np.nan)) - np.log(np.where(previous > 0, previous, np.nan))
+            change = change - DataValidator._common_move(change, axis=0)
+            z_scores = np.abs(change - np.nan_to_num(median) * elapsed) / (scale * np.sqrt(elapsed))
+            ratios = np.abs(current - previous) / previous
+
+        comparable = ~np.isnan(previous) & (previous > 0)
+        nonpositive = comparable & ~(current > 0)
+        anomalous = np.where(robust, z_scores > config.VALIDATION_Z_THRESHOLD,
+                             ratios > config.VALIDATION_FALLBACK_THRESHOLD)
+        # Sıfır veya negatif yeni fiyat her durumda aykırıdır
+        anomalous = (comparable & anomalous) | nonpositive
+        # Veri setinin reddi yalnızca sabit eşiğe göre sayılır; z-skoru aykırılıkları uyarı olarak kalır
+        rejected = (comparable & (ratios > config.VALIDATION_FALLBACK_THRESHOLD)) | nonpositive
+        scores = np.where(comparable, np.where(robust, z_scores, ratios), np.nan)
+
+        verdicts = np.full(len(products), VERDICT_OK, dtype=np.int8)
+        verdicts[~comparable.any(axis=1)] = VERDICT_NEW
+        verdicts[anomalous.any(axis=1)] = VERDICT_ANOMALY
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            product_scores = np.nanmax(scores, axis=1)
+
+        return {
+            'products': products,
+            'verdicts': verdicts,
+            'rejected': rejected.any(axis=1),
+            'scores': product_scores,
+            'previous': previous,
+            'current': current
+        }
+
     @log_function_call
     def validate_data_consistency(self, prices_data):
         """
-        Verilerin tutarlılığını kontrol eder (son verilerle karşılaştırarak).
+        Verilerin tutarlılığını son anlık görüntülerin oluşturduğu pencereye göre kontrol eder.
 
         Args:
             prices_data (dict): Doğrulanacak fiyat verileri.
@@ -50,13 +173,13 @@ class DataValidator:
         Returns:
             bool: Veriler tutarlıysa True, değilse False.
         """
-        # En son kaydedilen veriyi al
-        latest_document = self.db_handler.get_latest_gold_prices()
-        if not latest_document or 'data' not in latest_document:
+        # Son kayıtları tek sorguda al (son eleman en son kayıt)
+        recent_documents = self.db_handler.get_recent_gold_prices(config.VALIDATION_WINDOW_SIZE)
+        if not recent_documents or 'data' not in recent_documents[-1]:
             logger.warning("Tutarlılık kontrolü için karşılaştırılacak önceki veri bulunamadı.")
             return True  # Karşılaştırılacak veri yoksa geçerli say
 
-        latest_data = latest_document['data']
+        latest_data = recent_documents[-1]['data']
 
         # Ürün sayısı kontrolü
         if len(prices_data) < len(latest_data) * 0.7:  # En az %70'i kadar ürün olmalı
@@ -64,35 +187,25 @@ class DataValidator:
                          f"en son veri {len(latest_data)} ürün içeriyor.")
             return False
 
-        # Ortak ürünlerde aşırı fiyat değişimi kontrolü
-        inconsistent_products = []
-        for product, prices in prices_data.items():
-            if product in latest_data:
-                old_buy = latest_data[product]['Alış Fiyatı']
-                old_sell = latest_data[product]['Satış Fiyatı']
-                new_buy = prices['Alış Fiyatı']
-                new_sell = prices['Satış Fiyatı']
-
-                # %30'dan fazla değişim varsa uyarı
-                if (abs((new_buy - old_buy) / old_buy) > 0.3 or
-                        abs((new_sell - old_sell) / old_sell) > 0.3):
-                    inconsistent_products.append({
-                        'product': product,
-                        'old_buy': old_buy,
-                        'new_buy': new_buy,
-                        'old_sell': old_sell,
-                        'new_sell': new_sell
-                    })
-
-        if inconsistent_products:
-            logger.warning(f"Aşırı fiyat değişimi tespit edildi: {len(inconsistent_products)} üründe.")
-            for item in inconsistent_products:
-                logger.warning(f"Ürün: {item['product']}, "
-                               f"Alış: {item['old_buy']} -> {item['new_buy']}, "
-                               f"Satış: {item['old_sell']} -> {item['new_sell']}")
-
-            # Aşırı değişim çok fazlaysa (toplam ürünlerin %20'sinden fazla)
-            if len(inconsistent_products) > len(prices_data) * 0.2:
+        # Tüm ürünler için tek geçişte karar
+        report = self.evaluate_consistency(prices_data, PriceMatrix.from_documents(recent_documents),
+                                           self.db_handler.current_date())
+        anomalies = np.nonzero(report['verdicts'] == VERDICT_ANOMALY)[0]
+
+        if len(anomalies):
+            logger.warning(f"Aşırı fiyat değişimi tespit edildi: {len(anomalies)} üründe "
+                           f"({len(recent_documents)} kayıtlık pencere).")
+            for position in anomalies.tolist():
+                old_buy, old_sell = report['previous'][position].tolist()
+                new_buy, new_sell = report['current'][position].tolist()
+                logger.warning(f"Ürün: {report['products'][position]}, "
+                               f"Alış: {old_buy} -> {new_buy}, "
+                               f"Satış: {old_sell} -> {new_sell}, "
+                               f"Skor: {report['scores'][position]:.2f}")
+
+            # Sabit eşiği aşan değişim çok fazlaysa (varsayılan: toplam ürünlerin %20'sinden fazla)
+            rejected = int(report['rejected'].sum())
+            if rejected > len(prices_data) * config.VALIDATION_MAX_ANOMALY_RATIO:
                 logger.error("Çok sayıda üründe aşırı fiyat değişimi tespit edildi. "
                              "Veri tutarsız kabul ediliyor.")
                 return False
@@ -0,0 +1,108 @@
+"""
+Geçmiş yüzde hesaplama modülü - Tüm fiyat geçmişinin günlük yüzde değişimlerini tek geçişte yeniden hesaplar.
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+
+import config
+from utils.logger import setup_logger, log_function_call
+from utils.db_handler import DatabaseHandler
+from utils.price_history_cache import load_history
+from models.price_matrix import percentage_change
+
+logger = setup_logger(__name__)
+
+
+class PercentageBackfill:
+    """
+    'prices' koleksiyonunu bir kez okuyup tüm günlük yüzde değişimlerini vektörel hesaplayan sınıf.
+    """
+
+    def __init__(self, db_handler=None, batch_size=config.BACKFILL_BATCH_SIZE):
+        """
+        Args:
+            db_handler (DatabaseHandler, optional): Veritabanı işlemlerini yönetecek nesne.
+            batch_size (int): Okuma ve toplu yazma parti boyutu.
+        """
+        self.db_handler = db_handler or DatabaseHandler()
+        self.batch_size = batch_size
+
+    @log_function_call
+    def load_matrix(self, start_date=None, end_date=None):
+        """
+        Fiyat geçmişini akış halinde okuyup matrise dönüştürür (önbellek etkinse yerel önbellekten okur).
+
+        Başlangıç tarihi verilirse, ilk günün karşılaştırması için bir önceki gün de okunur.
+
+        Args:
+            start_date (str, optional): İlk hesaplanacak tarih (YYYY-MM-DD).
+            end_date (str, optional): Son hesaplanacak tarih (YYYY-MM-DD).
+
+        Returns:
+            PriceMatrix: Fiyat matrisi.
+        """
+        read_from = None
+        if start_date:
+            read_from = (datetime.strptime(start_date, config.DATE_FORMAT) - timedelta(days=1)) \
+                .strftime(config.DATE_FORMAT)
+
+        matrix = load_history(self.db_handler, read_from, end_date, batch_size=self.batch_size)
+        logger.info(f"Fiyat matrisi oluşturuldu: {len(matrix)} tarih × {len(matrix.gold_types)} altın türü")
+        return matrix
+
+    @staticmethod
+    def compute(matrix, start_date=None):
+        """
+        Her tarihin bir önceki takvim gününe göre yüzde değişimini tek vektörel işlemle hesaplar.
+
+        Bir tarih için yalnızca o gün veya önceki gün kaydı bulunan altın türleri sonuca girer;
+        türlerden biri eksikse değeri NaN olur (günlük hesaplamayla aynı).
+
+        Args:
+            matrix (PriceMatrix): Fiyat matrisi.
+            start_date (str, optional): Bu tarihten önceki sonuçlar döndürülmez.
+
+        Returns:
+            list: (tarih, yüzde_değişim_sözlüğü) çiftleri.
+        """
+        previous_rows = matrix.exact_offsets(1)
+        rows = np.nonzero(previous_rows >= 0)[0]
+        if start_date:
+            rows = rows[np.array(matrix.dates, dtype=object)[rows] >= start_date]
+        if not len(rows):
+            return []
+
+        previous_rows = previous_rows[rows]
+        changes = percentage_change(matrix.values[previous_rows], matrix.values[rows])
+        present = matrix.present
+        included = present[rows] | present[previous_rows]
+
+        results = []
+        for position, row in enumerate(rows.tolist()):
+            columns = np.nonzero(included[position])[0]
+            results.append((matrix.dates[row], matrix.columns_to_dict(columns, changes[position, columns])))
+        return results
+
+    @log_function_call
+    def run(self, start_date=None, end_date=None):
+        """
+        Geçmişteki tüm günlük yüzde değişimlerini hesaplar ve toplu yazma ile kaydeder.
+
+        Args:
+            start_date (str, optional): İlk hesaplanacak tarih (YYYY-MM-DD).
+            end_date (str, optional): Son hesaplanacak tarih (YYYY-MM-DD).
+
+        Returns:
+            int: Yazılan belge sayısı.
+        """
+        logger.info(f"Geçmiş yüzde hesaplaması başlatılıyor: {start_date or 'başlangıç'} - {end_date or 'son'}")
+
+        matrix = self.load_matrix(start_date, end_date)
+        results = self.compute(matrix, start_date)
+        if not results:
+            logger.warning("Önceki günü bulunan tarih yok, yazılacak yüzde değişimi bulunamadı.")
+            return 0
+
+        logger.info(f"{len(results)} tarih için yüzde değişimi hesaplandı, kaydediliyor...")
+        return self.db_handler.bulk_upsert_percentage_differences(results, batch_size=self.batch_size)
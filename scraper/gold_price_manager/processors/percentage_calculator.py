@@ -1,16 +1,22 @@
 """
 Yüzde hesaplama modülü - Altın fiyatlarındaki günlük değişimleri hesaplar.
 """
-import numpy as np
-import pandas as pd
 from datetime import datetime, timedelta
 
+import numpy as np
+
 import config
 from utils.logger import setup_logger, log_function_call
 from utils.db_handler import DatabaseHandler
+from utils.fingerprint import snapshot_fingerprint
+from processors.percentage_backfill import PercentageBackfill
+from models.price_matrix import PriceMatrix, percentage_change
 
 logger = setup_logger(__name__)
 
+# Artımlı hesaplamanın kontrol noktası anahtarı (durum koleksiyonunda)
+CHECKPOINT_KEY = 'percentage_checkpoint'
+
 
 class PercentageCalculator:
     """
@@ -25,17 +31,21 @@ class PercentageCalculator:
         self.db_handler = db_handler or DatabaseHandler()
 
     @log_function_call
-    def find_documents_for_comparison(self):
+    def find_documents_for_comparison(self, latest_document=None):
         """
         Karşılaştırma için gereken belgeleri bulur: en son belge ve bir önceki gün.
 
+        Args:
+            latest_document (dict, optional): Bellekte hazır en son belge ({'date', 'data'}).
+                Verilirse veritabanından yalnızca önceki gün okunur.
+
         Returns:
             tuple: (en_son_belge, onceki_gun_belgesi) çifti. Bulunamazsa None değer içerebilir.
         """
         logger.info("Karşılaştırma için belgeler aranıyor...")
 
         # En son belgeyi al
-        latest_document = self.db_handler.get_latest_gold_prices()
+        latest_document = latest_document or self.db_handler.get_latest_gold_prices()
         if not latest_document:
             logger.warning("En son eklenen belge bulunamadı.")
             return None, None
@@ -57,86 +67,123 @@ class PercentageCalculator:
 
     @staticmethod
     @log_function_call
-    def convert_to_dataframe(document):
-        """
-        MongoDB belgesini pandas DataFrame'e dönüştürür.
-
-        Args:
-            document (dict): MongoDB belgesi.
-
-        Returns:
-            pandas.DataFrame: Dönüştürülmüş DataFrame.
+    def calculate_percentage_diff(previous_doc, latest_doc):
         """
-        if not document or 'data' not in document:
-            return pd.DataFrame()
+        İki fiyat belgesi arasındaki yüzde değişimi tek vektörel işlemle hesaplar.
 
-        return pd.DataFrame(document['data'])
-
-    @staticmethod
-    @log_function_call
-    def calculate_percentage_diff(df_base, df_compare):
-        """
-        İki DataFrame arasındaki yüzde değişimi hesaplar.
+        Sonuç iki belgedeki altın türlerinin birleşimini içerir (önce önceki günün türleri, sonra
+        yeni türler). Türlerden biri belgelerden birinde yoksa veya baz fiyat sıfırsa değeri NaN olur.
 
         Args:
-            df_base (pandas.DataFrame): Baz alınacak DataFrame (önceki gün).
-            df_compare (pandas.DataFrame): Karşılaştırılacak DataFrame (güncel).
+            previous_doc (dict): Baz alınacak belge (önceki gün).
+            latest_doc (dict): Karşılaştırılacak belge (güncel).
 
         Returns:
-            pandas.DataFrame: Yüzde değişim DataFrame'i.
+            dict: {altın_türü: {'Alış Fiyatı': ..., 'Satış Fiyatı': ...}} yüzde değişimleri; belgelerden
+                biri boşsa boş sözlük.
         """
-        logger.info("DataFrames arasında yüzde değişimi hesaplanıyor...")
-
-        if df_base.empty or df_compare.empty:
-            logger.warning("Boş DataFrame ile yüzde hesaplaması yapılamaz.")
-            return pd.DataFrame()
+        logger.info("Belgeler arasında yüzde değişimi hesaplanıyor...")
 
-        def percentage_diff(x1, x2):
-            """Yüzde değişim hesaplama fonksiyonu"""
-            return np.where(
-                (x1 != 0) & ~np.isnan(x1) & ~np.isnan(x2),
-                (x2 - x1) / x1 * 100,
-                np.nan
-            )
+        if not previous_doc.get('data') or not latest_doc.get('data'):
+            logger.warning("Boş belge ile yüzde hesaplaması yapılamaz.")
+            return {}
 
-        # İki DataFrame'i birleştir ve yüzde değişimi hesapla
-        result = df_base.combine(df_compare, func=percentage_diff)
+        matrix = PriceMatrix.from_documents([previous_doc, latest_doc])
+        changes = percentage_change(matrix.values[0], matrix.values[1])
+        result = matrix.columns_to_dict(np.arange(len(matrix.gold_types)), changes)
 
         logger.info("Yüzde değişim hesaplaması tamamlandı.")
         return result
 
     @log_function_call
-    def process_daily_differences(self):
+    def process_daily_differences(self, latest_doc=None):
         """
         Günlük fiyat değişimlerini hesaplar ve veritabanına kaydeder.
 
+        Args:
+            latest_doc (dict, optional): Az önce toplanan en son belge ({'date', 'data'}).
+
         Returns:
-            pandas.DataFrame or None: Yüzde değişim DataFrame'i. İşlem başarısızsa None.
+            dict or None: Yüzde değişim sözlüğü. İşlem başarısızsa None.
         """
         try:
             # Karşılaştırma belgelerini al
-            latest_doc, previous_doc = self.find_documents_for_comparison()
+            latest_doc, previous_doc = self.find_documents_for_comparison(latest_doc)
             if not latest_doc or not previous_doc:
                 logger.warning("Karşılaştırma için gerekli belgeler bulunamadığından işlem iptal edildi.")
                 return None
 
-            # DataFrame'e dönüştür
-            df_previous = self.convert_to_dataframe(previous_doc)
-            df_latest = self.convert_to_dataframe(latest_doc)
-
             # Yüzde değişimi hesapla
-            percentage_diff = self.calculate_percentage_diff(df_previous, df_latest)
+            percentage_dict = self.calculate_percentage_diff(previous_doc, latest_doc)
 
             # Sonuçları kaydet
-            if not percentage_diff.empty:
-                percentage_dict = percentage_diff.to_dict()
+            if percentage_dict:
                 self.db_handler.insert_percentage_differences(latest_doc['date'], percentage_dict)
                 logger.info(f"Yüzde değişim verileri '{latest_doc['date']}' için kaydedildi.")
-                return percentage_diff
+                return percentage_dict
             else:
                 logger.warning("Yüzde değişim hesaplaması sonucu boş, kayıt yapılmadı.")
                 return None
 
         except Exception as e:
             logger.error(f"Yüzde değişim hesaplaması sırasında hata: {str(e)}")
-            return None
\ No newline at end of file
+            return None
+
+    @log_function_call
+    def process_incremental(self, latest_doc=None):
+        """
+        Yalnızca kontrol noktasından sonra eklenen veya değişen fiyat kayıtları için
+        yüzde değişimlerini hesaplar ve kontrol noktasını ilerletir.
+
+        Kontrol noktası, son işlenen tarihi ve o tarihin fiyat özetini tutar. En son kayıt
+        kontrol noktasıyla aynıysa hiçbir okuma veya yazma yapılmaz.
+
+        Args:
+            latest_doc (dict, optional): Az önce toplanan en son belge ({'date', 'data'}).
+
+        Returns:
+            int or None: Yazılan belge sayısı (girdi değişmediyse 0). İşlem başarısızsa None.
+        """
+        try:
+            latest_doc = latest_doc or self.db_handler.get_latest_gold_prices()
+            if not latest_doc:
+                logger.warning("Hesaplanacak fiyat verisi bulunamadı.")
+                return None
+
+            latest_hash = snapshot_fingerprint(latest_doc['data'])
+            checkpoint = self.db_handler.get_state(CHECKPOINT_KEY)
+
+            if checkpoint and checkpoint.get('date') == latest_doc['date'] and checkpoint.get('hash') == latest_hash:
+                logger.info(f"'{latest_doc['date']}' verisi kontrol noktasından beri değişmedi, hesaplama atlandı.")
+                return 0
+
+            # Kontrol noktası yoksa yalnızca en son gün hesaplanır
+            start_date = checkpoint['date'] if checkpoint else latest_doc['date']
+            skip_date = None
+            if checkpoint and checkpoint['date'] != latest_doc['date']:
+                checkpoint_doc = self.db_handler.get_gold_prices_by_date(checkpoint['date'])
+                if checkpoint_doc and snapshot_fingerprint(checkpoint_doc['data']) == checkpoint.get('hash'):
+                    skip_date = checkpoint['date']
+
+            backfill = PercentageBackfill(self.db_handler)
+            matrix = backfill.load_matrix(start_date, latest_doc['date'])
+            results = [item for item in backfill.compute(matrix, start_date) if item[0] != skip_date]
+
+            written = 0
+            if results:
+                written = self.db_handler.bulk_upsert_percentage_differences(results)
+                logger.info(f"Artımlı hesaplama: {len(results)} tarih için yüzde değişimi kaydedildi "
+                            f"({results[0][0]} - {results[-1][0]}).")
+            else:
+                logger.warning("Artımlı hesaplama: önceki günü bulunan yeni kayıt yok.")
+
+            self.db_handler.set_state(CHECKPOINT_KEY, {
+                'date': latest_doc['date'],
+                'hash': latest_hash,
+                'updated_at': datetime.now()
+            })
+            return written
+
+        except Exception as e:
+            logger.error(f"Artımlı yüzde hesaplaması sırasında hata: {str(e)}")
+            return None
@@ -0,0 +1,254 @@
+"""
+Fiyat birleştirme modülü - Birden fazla kaynaktan gelen fiyatları altın türü bazında hizalayıp tek bir
+uzlaşı fiyatına indirger.
+
+Kaynaklar (kaynak × altın türü × (alış, satış)) dizisine yerleştirilir; aykırı teklifler, bırakılan
+kaynaklar ve uzlaşı fiyatı tek geçişte dizi işlemleriyle hesaplanır.
+"""
+import warnings
+from datetime import datetime, timezone
+
+import numpy as np
+
+import config
+from models.price_matrix import PRICE_FIELDS
+from utils.logger import setup_logger, log_function_call
+
+logger = setup_logger(__name__)
+
+CONSENSUS_METHODS = ('median', 'trimmed', 'priority')
+
+
+def parse_source_weights(spec):
+    """
+    'Kaynak=ağırlık;...' biçimindeki kaynak önceliklerini ayrıştırır.
+
+    Args:
+        spec (str): Öncelik tanımı (ör. 'UzmanPara=2;Other=1').
+
+    Returns:
+        dict: {kaynak_adı: ağırlık} sözlüğü.
+
+    Raises:
+        ValueError: Tanım geçersizse.
+    """
+    weights = {}
+    for item in filter(None, (part.strip() for part in spec.split(';'))):
+        name, separator, weight = item.partition('=')
+        if not separator:
+            raise ValueError(f"Geçersiz kaynak önceliği: '{item}' ('Kaynak=ağırlık' bekleniyor)")
+        weights[name.strip()] = float(weight)
+    return weights
+
+
+class Consolidation:
+    """
+    Birleştirme sonucu: uzlaşı fiyatları ve kaynak bazında köken bilgisi.
+    """
+
+    def __init__(self, prices, method, sources, outliers, dropped_sources, quotes):
+        """
+        Args:
+            prices (dict): {altın_türü: {alan: fiyat}} uzlaşı fiyatları.
+            method (str): Kullanılan uzlaşı yöntemi.
+            sources (list): Kaynak adları (dizideki sırasıyla).
+            outliers (dict): {kaynak_adı: [aykırı altın türleri]}.
+            dropped_sources (list): Bu döngüde tamamen dışarıda bırakılan kaynaklar.
+            quotes (dict): {altın_türü: {kaynak_adı: {alan: fiyat, 'outlier': bool, 'excluded': bool}}}.
+        """
+        self.prices = prices
+        self.method = method
+        self.sources = sources
+        self.outliers = outliers
+        self.dropped_sources = dropped_sources
+        self.quotes = quotes
+
+    def provenance_document(self, date, collected_at=None):
+        """
+        Köken koleksiyonunda saklanacak belgeyi oluşturur.
+
+        Args:
+            date (str): Veri tarihi.
+            collected_at (datetime, optional): Toplama zamanı (UTC). Varsayılan: şimdi.
+
+        Returns:
+            dict: {'date', 'collected_at', 'method', 'sources', 'dropped_sources', 'outliers', 'types'} belgesi.
+        """
+        return {
+            'date': date,
+            'collected_at': collected_at or datetime.now(timezone.utc),
+            'method': self.method,
+            'sources': self.sources,
+            'dropped_sources': self.dropped_sources,
+            'outliers': self.outliers,
+            'types': {
+                gold_type: {'consensus': self.prices.get(gold_type), 'quotes': quotes}
+                for gold_type, quotes in self.quotes.items()
+            },
+        }
+
+
+class QuoteConsolidator:
+    """
+    Kaynak fiyatlarını medyan, budanmış ortalama veya öncelik ağırlıklı ortalamayla birleştiren sınıf.
+
+    Bir teklif, en az config.QUOTE_OUTLIER_MIN_SOURCES kaynağın fiyat verdiği bir türde alış veya satış
+    fiyatı tüm kaynakların medyanından config.QUOTE_OUTLIER_THRESHOLD oranından fazla saparsa aykırı sayılır
+    ve uzlaşıya katılmaz. Karşılaştırılabilir tekliflerinin config.QUOTE_SOURCE_DROP_RATIO oranından fazlası
+    aykırı olan kaynak o döngüde tamamen dışarıda bırakılır.
+    """
+
+    def __init__(self, method=None, trim_ratio=None, source_weights=None):
+        """
+        Args:
+            method (str, optional): 'median', 'trimmed' veya 'priority'. Varsayılan: config.QUOTE_CONSENSUS_METHOD.
+            trim_ratio (float, optional): Budanmış ortalamada her uçtan atılan oran. Varsayılan: config.QUOTE_TRIM_RATIO.
+            source_weights (dict, optional): {kaynak_adı: ağırlık}; listede olmayan kaynakların ağırlığı 1.
+                Varsayılan: config.QUOTE_SOURCE_PRIORITIES.
+
+        Raises:
+            ValueError: Yöntem veya budama oranı geçersizse.
+        """
+        self.method = method or config.QUOTE_CONSENSUS_METHOD
+        if self.method not in CONSENSUS_METHODS:
+            raise ValueError(f"Geçersiz uzlaşı yöntemi: '{self.method}' ({', '.join(CONSENSUS_METHODS)})")
+
+        self.trim_ratio = config.QUOTE_TRIM_RATIO if trim_ratio is None else trim_ratio
+        if not 0 <= self.trim_ratio < 0.5:
+            raise ValueError(f"Budama oranı 0 ile 0.5 arasında olmalı: {self.trim_ratio}")
+
+        self.source_weights = (parse_source_weights(config.QUOTE_SOURCE_PRIORITIES)
+                               if source_weights is None else source_weights)
+
+    @staticmethod
+    def align(source_prices):
+        """
+        Kaynak fiyatlarını ortak altın türü sırasına hizalar.
+
+        Args:
+            source_prices (dict): {kaynak_adı: {altın_türü: {alan: fiyat}}} sözlüğü.
+
+        Returns:
+            tuple: (kaynaklar, altın_türleri, (kaynak, tür, 2) boyutlu dizi); eksik teklifler NaN.
+        """
+        sources = list(source_prices)
+        type_index = {}
+        rows, columns, buys, sells = [], [], [], []
+
+        for row, prices in enumerate(source_prices.values()):
+            for gold_type, values in prices.items():
+                rows.append(row)
+                columns.append(type_index.setdefault(gold_type, len(type_index)))
+                buys.append(values.get(PRICE_FIELDS[0], np.nan))
+                sells.append(values.get(PRICE_FIELDS[1], np.nan))
+
+        quotes = np.full((len(sources), len(type_index), len(PRICE_FIELDS)), np.nan)
+        if rows:
+            quotes[rows, columns, 0] = buys
+            quotes[rows, columns, 1] = sells
+
+        return sources, list(type_index), quotes
+
+    @staticmethod
+    def _nanmedian(values):
+        # Tamamı NaN olan sütunlarda uyarı vermeden NaN döndürür
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            return np.nanmedian(values, axis=0)
+
+    def _trimmed_mean(self, values):
+        counts = (~np.isnan(values)).sum(axis=0)
+        trimmed = np.floor(counts * self.trim_ratio).astype(int)
+        # NaN'lar sıralamada sona düşer; her sütunda [k, n - k) aralığındaki sıralar tutulur
+        ordered = np.sort(values, axis=0)
+        ranks = np.arange(values.shape[0]).reshape(-1, 1, 1)
+        keep = (ranks >= trimmed) & (ranks < counts - trimmed)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(keep, ordered, 0).sum(axis=0) / keep.sum(axis=0)
+
+    def _weighted_mean(self, values, sources):
+        weights = np.array([self.source_weights.get(source, 1.0) for source in sources]).reshape(-1, 1, 1)
+        weights = np.where(np.isnan(values), 0.0, weights)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(np.isnan(values), 0, values * weights).sum(axis=0) / weights.sum(axis=0)
+
+    def consensus(self, values, sources):
+        """
+        Geçerli tekliflerden uzlaşı fiyatını hesaplar.
+
+        Args:
+            values (numpy.ndarray): (kaynak, tür, 2) boyutlu dizi; dışlanan teklifler NaN.
+            sources (list): Kaynak adları.
+
+        Returns:
+            numpy.ndarray: (tür, 2) boyutlu uzlaşı fiyatları; geçerli teklif yoksa NaN.
+        """
+        if self.method == 'trimmed':
+            return self._trimmed_mean(values)
+        if self.method == 'priority':
+            return self._weighted_mean(values, sources)
+        return self._nanmedian(values)
+
+    @log_function_call
+    def consolidate(self, source_prices):
+        """
+        Kaynak fiyatlarını birleştirir.
+
+        Args:
+            source_prices (dict): {kaynak_adı: {altın_türü: {alan: fiyat}}} sözlüğü (öncelik sırasıyla).
+
+        Returns:
+            Consolidation: Uzlaşı fiyatları ve köken bilgisi.
+        """
+        sources, gold_types, quotes = self.align(source_prices)
+        quoted = ~np.isnan(quotes).any(axis=2)
+
+        # Aykırı teklifler: yeterli kaynağın fiyat verdiği türlerde medyandan fazla sapanlar
+        median = self._nanmedian(quotes)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            deviation = np.abs(quotes - median) / median
+        comparable = quoted & (quoted.sum(axis=0) >= config.QUOTE_OUTLIER_MIN_SOURCES)
+        outlier = comparable & (np.nan_to_num(deviation, nan=np.inf).max(axis=2) > config.QUOTE_OUTLIER_THRESHOLD)
+
+        # Karşılaştırılabilir tekliflerinin çoğu aykırı olan kaynaklar tamamen dışarıda bırakılır
+        comparable_counts = comparable.sum(axis=1)
+        outlier_ratio = np.divide(outlier.sum(axis=1), comparable_counts,
+                                  out=np.zeros(len(sources)), where=comparable_counts > 0)
+        dropped = outlier_ratio > config.QUOTE_SOURCE_DROP_RATIO
+
+        excluded = outlier | dropped[:, np.newaxis]
+        consensus = np.round(self.consensus(np.where(excluded[:, :, np.newaxis], np.nan, quotes), sources), 2)
+
+        prices = {}
+        for column, (buy, sell) in enumerate(consensus.tolist()):
+            if not (np.isnan(buy) or np.isnan(sell)):
+                prices[gold_types[column]] = {PRICE_FIELDS[0]: buy, PRICE_FIELDS[1]: sell}
+
+        dropped_sources = [source for source, flag in zip(sources, dropped.tolist()) if flag]
+        outliers = {
+            source: [gold_types[column] for column in np.flatnonzero(outlier[row]).tolist()]
+            for row, source in enumerate(sources) if outlier[row].any()
+        }
+        for source in dropped_sources:
+            logger.warning(f"'{source}' kaynağı bu döngüde dışarıda bırakıldı: karşılaştırılabilir tekliflerinin "
+                           f"%{outlier_ratio[sources.index(source)] * 100:.0f}'i aykırı.")
+        for source, types in outliers.items():
+            if source not in dropped_sources:
+                logger.warning(f"'{source}' kaynağının {len(types)} teklifi aykırı bulundu: {', '.join(types)}")
+
+        missing = len(gold_types) - len(prices)
+        if missing:
+            logger.warning(f"{missing} altın türü için geçerli teklif kalmadı, bu türler kaydedilmeyecek.")
+
+        quote_details = {}
+        for column, gold_type in enumerate(gold_types):
+            details = {}
+            for row in np.flatnonzero(quoted[:, column]).tolist():
+                buy, sell = quotes[row, column].tolist()
+                details[sources[row]] = {PRICE_FIELDS[0]: buy, PRICE_FIELDS[1]: sell,
+                                         'outlier': bool(outlier[row, column]),
+                                         'excluded': bool(excluded[row, column])}
+            quote_details[gold_type] = details
+
+        logger.info(f"{len(sources)} kaynaktan {len(prices)} altın türü '{self.method}' yöntemiyle birleştirildi.")
+        return Consolidation(prices, self.method, sources, outliers, dropped_sources, quote_details)
@@ -0,0 +1,157 @@
+"""
+Getiri hesaplama modülü - Farklı zaman ufuklarındaki (1g/7g/30g/YBB/1y) yüzde değişimleri tek geçişte hesaplar.
+"""
+import re
+from datetime import datetime, timedelta
+
+import numpy as np
+
+import config
+from utils.logger import setup_logger, log_function_call
+from utils.db_handler import DatabaseHandler
+from utils.price_history_cache import load_history
+from models.price_matrix import percentage_change
+
+logger = setup_logger(__name__)
+
+_HORIZON_PATTERN = re.compile(r'^(\d+)([dwmy])$')
+
+
+def horizon_base_date(horizon, latest_date):
+    """
+    Bir zaman ufku için karşılaştırma yapılacak hedef tarihi hesaplar.
+
+    Desteklenen biçimler: 'Nd' (gün), 'Nw' (hafta), 'Nm' (ay), 'Ny' (yıl) ve 'ytd'
+    (bir önceki yılın son günü).
+
+    Args:
+        horizon (str): Zaman ufku tanımı (ör. '7d', 'ytd', '1y').
+        latest_date (datetime): En son kaydın tarihi.
+
+    Returns:
+        datetime: Hedef tarih.
+
+    Raises:
+        ValueError: Tanım geçersizse.
+    """
+    if horizon == 'ytd':
+        return datetime(latest_date.year - 1, 12, 31)
+
+    match = _HORIZON_PATTERN.match(horizon)
+    if not match:
+        raise ValueError(f"Geçersiz zaman ufku: '{horizon}'")
+
+    amount, unit = int(match.group(1)), match.group(2)
+    if unit == 'd':
+        return latest_date - timedelta(days=amount)
+    if unit == 'w':
+        return latest_date - timedelta(weeks=amount)
+
+    months = amount if unit == 'm' else amount * 12
+    year, month = divmod(latest_date.year * 12 + latest_date.month - 1 - months, 12)
+    month += 1
+    # Ayın son gününe sabitle (ör. 31 Mart - 1 ay = 29 Şubat / 28 Şubat)
+    next_month = datetime(year + month // 12, month % 12 + 1, 1)
+    return datetime(year, month, min(latest_date.day, (next_month - timedelta(days=1)).day))
+
+
+class ReturnCalculator:
+    """
+    Yapılandırılmış tüm zaman ufukları için getirileri tek okumayla hesaplayıp tek belgede saklayan sınıf.
+    """
+
+    def __init__(self, db_handler=None, horizons=None):
+        """
+        Args:
+            db_handler (DatabaseHandler, optional): Veritabanı işlemlerini yönetecek nesne.
+            horizons (list, optional): Zaman ufukları. Varsayılan: config.RETURN_HORIZONS.
+        """
+        self.db_handler = db_handler or DatabaseHandler()
+        self.horizons = horizons or config.RETURN_HORIZONS
+
+    def target_dates(self, latest_date):
+        """
+        Args:
+            latest_date (str): En son kaydın tarihi (YYYY-MM-DD).
+
+        Returns:
+            list: Her zaman ufku için hedef tarihler (YYYY-MM-DD).
+        """
+        latest = datetime.strptime(latest_date, config.DATE_FORMAT)
+        return [horizon_base_date(horizon, latest).strftime(config.DATE_FORMAT) for horizon in self.horizons]
+
+    @staticmethod
+    def compute(matrix, targets, horizons):
+        """
+        Matrisin son satırını her zaman ufkunun baz satırıyla tek vektörel işlemde karşılaştırır.
+
+        Baz satır, hedef tarihte veya ondan önceki en yakın kayıttır (hafta sonu ve tatiller için).
+
+        Args:
+            matrix (PriceMatrix): Fiyat matrisi (son satır en son kayıt).
+            targets (list): Zaman ufuklarının hedef tarihleri.
+            horizons (list): Zaman ufku adları.
+
+        Returns:
+            tuple: (getiriler, baz_tarihler) sözlükleri. Baz kaydı bulunmayan ufuklar dahil edilmez.
+        """
+        latest_row = len(matrix) - 1
+        base_rows = np.searchsorted(matrix.date_array, np.array(targets, dtype='datetime64[D]'), side='right') - 1
+        valid = (base_rows >= 0) & (base_rows < latest_row)
+
+        # (ufuk, altın türü, 2) boyutlu tüm getiriler tek seferde
+        changes = percentage_change(matrix.values[base_rows], matrix.values[latest_row][np.newaxis])
+        columns = np.nonzero(matrix.present[latest_row])[0]
+
+        returns, base_dates = {}, {}
+        for position, horizon in enumerate(horizons):
+            if not valid[position]:
+                continue
+            returns[horizon] = matrix.columns_to_dict(columns, changes[position, columns])
+            base_dates[horizon] = matrix.dates[base_rows[position]]
+        return returns, base_dates
+
+    @log_function_call
+    def process_returns(self):
+        """
+        En son fiyat kaydı için tüm zaman ufuklarının getirilerini hesaplar ve kaydeder.
+
+        Returns:
+            dict or None: Kaydedilen getiri belgesi. İşlem başarısızsa None.
+        """
+        try:
+            latest_doc = self.db_handler.get_latest_gold_prices()
+            if not latest_doc:
+                logger.warning("Getiri hesaplaması için fiyat verisi bulunamadı.")
+                return None
+
+            latest_date = latest_doc['date']
+            targets = self.target_dates(latest_date)
+
+            # En eski hedeften önceki son kaydı da kapsayacak pencereyi tek seferde oku
+            window_start = (datetime.strptime(min(targets), config.DATE_FORMAT)
+                            - timedelta(days=config.RETURN_LOOKBACK_SLACK_DAYS)).strftime(config.DATE_FORMAT)
+            matrix = load_history(self.db_handler, window_start, latest_date)
+            logger.info(f"Getiri penceresi okundu: {len(matrix)} kayıt ({window_start} - {latest_date})")
+
+            returns, base_dates = self.compute(matrix, targets, self.horizons)
+            missing = [horizon for horizon in self.horizons if horizon not in returns]
+            if missing:
+                logger.warning(f"Baz kaydı bulunamayan zaman ufukları: {', '.join(missing)}")
+            if not returns:
+                logger.warning("Hiçbir zaman ufku için getiri hesaplanamadı.")
+                return None
+
+            document = {
+                'date': latest_date,
+                'returns': returns,
+                'base_dates': base_dates,
+                'updated_at': datetime.now()
+            }
+            self.db_handler.upsert_returns(latest_date, document)
+            logger.info(f"'{latest_date}' için {len(returns)} zaman ufkunun getirileri kaydedildi.")
+            return document
+
+        except Exception as e:
+            logger.error(f"Getiri hesaplaması sırasında hata: {str(e)}")
+            return None
@@ -0,0 +1,14 @@
+"""
+Test ortamı - Modüller gold_price_manager dizininden düz içe aktarıldığı için dizin yola eklenir.
+"""
+import os
+import sys
+from pathlib import Path
+
+# Testler sunucusuz ve sessiz çalışır (yapılandırma içe aktarılmadan önce ayarlanmalıdır)
+os.environ.setdefault('MONGO_CONNECTION_STRING', 'memory://test')
+os.environ.setdefault('LOG_LEVEL', 'ERROR')
+os.environ.setdefault('LOG_FILE', os.devnull)
+os.environ.setdefault('RETRY_DELAY_SECONDS', '0')
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
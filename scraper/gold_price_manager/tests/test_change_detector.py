@@ -0,0 +1,20 @@
+import config
+from utils.change_detector import ChangeDetector
+from utils.db_handler import DatabaseHandler
+
+PRICES = {'Gram Altın': {'Alış Fiyatı': 2450.0, 'Satış Fiyatı': 2460.0}}
+NEWER_PRICES = {'Gram Altın': {'Alış Fiyatı': 2455.0, 'Satış Fiyatı': 2465.0}}
+
+
+def test_mark_processed_skips_snapshot_written_by_another_job():
+    db_handler = DatabaseHandler(connection_string='memory://change-detector')
+    ChangeDetector(db_handler).record_write('2024-05-02', PRICES)
+    # Hesaplama sürerken başka bir toplama işi daha yeni fiyatları yazar
+    ChangeDetector(db_handler).record_write('2024-05-02', NEWER_PRICES)
+
+    assert not ChangeDetector(db_handler).mark_processed('2024-05-02', PRICES)
+    assert not db_handler.get_state('prices_fingerprint')['processed']
+
+    assert ChangeDetector(db_handler).mark_processed('2024-05-02', NEWER_PRICES)
+    assert db_handler.get_state('prices_fingerprint')['processed']
+    assert db_handler.connect()[config.MONGO_COLLECTION_STATE].count_documents({}) == 1
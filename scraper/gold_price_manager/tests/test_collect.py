@@ -0,0 +1,21 @@
+import config
+import main
+from utils.db_handler import DatabaseHandler
+
+PRICES = {'Gram Altın': {'Alış Fiyatı': 2450.0, 'Satış Fiyatı': 2460.0}}
+
+
+def test_unchanged_prices_still_record_intraday_ticks(monkeypatch):
+    db_handler = DatabaseHandler(connection_string='memory://collect-unchanged')
+    monkeypatch.setattr(config, 'CHANGE_DETECTION_ENABLED', True)
+    monkeypatch.setattr(config, 'INTRADAY_ENABLED', True)
+    monkeypatch.setattr(config, 'PRICE_CACHE_ENABLED', False)
+    monkeypatch.setattr(config, 'QUOTE_PROVENANCE_ENABLED', False)
+    monkeypatch.setattr(main, 'fetch_source_prices', lambda: {'UzmanPara': PRICES})
+
+    assert main.collect_gold_prices(db_handler)['changed']
+    # Fiyatlar aynı kalsa da her okuma gün içi kovaya eklenmeli
+    assert not main.collect_gold_prices(db_handler)['changed']
+
+    buckets = list(db_handler.connect()[config.MONGO_COLLECTION_INTRADAY].find({'source': 'UzmanPara'}))
+    assert sum(bucket['count'] for bucket in buckets) == 2
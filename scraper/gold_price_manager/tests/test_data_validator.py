@@ -0,0 +1,88 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from processors.data_validator import VERDICT_ANOMALY, DataValidator
+from models.price_matrix import PriceMatrix
+from utils.db_handler import DatabaseHandler
+
+PRODUCTS = [f"Altın {number}" for number in range(20)]
+START = date(2026, 1, 1)
+
+
+def simulate_history(days=30, volatility=0.007, seed=7):
+    """
+    Ortak bir piyasa hareketi ve ürüne özgü gürültüyle günlük fiyat geçmişi üretir.
+    """
+    rng = np.random.default_rng(seed)
+    levels = np.linspace(2000, 40000, len(PRODUCTS))
+    documents = []
+    for offset in range(days):
+        market = rng.normal(0, volatility)
+        levels = levels * np.exp(market + rng.normal(0, volatility / 4, len(PRODUCTS)))
+        documents.append({
+            'date': (START + timedelta(days=offset)).isoformat(),
+            'data': {product: {'Alış Fiyatı': round(price, 2), 'Satış Fiyatı': round(price * 1.01, 2)}
+                     for product, price in zip(PRODUCTS, levels.tolist())},
+        })
+    return documents
+
+
+def moved(document, factor, products=PRODUCTS):
+    return {product: {field: round(value * (factor if product in products else 1.0), 2)
+                      for field, value in prices.items()}
+            for product, prices in document['data'].items()}
+
+
+@pytest.fixture
+def validator(monkeypatch):
+    db_handler = DatabaseHandler(connection_string=f"memory://validator-{id(monkeypatch)}")
+    history = simulate_history()
+    for document in history:
+        db_handler.insert_gold_prices(document['data'], document['date'])
+    monkeypatch.setattr(db_handler, 'current_date', lambda: (START + timedelta(days=len(history))).isoformat())
+    return DataValidator(db_handler), history
+
+
+def test_correlated_market_move_is_accepted(validator):
+    validator, history = validator
+    prices = moved(history[-1], 1.05)
+
+    report = validator.evaluate_consistency(prices, PriceMatrix.from_documents(history),
+                                            (START + timedelta(days=len(history))).isoformat())
+    assert not (report['verdicts'] == VERDICT_ANOMALY).any()
+    assert validator.validate_data_consistency(prices)
+
+
+def test_single_product_jump_is_flagged_but_not_rejected(validator):
+    validator, history = validator
+    prices = moved(history[-1], 1.05, products=PRODUCTS[:1])
+
+    report = validator.evaluate_consistency(prices, PriceMatrix.from_documents(history),
+                                            (START + timedelta(days=len(history))).isoformat())
+    assert report['verdicts'][0] == VERDICT_ANOMALY
+    assert not report['rejected'].any()
+    assert validator.validate_data_consistency(prices)
+
+
+def test_broken_feed_is_rejected(validator):
+    validator, history = validator
+    prices = moved(history[-1], 1.5, products=PRODUCTS[:10])
+
+    assert not validator.validate_data_consistency(prices)
+
+
+def test_scores_scale_with_elapsed_days():
+    history = simulate_history()
+    prices = moved(history[-1], 1.05, products=PRODUCTS[:1])
+    matrix = PriceMatrix.from_documents(history)
+
+    next_day = validator_score(prices, matrix, len(history))
+    after_gap = validator_score(prices, matrix, len(history) + 8)
+    assert after_gap == pytest.approx(next_day / 3, rel=0.05)
+
+
+def validator_score(prices, matrix, offset):
+    report = DataValidator.evaluate_consistency(prices, matrix, (START + timedelta(days=offset)).isoformat())
+    return report['scores'][0]
@@ -0,0 +1,76 @@
+from pymongo.errors import ConnectionFailure, OperationFailure
+
+import config
+from utils import db_handler as utils_db_handler
+from utils.db_handler import DatabaseHandler
+
+
+def test_iter_gold_prices_resumes_after_connection_error(monkeypatch):
+    db_handler = DatabaseHandler(connection_string='memory://iter-resume')
+    dates = [f"2024-05-{day:02d}" for day in range(1, 8)]
+    for date in dates:
+        db_handler.insert_gold_prices({'Gram Altın': {'Alış Fiyatı': 1.0, 'Satış Fiyatı': 1.0}}, date)
+
+    # İlk sorgunun imleci bir belge verdikten sonra bağlantıyı kaybeder
+    collection = db_handler.connect()[config.MONGO_COLLECTION_PRICES]
+    find = collection.find
+    calls = []
+
+    def flaky_find(*args, **kwargs):
+        cursor = find(*args, **kwargs)
+        calls.append(args)
+        if len(calls) > 1:
+            return cursor
+
+        class BrokenCursor:
+            def sort(self, *sort_args):
+                cursor.sort(*sort_args)
+                return self
+
+            def limit(self, count):
+                cursor.limit(count)
+                return self
+
+            def batch_size(self, _):
+                return self
+
+            def __iter__(self):
+                yield next(iter(cursor))
+                raise ConnectionFailure('bağlantı koptu')
+
+        return BrokenCursor()
+
+    monkeypatch.setattr(collection, 'find', flaky_find)
+
+    documents = list(db_handler.iter_gold_prices('2024-05-02', '2024-05-06', batch_size=2))
+
+    assert [document['date'] for document in documents] == dates[1:6]
+
+
+def test_failed_index_creation_is_retried_after_backoff(monkeypatch):
+    db_handler = DatabaseHandler(connection_string='memory://index-retry')
+    collection = db_handler.connect()[config.MONGO_COLLECTION_RETURNS]
+    collection.indexes.clear()
+    monkeypatch.setattr(utils_db_handler, '_indexed_databases', set())
+    monkeypatch.setattr(utils_db_handler, '_index_failures', {})
+
+    create_index = collection.create_index
+    attempts = []
+
+    def flaky_create_index(*args, **kwargs):
+        attempts.append(args)
+        if len(attempts) == 1:
+            raise OperationFailure('mükerrer tarihler')
+        return create_index(*args, **kwargs)
+
+    monkeypatch.setattr(collection, 'create_index', flaky_create_index)
+
+    # Başarısız deneme aralık dolana kadar her işlemde tekrarlanmaz
+    db_handler.connect()
+    db_handler.connect()
+    assert len(attempts) == 1
+    assert 'date_unique' not in collection.index_information()
+
+    monkeypatch.setattr(config, 'MONGO_INDEX_RETRY_SECONDS', 0)
+    db_handler.connect()
+    assert 'date_unique' in collection.index_information()
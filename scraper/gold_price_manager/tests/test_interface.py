@@ -0,0 +1,115 @@
+from types import SimpleNamespace
+
+import pytest
+
+import config
+from data_sources import interface
+from data_sources.base_source import BaseDataSource
+from data_sources.replay_source import ReplaySource
+
+
+class DummySource(BaseDataSource):
+    def __init__(self):
+        super().__init__('Dummy')
+
+    def fetch_data(self):
+        return None
+
+    def process_data(self, raw_data):
+        return {}
+
+
+class FakeEntryPoint:
+    def __init__(self, name, target):
+        self.name = name
+        self.target = target
+        self.loads = 0
+
+    def load(self):
+        self.loads += 1
+        return self.target
+
+
+@pytest.fixture(autouse=True)
+def isolated_registry(monkeypatch):
+    monkeypatch.setattr(interface, '_registered', {})
+    monkeypatch.setattr(interface, '_class_cache', {})
+    monkeypatch.setattr(interface, '_instances', {})
+    monkeypatch.setattr(interface, '_entry_points', {})
+
+
+def test_parse_plugins_defaults_name_and_skips_invalid_items():
+    plugins = interface._parse_plugins(
+        ' Gold = pkg.gold:GoldSource ;pkg.other:OtherSource;;broken;Bad=pkg.module ')
+
+    assert plugins == {'Gold': 'pkg.gold:GoldSource', 'OtherSource': 'pkg.other:OtherSource'}
+
+
+def test_registered_source_takes_precedence_over_entry_points(monkeypatch):
+    entry_point = FakeEntryPoint('Dummy', ReplaySource)
+    monkeypatch.setattr(interface, '_entry_points', {'Dummy': entry_point})
+    interface.register_source('Dummy', DummySource)
+
+    assert interface.get_source_class('Dummy') is DummySource
+    assert entry_point.loads == 0
+
+
+def test_register_source_accepts_paths_and_replaces_cached_class():
+    interface.register_source('Replay', 'data_sources.replay_source:ReplaySource')
+    assert interface.get_source_class('Replay') is ReplaySource
+
+    interface.register_source('Replay', DummySource)
+    assert interface.get_source_class('Replay') is DummySource
+
+
+def test_entry_point_is_loaded_once(monkeypatch):
+    entry_point = FakeEntryPoint('Plugin', DummySource)
+    calls = []
+
+    def fake_entry_points(group):
+        calls.append(group)
+        return [entry_point]
+
+    monkeypatch.setattr(interface, '_entry_points', None)
+    monkeypatch.setattr(interface, 'entry_points', fake_entry_points)
+
+    assert interface.get_source_class('Plugin') is DummySource
+    assert interface.get_source_class('Plugin') is DummySource
+    assert calls == [config.SOURCE_ENTRY_POINT_GROUP]
+    assert entry_point.loads == 1
+
+
+def test_entry_points_fall_back_to_group_mapping(monkeypatch):
+    # Python 3.8/3.9'da entry_points() anahtar kelime almaz ve grup sözlüğü döndürür
+    def legacy_entry_points():
+        return {config.SOURCE_ENTRY_POINT_GROUP: [FakeEntryPoint('Plugin', DummySource)]}
+
+    monkeypatch.setattr(interface, '_entry_points', None)
+    monkeypatch.setattr(interface, 'entry_points', legacy_entry_points)
+
+    assert interface.get_source_class('Plugin') is DummySource
+
+
+def test_unknown_and_invalid_sources_raise():
+    with pytest.raises(ImportError):
+        interface.get_source_class('MissingSource')
+
+    interface.register_source('NotASource', SimpleNamespace)
+    with pytest.raises(TypeError):
+        interface.get_source_class('NotASource')
+
+    interface.register_source('Base', BaseDataSource)
+    with pytest.raises(TypeError):
+        interface.get_source_class('Base')
+
+
+def test_active_source_instances_are_reused(monkeypatch):
+    interface.register_source('Dummy', DummySource)
+    monkeypatch.setattr(config, 'ACTIVE_SOURCES', ['Dummy', 'MissingSource'])
+
+    first = interface.get_all_active_sources()
+    assert [source.name for source in first] == ['Dummy']
+    assert interface.get_all_active_sources()[0] is first[0]
+
+    interface.reset_sources()
+    assert interface.get_all_active_sources()[0] is not first[0]
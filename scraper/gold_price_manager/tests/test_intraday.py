@@ -0,0 +1,23 @@
+from datetime import datetime, timezone
+
+import config
+from utils.db_handler import DatabaseHandler
+
+PRICES = {'Gram Altın': {'buying': 2450.0, 'selling': 2460.0}}
+
+
+def test_repeated_intraday_write_is_applied_once():
+    db_handler = DatabaseHandler(connection_string='memory://intraday-idempotent')
+    timestamp = datetime(2024, 5, 2, 10, 15, tzinfo=timezone.utc)
+
+    # Yeniden denenen yazma, sunucuda uygulanmış ilk denemenin okumasını tekrarlamamalı
+    db_handler.insert_intraday_prices({'UzmanPara': PRICES}, timestamp=timestamp, date='2024-05-02')
+    db_handler.insert_intraday_prices({'UzmanPara': PRICES}, timestamp=timestamp, date='2024-05-02')
+    later = datetime(2024, 5, 2, 10, 20, tzinfo=timezone.utc)
+    db_handler.insert_intraday_prices({'UzmanPara': PRICES}, timestamp=later, date='2024-05-02')
+
+    buckets = list(db_handler.connect()[config.MONGO_COLLECTION_INTRADAY].find({'source': 'UzmanPara'}))
+    assert len(buckets) == 1
+    assert buckets[0]['count'] == 2
+    assert [tick['ts'] for tick in buckets[0]['ticks']] == [timestamp, later]
+    assert buckets[0]['first_ts'] == timestamp and buckets[0]['last_ts'] == later
@@ -0,0 +1,86 @@
+import pytest
+from pymongo import ASCENDING, ReplaceOne, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from utils.db_handler import DatabaseHandler
+from utils.memory_store import MemoryCollection
+
+
+class RacingCollection(MemoryCollection):
+    """
+    Upsert'in aramasıyla eklemesi arasında başka bir işin aynı tarihli belgeyi yazdığı koleksiyon.
+    """
+
+    def __init__(self, name, competitor):
+        super().__init__(name)
+        self.competitor = competitor
+
+    def _find_position(self, query):
+        position = super()._find_position(query)
+        if self.competitor is not None:
+            self.insert_one(self.competitor)
+            self.competitor = None
+        return position
+
+
+def dated_collection(name='prices'):
+    collection = MemoryCollection(name)
+    collection.create_index([('date', ASCENDING)], unique=True, name='date_unique')
+    return collection
+
+
+def test_unique_index_is_enforced_on_insert_replace_and_upsert():
+    collection = dated_collection()
+    collection.insert_one({'date': '2024-05-01'})
+    collection.insert_one({'date': '2024-05-02'})
+
+    with pytest.raises(DuplicateKeyError):
+        collection.insert_one({'date': '2024-05-01'})
+    with pytest.raises(DuplicateKeyError):
+        collection.replace_one({'date': '2024-05-02'}, {'date': '2024-05-01'})
+    with pytest.raises(DuplicateKeyError):
+        collection.update_one({'date': '2024-05-03'}, {'$set': {'date': '2024-05-01'}}, upsert=True)
+
+    # Hatalı yazmalar belgeleri değiştirmemeli
+    assert sorted(document['date'] for document in collection.find()) == ['2024-05-01', '2024-05-02']
+
+
+def test_unique_index_cannot_be_created_over_duplicates():
+    collection = MemoryCollection('prices')
+    collection.insert_one({'date': '2024-05-01'})
+    collection.insert_one({'date': '2024-05-01'})
+
+    with pytest.raises(DuplicateKeyError):
+        collection.create_index([('date', ASCENDING)], unique=True, name='date_unique')
+    assert 'date_unique' not in collection.index_information()
+
+
+def test_bulk_write_reports_duplicates_and_honours_ordering():
+    operations = [
+        ReplaceOne({'date': '2024-05-01'}, {'date': '2024-05-01', 'value': 1}, upsert=True),
+        UpdateOne({'date': '2024-05-09'}, {'$set': {'date': '2024-05-01'}}, upsert=True),
+        ReplaceOne({'date': '2024-05-02'}, {'date': '2024-05-02', 'value': 2}, upsert=True),
+    ]
+
+    ordered = dated_collection()
+    with pytest.raises(BulkWriteError) as error:
+        ordered.bulk_write(operations, ordered=True)
+    assert [item['index'] for item in error.value.details['writeErrors']] == [1]
+    assert ordered.count_documents({}) == 1
+
+    unordered = dated_collection()
+    with pytest.raises(BulkWriteError):
+        unordered.bulk_write(operations, ordered=False)
+    assert unordered.count_documents({}) == 2
+
+
+def test_upsert_by_date_retries_as_replace_after_concurrent_insert():
+    collection = RacingCollection('prices', competitor={'date': '2024-05-02', 'data': {'Gram Altın': 1.0}})
+    collection.create_index([('date', ASCENDING)], unique=True, name='date_unique')
+
+    result = DatabaseHandler._upsert_by_date(collection, '2024-05-02',
+                                             {'date': '2024-05-02', 'data': {'Gram Altın': 2.0}})
+
+    assert result.matched_count == 1
+    documents = list(collection.find({}, {'_id': 0}))
+    assert documents == [{'date': '2024-05-02', 'data': {'Gram Altın': 2.0}}]
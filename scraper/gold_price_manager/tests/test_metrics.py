@@ -0,0 +1,41 @@
+import json
+import threading
+
+from utils.metrics import MetricsRegistry
+
+
+def test_concurrent_dumps_do_not_collide(tmp_path):
+    registry = MetricsRegistry(enabled=True)
+    path = tmp_path / 'metrics.json'
+    errors = []
+
+    def dump():
+        try:
+            for _ in range(20):
+                registry.dump(str(path), 'json')
+        except OSError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=dump) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert json.loads(path.read_text(encoding='utf-8'))['functions'] == {}
+    assert [item.name for item in tmp_path.iterdir()] == ['metrics.json']
+
+
+def test_cycle_is_scoped_to_context():
+    registry = MetricsRegistry(enabled=True)
+    registry.start_cycle('main')
+    seen = []
+    worker = threading.Thread(target=lambda: seen.append(registry.cycle))
+    worker.start()
+    worker.join()
+
+    assert registry.cycle.name == 'main'
+    assert seen == [None]
+    assert registry.end_cycle().name == 'main'
+    assert registry.to_dict()['cycles']['main']['calls'] == 1
@@ -0,0 +1,31 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from data_sources.uzmanpara_parser import StreamedTable
+from utils import page_archive
+
+
+@pytest.fixture
+def archive(tmp_path, monkeypatch):
+    archive = page_archive.PageArchive(directory=tmp_path, codec='gzip')
+    monkeypatch.setattr(page_archive, '_archive', archive)
+    yield archive
+    archive.close()
+
+
+def archived_entries(archive):
+    archive.flush()
+    now = datetime.now(timezone.utc)
+    return list(archive.iter_entries('UzmanPara', now - timedelta(days=1), now + timedelta(days=1)))
+
+
+@pytest.mark.parametrize('stopped_early', [True, False])
+def test_streamed_page_is_marked_incomplete_only_when_reading_stopped_early(archive, stopped_early):
+    content = b'<html><div class="realTime">...</div>'
+    page_archive.archive_page('UzmanPara', StreamedTable(rows=[], bytes_read=len(content),
+                                                         stopped_early=stopped_early, content=content))
+
+    [entry] = archived_entries(archive)
+    assert entry['complete'] is not stopped_early
+    assert archive.read_object(entry['sha256']) == content
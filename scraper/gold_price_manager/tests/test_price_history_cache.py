@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+import config
+from utils.db_handler import DatabaseHandler
+from utils.price_history_cache import PriceHistoryCache
+
+
+def prices(types, base):
+    return {gold_type: {'Alış Fiyatı': base + offset, 'Satış Fiyatı': base + offset + 1}
+            for offset, gold_type in enumerate(types)}
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'PRICE_CACHE_INITIAL_ROWS', 2)
+    return PriceHistoryCache(tmp_path)
+
+
+def test_row_growth_keeps_existing_rows(cache):
+    for day in range(1, 6):
+        cache.append(f"2026-01-0{day}", prices(['Gram'], day * 100))
+
+    matrix = cache.load_matrix()
+    assert matrix.dates == [f"2026-01-0{day}" for day in range(1, 6)]
+    assert matrix.values[:, 0, 0].tolist() == [100, 200, 300, 400, 500]
+
+
+def test_type_growth_keeps_existing_rows(cache):
+    cache.append('2026-01-01', prices(['Gram'], 100))
+    cache.append('2026-01-02', prices(['Gram', 'Çeyrek', 'Yarım', 'Tam'], 200))
+
+    matrix = cache.load_matrix()
+    assert matrix.gold_types == ['Gram', 'Çeyrek', 'Yarım', 'Tam']
+    assert matrix.values[0, 0].tolist() == [100, 101]
+    assert np.isnan(matrix.values[0, 1:]).all()
+    assert matrix.values[1, :, 0].tolist() == [200, 201, 202, 203]
+
+
+def test_out_of_order_insert_with_growth(cache):
+    cache.append('2026-01-01', prices(['Gram'], 100))
+    cache.append('2026-01-03', prices(['Gram'], 300))
+    cache.append('2026-01-02', prices(['Gram', 'Çeyrek', 'Yarım'], 200))
+
+    matrix = cache.load_matrix()
+    assert matrix.dates == ['2026-01-01', '2026-01-02', '2026-01-03']
+    assert matrix.values[:, 0, 0].tolist() == [100, 200, 300]
+    assert matrix.values[1, 2, 1] == 203
+
+
+def test_interrupted_growth_keeps_published_cache_readable(cache, monkeypatch):
+    cache.append('2026-01-01', prices(['Gram'], 100))
+    cache.append('2026-01-02', prices(['Gram'], 200))
+
+    # Büyüyen dosya yazıldıktan sonra, meta bilgisi yayınlanmadan önce çökme
+    def crash(meta):
+        raise OSError('disk dolu')
+    monkeypatch.setattr(cache, '_write_meta', crash)
+    with pytest.raises(OSError):
+        cache.append('2026-01-03', prices(['Gram', 'Çeyrek', 'Yarım'], 300))
+    monkeypatch.undo()
+
+    matrix = cache.load_matrix()
+    assert matrix.dates == ['2026-01-01', '2026-01-02']
+    assert matrix.values[:, 0, 0].tolist() == [100, 200]
+
+    cache.append('2026-01-03', prices(['Gram', 'Çeyrek', 'Yarım'], 300))
+    assert cache.load_matrix().values[:, 0, 0].tolist() == [100, 200, 300]
+    assert sorted(path.name for path in cache.directory.glob('prices*.f64')) == [cache._read_meta()['data_file']]
+
+
+def test_data_file_with_unexpected_shape_is_rejected(cache):
+    cache.append('2026-01-01', prices(['Gram'], 100))
+    data_path = cache.directory / cache._read_meta()['data_file']
+    data_path.write_bytes(data_path.read_bytes()[:-8])
+
+    with pytest.raises(ValueError):
+        cache.load_matrix()
+
+
+def test_sync_picks_up_rewritten_earlier_days(cache):
+    db_handler = DatabaseHandler(connection_string='memory://price-cache-sync')
+    for day in range(1, 4):
+        db_handler.insert_gold_prices(prices(['Gram'], day * 100), f"2026-01-0{day}")
+    assert cache.sync(db_handler) == 3
+
+    db_handler.insert_gold_prices(prices(['Gram'], 150), '2026-01-01')
+    db_handler.insert_gold_prices(prices(['Gram'], 400), '2026-01-04')
+    cache.sync(db_handler)
+
+    matrix = cache.load_matrix()
+    assert matrix.dates == ['2026-01-01', '2026-01-02', '2026-01-03', '2026-01-04']
+    assert matrix.values[:, 0, 0].tolist() == [150, 200, 300, 400]
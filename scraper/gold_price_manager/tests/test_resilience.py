@@ -0,0 +1,52 @@
+import time
+
+import pytest
+
+from utils.resilience import STATE_CLOSED, CircuitBreaker, CircuitOpenError, RetryPolicy, call_with_retry
+
+
+class TransientError(Exception):
+    pass
+
+
+def failing(error):
+    def func():
+        raise error
+    return func
+
+
+@pytest.fixture
+def breaker():
+    return CircuitBreaker('test', failure_threshold=2, reset_seconds=0.1)
+
+
+def call(func, breaker):
+    return call_with_retry(func, (TransientError,), 'test', RetryPolicy(max_attempts=1, base_delay=0), breaker)
+
+
+def open_breaker(breaker):
+    for _ in range(2):
+        with pytest.raises(TransientError):
+            call(failing(TransientError()), breaker)
+    with pytest.raises(CircuitOpenError):
+        call(lambda: 'ok', breaker)
+    time.sleep(0.15)
+
+
+def test_non_retried_error_in_trial_releases_breaker(breaker):
+    open_breaker(breaker)
+
+    with pytest.raises(ValueError):
+        call(failing(ValueError('ayrıştırma')), breaker)
+
+    assert call(lambda: 'ok', breaker) == 'ok'
+    assert breaker.state == STATE_CLOSED
+
+
+def test_retried_error_in_trial_reopens_breaker(breaker):
+    open_breaker(breaker)
+
+    with pytest.raises(TransientError):
+        call(failing(TransientError()), breaker)
+    with pytest.raises(CircuitOpenError):
+        call(lambda: 'ok', breaker)
@@ -0,0 +1,148 @@
+import contextvars
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from utils import scheduler as scheduler_module
+from utils.logger import log_function_call
+from utils.metrics import MetricsRegistry
+from utils.scheduler import (
+    MISFIRE_RUN_ALL, MISFIRE_RUN_ONCE, MISFIRE_SKIP, CronExpression, IntervalSchedule, Job, Scheduler, parse_schedule
+)
+
+
+@pytest.mark.parametrize('expression, moment, expected', [
+    ('*/15 * * * *', datetime(2026, 3, 4, 10, 7, 30), datetime(2026, 3, 4, 10, 15)),
+    ('*/15 * * * *', datetime(2026, 3, 4, 10, 15), datetime(2026, 3, 4, 10, 30)),
+    ('30 9 * * 1-5', datetime(2026, 3, 6, 10, 0), datetime(2026, 3, 9, 9, 30)),   # cuma -> pazartesi
+    ('0 0 * * 7', datetime(2026, 3, 4, 12, 0), datetime(2026, 3, 8, 0, 0)),       # 7 pazar demektir
+    ('0 0 1 * *', datetime(2026, 12, 15, 8, 0), datetime(2027, 1, 1, 0, 0)),      # yıl geçişi
+    ('0 0 13 * 5', datetime(2026, 3, 1, 0, 0), datetime(2026, 3, 6, 0, 0)),       # gün veya haftanın günü
+    ('0 12 29 2 *', datetime(2026, 3, 1, 0, 0), datetime(2028, 2, 29, 12, 0)),    # artık yıl
+])
+def test_cron_next_after(expression, moment, expected):
+    assert CronExpression(expression).next_after(moment) == expected
+
+
+@pytest.mark.parametrize('expression', ['* * * *', '60 * * * *', '*/0 * * * *', '5-1 * * * *'])
+def test_invalid_cron_expression_is_rejected(expression):
+    with pytest.raises(ValueError):
+        CronExpression(expression)
+
+
+def test_cron_that_never_matches_raises():
+    with pytest.raises(ValueError):
+        CronExpression('0 0 31 2 *').next_after(datetime(2026, 1, 1))
+
+
+def test_schedule_aliases():
+    assert str(parse_schedule('@hourly')) == '0 * * * *'
+    assert parse_schedule('@every 5m').next_after(datetime(2026, 1, 1)) == datetime(2026, 1, 1, 0, 5)
+
+
+class RecordingExecutor:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, func, *args):
+        self.submitted.append(args)
+
+
+def late_job(policy, missed_minutes=10):
+    job = Job('collect', lambda: True, IntervalSchedule(60), misfire_policy=policy, misfire_grace_seconds=30)
+    now = datetime(2026, 1, 1, 12, 0)
+    # Takvim zamanları now - 9.5 dk ... now - 0.5 dk: kaçırılan çalıştırma sayısı missed_minutes
+    job.plan(now - timedelta(minutes=missed_minutes, seconds=30))
+    return job, now
+
+
+def test_misfire_skip_moves_to_next_future_run():
+    job, now = late_job(MISFIRE_SKIP)
+
+    assert not Scheduler([job])._apply_misfire_policy(job, now)
+    assert job.skipped == 10
+    assert job.run_at == now + timedelta(seconds=30)
+
+
+def test_misfire_run_once_runs_immediately_once():
+    job, now = late_job(MISFIRE_RUN_ONCE)
+
+    assert Scheduler([job])._apply_misfire_policy(job, now)
+    assert job.pending_runs == 0
+    assert job.scheduled_at > now
+
+
+def test_misfire_run_all_queues_every_missed_run():
+    job, now = late_job(MISFIRE_RUN_ALL)
+    scheduler = Scheduler([job])
+    scheduler._executor = RecordingExecutor()
+
+    assert scheduler._apply_misfire_policy(job, now)
+    assert job.pending_runs == 10
+
+    # Çalışırken bekleyen çalıştırmalar atlanmaz, iş bitince sırayla başlatılır
+    scheduler._dispatch(job, now)
+    assert len(scheduler._executor.submitted) == 1 and job.pending_runs == 9
+    scheduler._dispatch(job, now + timedelta(seconds=1))
+    assert len(scheduler._executor.submitted) == 1 and job.skipped == 0
+    job.running = False
+    scheduler._dispatch(job, now + timedelta(seconds=2))
+    assert len(scheduler._executor.submitted) == 2 and job.pending_runs == 8
+
+
+def test_overlapping_run_is_skipped():
+    job = Job('calculate', lambda: True, IntervalSchedule(60))
+    now = datetime(2026, 1, 1, 12, 0)
+    job.plan(now - timedelta(minutes=1))
+    scheduler = Scheduler([job])
+    scheduler._executor = RecordingExecutor()
+
+    scheduler._dispatch(job, now)
+    scheduler._dispatch(job, now + timedelta(seconds=1))
+
+    assert len(scheduler._executor.submitted) == 1
+    assert job.skipped == 1
+    assert job.run_at == now + timedelta(minutes=1)
+
+
+def test_concurrent_jobs_record_separate_cycles(monkeypatch, tmp_path):
+    registry = MetricsRegistry(enabled=True)
+    monkeypatch.setattr(scheduler_module, 'metrics', registry)
+    monkeypatch.setattr('utils.logger.metrics', registry)
+    monkeypatch.setattr('config.METRICS_FILE', str(tmp_path / 'metrics.json'))
+
+    @log_function_call
+    def fetch():
+        return True
+
+    barrier = threading.Barrier(2)
+
+    def make_job(name):
+        @log_function_call
+        def step():
+            barrier.wait(timeout=5)
+            # Bağlamı kopyalanan yardımcı iş parçacığının aralıkları da işin döngüsüne eklenir
+            worker = threading.Thread(target=contextvars.copy_context().run, args=(fetch,))
+            worker.start()
+            worker.join()
+            return True
+        return Job(name, step, IntervalSchedule(60))
+
+    jobs = [make_job('collect'), make_job('calculate')]
+    scheduler = Scheduler(jobs)
+    for job in jobs:
+        job.plan(datetime.now())
+    threads = [threading.Thread(target=contextvars.copy_context().run, args=(scheduler._run_job, job)) for job in jobs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert set(registry.last_cycles) == {'job:collect', 'job:calculate'}
+    for cycle in registry.last_cycles.values():
+        # Her işin döngüsünde yalnızca kendi adımı ve yardımcı iş parçacığının çağrısı bulunur
+        assert sorted(child.name for child in cycle.children.values()) == sorted([jobs[0].func.__qualname__,
+                                                                               fetch.__qualname__])
+        assert all(child.calls == 1 for child in cycle.children.values())
+    assert (tmp_path / 'metrics.json').exists()
@@ -0,0 +1,29 @@
+import time
+
+import config
+from utils.db_handler import DatabaseHandler
+from utils.snapshot_cache import SnapshotCache
+
+
+def test_latest_entry_expires_before_past_days():
+    cache = SnapshotCache(ttl_seconds=3600, latest_ttl_seconds=0.05)
+    cache.put({'date': '2024-05-01', 'data': {}})
+    cache.put({'date': '2024-05-02', 'data': {}}, latest=True)
+    assert cache.get_latest()['date'] == '2024-05-02'
+
+    time.sleep(0.1)
+    assert cache.get_latest() is None
+    assert cache.get('2024-05-02') is None
+    assert cache.get('2024-05-01') is not None
+
+
+def test_latest_lookup_sees_writes_from_other_processes():
+    db_handler = DatabaseHandler(connection_string='memory://snapshot-latest')
+    db_handler.snapshot_cache = SnapshotCache(ttl_seconds=3600, latest_ttl_seconds=0.05)
+    db_handler.insert_gold_prices({'Gram Altın': {'Alış Fiyatı': 1.0, 'Satış Fiyatı': 1.0}}, '2024-05-01')
+    assert db_handler.get_latest_gold_prices()['date'] == '2024-05-01'
+
+    # Başka bir sürecin yazması önbelleği güncellemez
+    db_handler.connect()[config.MONGO_COLLECTION_PRICES].insert_one({'date': '2024-05-02', 'data': {}})
+    time.sleep(0.1)
+    assert db_handler.get_latest_gold_prices()['date'] == '2024-05-02'
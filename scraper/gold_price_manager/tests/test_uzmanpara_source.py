@@ -0,0 +1,20 @@
+from data_sources.uzmanpara_parser import StreamedTable
+from data_sources.uzmanpara_source import UzmanParaSource
+
+PAGE = b'<html><body><div class="box">...</div></body></html>'
+
+
+def test_full_parser_mode_disables_streaming():
+    assert not UzmanParaSource(parser_mode='full', streaming=True).streaming
+    assert UzmanParaSource(parser_mode='fast', streaming=True).streaming
+
+
+def test_streamed_page_without_table_falls_back_to_full_parse(monkeypatch):
+    source = UzmanParaSource(parser_mode='fast', streaming=True)
+    parsed = []
+    monkeypatch.setattr(source, 'extract_rows_full', lambda content: parsed.append(content) or [['1', 'Gram']])
+
+    rows = source.extract_rows(StreamedTable(rows=None, bytes_read=len(PAGE), stopped_early=False, content=PAGE))
+
+    assert rows == [['1', 'Gram']]
+    assert parsed == [PAGE]
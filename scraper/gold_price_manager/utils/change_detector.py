@@ -0,0 +1,107 @@
+"""
+Değişiklik algılama modülü - Toplanan fiyatları son yazılan anlık görüntünün parmak iziyle karşılaştırır.
+
+Aynı gün için fiyatlar değişmediyse tam belge yazılmaz; durum koleksiyonuna yalnızca 'son görülme'
+zamanı ve değişmeyen okuma sayısı işlenir.
+"""
+from datetime import datetime
+
+from utils.fingerprint import snapshot_fingerprint
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Son yazılan anlık görüntünün durum koleksiyonundaki anahtarı
+FINGERPRINT_STATE_KEY = 'prices_fingerprint'
+
+
+class ChangeDetector:
+    """
+    Günlük fiyat belgesinin son yazılan içeriğini parmak iziyle izleyen sınıf.
+    """
+
+    def __init__(self, db_handler, state_key=FINGERPRINT_STATE_KEY):
+        """
+        Args:
+            db_handler (DatabaseHandler): Durum kaydını okuyup yazacak işleyici.
+            state_key (str): Durum anahtarı.
+        """
+        self.db_handler = db_handler
+        self.state_key = state_key
+        self.state = {}
+
+    def is_unchanged(self, date, prices_data):
+        """
+        Fiyatların aynı gün için son yazılanlarla aynı olup olmadığını kontrol eder. Gün değiştiyse
+        veya durum okunamazsa değişmiş sayılır.
+
+        Args:
+            date (str): Anlık görüntü tarihi (YYYY-MM-DD).
+            prices_data (dict): Toplanan fiyatlar.
+
+        Returns:
+            bool: Fiyatlar değişmediyse True.
+        """
+        try:
+            self.state = self.db_handler.get_state(self.state_key) or {}
+        except Exception as e:
+            logger.warning(f"Son anlık görüntü parmak izi okunamadı, fiyatlar yazılacak: {str(e)}")
+            self.state = {}
+            return False
+
+        return self.state.get('date') == date and self.state.get('hash') == snapshot_fingerprint(prices_data)
+
+    @property
+    def processed(self):
+        """
+        Returns:
+            bool: Son yazılan anlık görüntü için sonraki adımlar (yüzde hesaplaması) tamamlandıysa True.
+        """
+        return bool(self.state.get('processed'))
+
+    def record_write(self, date, prices_data):
+        """
+        Yazılan anlık görüntünün parmak izini kaydeder.
+
+        Args:
+            date (str): Anlık görüntü tarihi.
+            prices_data (dict): Yazılan fiyatlar.
+        """
+        now = datetime.now()
+        self.db_handler.set_state(self.state_key, {
+            'date': date,
+            'hash': snapshot_fingerprint(prices_data),
+            'last_changed': now,
+            'last_seen': now,
+            'unchanged_polls': 0,
+            'processed': False
+        })
+
+    def mark_processed(self, date, prices_data):
+        """
+        Hesaplanan anlık görüntü için sonraki adımların tamamlandığını işaretler; değişmeyen
+        okumalarda bu adımlar yeniden çalıştırılmaz. Durum kaydı yalnızca tarih ve parmak izi
+        eşleşiyorsa güncellenir; arada başka bir süreç daha yeni fiyatlar yazdıysa o kayıt işaretlenmez.
+
+        Args:
+            date (str): Hesaplanan anlık görüntünün tarihi.
+            prices_data (dict): Hesaplanan fiyatlar.
+
+        Returns:
+            bool: Durum kaydı işaretlendiyse True.
+        """
+        result = self.db_handler.set_state(self.state_key, {'processed': True}, expected={
+            'date': date,
+            'hash': snapshot_fingerprint(prices_data)
+        })
+        if not result.matched_count:
+            logger.info("Son yazılan anlık görüntü hesaplanandan farklı, hesaplama durumu işaretlenmedi.")
+            return False
+        return True
+
+    def record_heartbeat(self):
+        """
+        Değişmeyen okuma için yalnızca son görülme zamanını ve sayacı günceller.
+        """
+        self.db_handler.set_state(self.state_key, {'last_seen': datetime.now()},
+                                  increments={'unchanged_polls': 1})
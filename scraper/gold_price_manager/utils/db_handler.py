@@ -1,26 +1,106 @@
 """
 Veritabanı işlemleri modülü - MongoDB ile etkileşimi yönetir.
 """
-from datetime import datetime
+from datetime import datetime, timezone
+import threading
 import time
 from functools import wraps
 
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
+from pymongo import MongoClient, ASCENDING, ReplaceOne, UpdateOne
+from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError, DuplicateKeyError, OperationFailure
 
 import config
 from utils.logger import setup_logger, log_function_call
+from utils.memory_store import MEMORY_SCHEME
+from utils.resilience import call_with_retry, get_breaker
+from utils.snapshot_cache import get_snapshot_cache
 
 logger = setup_logger(__name__)
 
+# Bağlantı dizesi başına süreç genelinde paylaşılan istemciler ve son sağlık kontrolü zamanları
+_clients = {}
+_last_health_checks = {}
+_indexed_databases = set()
+_index_failures = {}  # (bağlantı dizesi, veritabanı) -> son başarısız indeks denemesinin zamanı
+_clients_lock = threading.Lock()
 
-def retry_on_mongodb_error(max_attempts=config.RETRY_ATTEMPTS, delay_seconds=config.RETRY_DELAY_SECONDS):
+
+def get_shared_client(connection_string):
     """
-    MongoDB hatalarına karşı yeniden deneme mekanizması sağlayan decorator.
+    Bağlantı dizesi için süreç genelinde paylaşılan, havuzlu MongoClient'ı döndürür.
+
+    İstemci tembel oluşturulur (connect=False); ilk işlemde bağlanır ve bağlantılar
+    havuzda tutularak sonraki döngülerde yeniden kullanılır.
 
     Args:
-        max_attempts (int): Maksimum deneme sayısı.
-        delay_seconds (int): Denemeler arası bekleme süresi (saniye).
+        connection_string (str): MongoDB bağlantı URL'si.
+
+    Returns:
+        pymongo.MongoClient or MemoryClient: Paylaşılan istemci; bağlantı dizesi 'memory://' ile
+            başlıyorsa bellek içi veritabanı.
+    """
+    client = _clients.get(connection_string)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(connection_string)
+            if client is None and connection_string.startswith(MEMORY_SCHEME):
+                # Sunucusuz çalıştırma ve ölçümler için bellek içi veritabanı
+                from utils.memory_store import MemoryClient
+                logger.info("Bellek içi veritabanı kullanılıyor; veriler kalıcı değildir.")
+                client = _clients[connection_string] = MemoryClient(connection_string)
+            elif client is None:
+                logger.info(f"Paylaşılan MongoDB istemcisi oluşturuluyor "
+                            f"(havuz: {config.MONGO_MIN_POOL_SIZE}-{config.MONGO_MAX_POOL_SIZE})")
+                client = MongoClient(
+                    connection_string,
+                    maxPoolSize=config.MONGO_MAX_POOL_SIZE,
+                    minPoolSize=config.MONGO_MIN_POOL_SIZE,
+                    maxIdleTimeMS=config.MONGO_MAX_IDLE_TIME_MS,
+                    serverSelectionTimeoutMS=config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                    connect=False
+                )
+                _clients[connection_string] = client
+    return client
+
+
+def close_all_clients():
+    """
+    Paylaşılan tüm MongoDB istemcilerini kapatır. Süreç sonlanırken çağrılmalıdır.
+    """
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        if _clients:
+            logger.info("Paylaşılan MongoDB istemcileri kapatıldı.")
+        _clients.clear()
+        _last_health_checks.clear()
+        _indexed_databases.clear()
+        _index_failures.clear()
+
+
+def intraday_bucket_start(timestamp, bucket_minutes=config.INTRADAY_BUCKET_MINUTES):
+    """
+    Zaman damgasının ait olduğu gün içi kovanın başlangıcını döndürür (Unix zamanına hizalı).
+
+    Args:
+        timestamp (datetime): Saat dilimi bilgili zaman damgası.
+        bucket_minutes (int): Kova süresi (dakika).
+
+    Returns:
+        datetime: UTC kova başlangıcı.
+    """
+    bucket_seconds = bucket_minutes * 60
+    seconds = int(timestamp.timestamp())
+    return datetime.fromtimestamp(seconds - seconds % bucket_seconds, tz=timezone.utc)
+
+
+def retry_on_mongodb_error(policy=None):
+    """
+    MongoDB bağlantı hatalarına karşı üstel beklemeli yeniden deneme ve veritabanı başına devre
+    kesici sağlayan decorator.
+
+    Args:
+        policy (RetryPolicy, optional): Yeniden deneme politikası. Varsayılan: yapılandırmadaki değerler.
 
     Returns:
         callable: Decorator fonksiyonu.
@@ -28,25 +108,11 @@ def retry_on_mongodb_error(max_attempts=config.RETRY_ATTEMPTS, delay_seconds=con
 
     def decorator(func):
         @wraps(func)
-        def wrapper(*args, **kwargs):
-            attempts = 0
-            last_exception = None
-
-            while attempts < max_attempts:
-                try:
-                    return func(*args, **kwargs)
-                except (ConnectionFailure, ServerSelectionTimeoutError) as e:
-                    attempts += 1
-                    last_exception = e
-                    logger.warning(f"MongoDB bağlantı hatası: {str(e)}. "
-                                   f"Deneme {attempts}/{max_attempts}...")
-
-                    if attempts < max_attempts:
-                        logger.info(f"{delay_seconds} saniye bekleniyor...")
-                        time.sleep(delay_seconds)
-
-            logger.error(f"Maksimum deneme sayısına ulaşıldı. Son hata: {str(last_exception)}")
-            raise last_exception
+        def wrapper(self, *args, **kwargs):
+            breaker = get_breaker(f"mongodb:{self.database_name}")
+            return call_with_retry(lambda: func(self, *args, **kwargs),
+                                   (ConnectionFailure, ServerSelectionTimeoutError),
+                                   breaker.name, policy, breaker)
 
         return wrapper
 
@@ -72,71 +138,282 @@ class DatabaseHandler:
         self.database_name = database_name
         self.client = None
         self.db = None
+        # Fiyat belgeleri için okuma önbelleği (aynı veritabanını kullanan işleyiciler paylaşır)
+        self.snapshot_cache = get_snapshot_cache((connection_string, database_name)) \
+            if config.SNAPSHOT_CACHE_ENABLED else None
 
     def connect(self):
         """
-        MongoDB'ye bağlanır.
+        Paylaşılan istemci üzerinden veritabanını döndürür; gerekirse sağlık kontrolü yapar.
 
         Returns:
             pymongo.database.Database: Veritabanı bağlantısı.
         """
         if self.client is None:
-            logger.info(f"MongoDB'ye bağlanılıyor: {self.database_name}")
-            self.client = MongoClient(self.connection_string)
+            logger.debug("MongoDB veritabanı seçiliyor: %s", self.database_name)
+            self.client = get_shared_client(self.connection_string)
             self.db = self.client[self.database_name]
 
-            # Bağlantıyı test et
+        self.check_health()
+        self.ensure_indexes()
+        return self.db
+
+    def ensure_indexes(self):
+        """
+        Fiyat, yüzde, getiri ve köken koleksiyonlarında 'date' alanı için tekil indeksleri, fiyat
+        koleksiyonunda ayrıca 'updated_at' indeksini oluşturur.
+        Her veritabanı için tüm indeksler oluşturulana kadar çalışır; başarısız olan indeksler her işlemde
+        değil, config.MONGO_INDEX_RETRY_SECONDS aralıklarla yeniden denenir. 'En son kayıt' sıralaması da
+        tarih indeksini kullanır.
+        """
+        key = (self.connection_string, self.database_name)
+        if key in _indexed_databases:
+            return
+        last_failure = _index_failures.get(key)
+        if last_failure is not None and time.monotonic() - last_failure < config.MONGO_INDEX_RETRY_SECONDS:
+            return
+
+        created = True
+        for collection_name in (config.MONGO_COLLECTION_PRICES, config.MONGO_COLLECTION_PERCENTAGES,
+                                config.MONGO_COLLECTION_RETURNS, config.MONGO_COLLECTION_PROVENANCE):
             try:
-                self.client.admin.command('ping')
-                logger.info("MongoDB bağlantısı başarılı.")
-            except Exception as e:
-                logger.error(f"MongoDB bağlantı testi başarısız: {str(e)}")
-                raise
+                self.db[collection_name].create_index([('date', ASCENDING)], unique=True, name='date_unique')
+            except OperationFailure as e:
+                # Örn. mevcut mükerrer tarihler; yazmalar indekssiz devam eder
+                logger.error(f"'{collection_name}' koleksiyonunda tarih indeksi oluşturulamadı: {str(e)}")
+                created = False
+
+        try:
+            # Yerel fiyat önbelleği sonradan değiştirilen eski günleri bu indeksle bulur
+            self.db[config.MONGO_COLLECTION_PRICES].create_index([('updated_at', ASCENDING)], name='updated_at')
+        except OperationFailure as e:
+            logger.error(f"'{config.MONGO_COLLECTION_PRICES}' koleksiyonunda güncelleme indeksi oluşturulamadı: {str(e)}")
+            created = False
+
+        if config.INTRADAY_ENABLED:
+            created = self._ensure_intraday_indexes() and created
+
+        if not created:
+            _index_failures[key] = time.monotonic()
+            logger.warning(f"Bazı indeksler oluşturulamadı, {config.MONGO_INDEX_RETRY_SECONDS} saniye sonra "
+                           f"yeniden denenecek.")
+            return
+        _index_failures.pop(key, None)
+        _indexed_databases.add(key)
+        logger.info("Tarih indeksleri hazır.")
+
+    def _ensure_intraday_indexes(self):
+        """
+        Gün içi kova koleksiyonunun indekslerini oluşturur: kaynak ve kova başlangıcı için tekil
+        indeks (yazmalar ve kaynak bazlı aralık sorguları), tüm kaynaklar için kova başlangıcı
+        indeksi ve yapılandırıldıysa saklama süresi (TTL).
 
-        return self.db
+        Returns:
+            bool: Tüm indeksler oluşturulduysa True.
+        """
+        collection = self.db[config.MONGO_COLLECTION_INTRADAY]
+        try:
+            collection.create_index([('source', ASCENDING), ('bucket_start', ASCENDING)],
+                                    unique=True, name='source_bucket_unique')
+            if config.INTRADAY_RETENTION_DAYS > 0:
+                collection.create_index([('bucket_start', ASCENDING)], name='bucket_start_ttl',
+                                        expireAfterSeconds=config.INTRADAY_RETENTION_DAYS * 86400)
+            else:
+                collection.create_index([('bucket_start', ASCENDING)], name='bucket_start')
+        except OperationFailure as e:
+            # Örn. saklama süresi değiştirilmiş mevcut indeks
+            logger.error(f"'{config.MONGO_COLLECTION_INTRADAY}' koleksiyonunda indeks oluşturulamadı: {str(e)}")
+            return False
+        return True
+
+    @staticmethod
+    def _upsert_by_date(collection, date, document):
+        """
+        Belgeyi tarihe göre tek istekte ekler veya değiştirir.
+
+        Args:
+            collection (pymongo.collection.Collection): Hedef koleksiyon.
+            date (str): Belge tarihi.
+            document (dict): Yazılacak belge.
+
+        Returns:
+            pymongo.results.UpdateResult: Yazma sonucu.
+        """
+        try:
+            return collection.replace_one({'date': date}, document, upsert=True)
+        except DuplicateKeyError:
+            # Eşzamanlı bir upsert kaydı önce oluşturduysa değiştirme olarak tekrarla
+            return collection.replace_one({'date': date}, document)
+
+    def check_health(self, force=False):
+        """
+        Havuzdaki bir bağlantı üzerinden 'ping' gönderir. Son başarılı kontrolden bu yana
+        config.MONGO_HEALTHCHECK_INTERVAL_SECONDS geçmediyse kontrol atlanır.
+
+        Args:
+            force (bool): True ise aralık beklenmeden kontrol yapılır.
+
+        Raises:
+            ConnectionFailure: Sunucuya ulaşılamazsa.
+        """
+        now = time.monotonic()
+        last_check = _last_health_checks.get(self.connection_string)
+        if not force and last_check is not None and now - last_check < config.MONGO_HEALTHCHECK_INTERVAL_SECONDS:
+            return
+
+        try:
+            self.client.admin.command('ping')
+            _last_health_checks[self.connection_string] = now
+            logger.debug("MongoDB sağlık kontrolü başarılı.")
+        except Exception as e:
+            _last_health_checks.pop(self.connection_string, None)
+            logger.error(f"MongoDB bağlantı testi başarısız: {str(e)}")
+            raise
 
     def close(self):
         """
-        MongoDB bağlantısını kapatır.
+        İşleyicinin istemci referansını bırakır. Paylaşılan istemci ve bağlantı havuzu açık kalır;
+        süreç sonunda close_all_clients() ile kapatılır.
         """
         if self.client:
-            logger.info("MongoDB bağlantısı kapatılıyor.")
-            self.client.close()
+            logger.debug("MongoDB işleyicisi paylaşılan istemciyi bırakıyor.")
             self.client = None
             self.db = None
 
+    @staticmethod
+    def current_date():
+        """
+        Returns:
+            str: Fiyat kayıtlarında kullanılan bugünün tarihi (YYYY-MM-DD).
+        """
+        return datetime.now().strftime(config.DATE_FORMAT)
+
     @retry_on_mongodb_error()
     @log_function_call
-    def insert_gold_prices(self, prices_data):
+    def insert_gold_prices(self, prices_data, date=None):
         """
         Altın fiyatlarını veritabanına kaydeder.
 
         Args:
             prices_data (dict): Altın fiyat verileri.
+            date (str, optional): Kayıt tarihi (YYYY-MM-DD). Varsayılan: bugün.
 
         Returns:
-            pymongo.results.InsertOneResult: Ekleme sonucu.
+            pymongo.results.UpdateResult: Yazma sonucu.
         """
         db = self.connect()
         collection = db[config.MONGO_COLLECTION_PRICES]
 
-        # Bugünün tarihini al (saat bilgisi olmadan)
-        current_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        today = current_date.strftime(config.DATE_FORMAT)
-
-        # Aynı güne ait veri var mı kontrol et
-        existing_record = collection.find_one({'date': today})
-        if existing_record:
-            logger.warning(f"'{today}' tarihine ait veri zaten mevcut. Güncelleniyor...")
-            result = collection.replace_one({'date': today}, {'date': today, 'data': prices_data})
-            logger.info(f"Veri güncellendi. Etkilenen kayıt sayısı: {result.modified_count}")
-            return result
+        today = date or self.current_date()
+
+        # Aynı güne ait kayıt varsa değiştir, yoksa ekle (tek istek); 'updated_at' yerel önbelleğin
+        # değişen eski günleri bulmasını sağlar
+        result = self._upsert_by_date(collection, today, {
+            'date': today,
+            'data': prices_data,
+            'updated_at': datetime.now(timezone.utc)
+        })
+        if result.upserted_id is not None:
+            logger.info(f"Veri kaydedildi. Eklenen kayıt ID: {result.upserted_id}")
         else:
-            # Yeni kayıt ekle
-            data_with_date = {'date': today, 'data': prices_data}
-            result = collection.insert_one(data_with_date)
-            logger.info(f"Veri kaydedildi. Eklenen kayıt ID: {result.inserted_id}")
-            return result
+            logger.info(f"'{today}' tarihine ait veri güncellendi. Etkilenen kayıt sayısı: {result.modified_count}")
+
+        # Önbellekteki günü yerinde güncelle
+        if self.snapshot_cache is not None:
+            self.snapshot_cache.refresh(today, prices_data, result.upserted_id)
+        return result
+
+    @retry_on_mongodb_error()
+    @log_function_call
+    def insert_intraday_prices(self, source_prices, timestamp=None, date=None):
+        """
+        Kaynak başına fiyatları zaman damgasıyla gün içi kovalara ekler. Her kova belgesi bir kaynağın
+        bir kova süresindeki (varsayılan bir saat) tüm okumalarını 'ticks' dizisinde tutar; günlük
+        belge ayrıca insert_gold_prices ile yazılmaya devam eder.
+
+        Args:
+            source_prices (dict): {kaynak_adı: fiyat_verisi} sözlüğü.
+            timestamp (datetime, optional): Okuma zamanı. Varsayılan: şimdi (UTC).
+            date (str, optional): Okumanın ait olduğu gün (YYYY-MM-DD). Varsayılan: bugün.
+
+        Returns:
+            int: Okuması yazılan kaynak sayısı; aynı zaman damgalı okuma yeniden eklenmez.
+        """
+        if not source_prices:
+            return 0
+
+        db = self.connect()
+        collection = db[config.MONGO_COLLECTION_INTRADAY]
+
+        timestamp = timestamp or datetime.now(timezone.utc)
+        bucket_start = intraday_bucket_start(timestamp)
+        date = date or self.current_date()
+
+        # Kaynak başına iki işlem, tek toplu istek: önce kova yoksa oluşturulur, sonra okuma yalnızca aynı
+        # zaman damgalı okuma kovada yoksa eklenir. Bağlantı hatasından sonraki yeniden deneme, sunucuda
+        # uygulanmış bir yazmayı tekrarlamaz.
+        operations = []
+        for source_name, prices in source_prices.items():
+            bucket = {'source': source_name, 'bucket_start': bucket_start}
+            operations.append(UpdateOne(
+                bucket,
+                {'$setOnInsert': {'date': date, 'ticks': [], 'count': 0}},
+                upsert=True
+            ))
+            operations.append(UpdateOne(
+                {**bucket, 'ticks.ts': {'$ne': timestamp}},
+                {
+                    '$push': {'ticks': {'ts': timestamp, 'data': prices}},
+                    '$inc': {'count': 1},
+                    '$min': {'first_ts': timestamp},
+                    '$max': {'last_ts': timestamp},
+                }
+            ))
+        collection.bulk_write(operations, ordered=True)
+
+        logger.info(f"Gün içi fiyatlar kaydedildi: {len(source_prices)} kaynak, "
+                    f"kova {bucket_start.strftime(config.DATETIME_FORMAT)} UTC")
+        return len(source_prices)
+
+    @retry_on_mongodb_error()
+    @log_function_call
+    def get_intraday_prices(self, start, end, source=None):
+        """
+        Zaman aralığındaki gün içi okumaları kova indeksini kullanarak getirir.
+
+        Args:
+            start (datetime): Başlangıç (dahil, saat dilimi bilgili).
+            end (datetime): Bitiş (hariç, saat dilimi bilgili).
+            source (str, optional): Yalnızca bu kaynağın okumaları.
+
+        Returns:
+            list: Zamana göre artan sırada {'source', 'ts', 'data'} sözlükleri.
+        """
+        db = self.connect()
+        collection = db[config.MONGO_COLLECTION_INTRADAY]
+
+        # Aralığın başını içeren kova da dahil edilir
+        query = {'bucket_start': {'$gte': intraday_bucket_start(start), '$lt': end}}
+        if source:
+            query['source'] = source
+
+        ticks = []
+        for bucket in collection.find(query, {'_id': 0, 'source': 1, 'ticks': 1}).sort('bucket_start', ASCENDING):
+            for tick in bucket.get('ticks', []):
+                tick_time = tick['ts'] if tick['ts'].tzinfo else tick['ts'].replace(tzinfo=timezone.utc)
+                if start <= tick_time < end:
+                    ticks.append({'source': bucket['source'], 'ts': tick_time, 'data': tick['data']})
+
+        ticks.sort(key=lambda tick: tick['ts'])
+        logger.info(f"{len(ticks)} gün içi okuma getirildi.")
+        return ticks
+
+    def cache_stats(self):
+        """
+        Returns:
+            dict or None: Anlık görüntü önbelleğinin isabet/ıskalama sayaçları; önbellek kapalıysa None.
+        """
+        return self.snapshot_cache.stats() if self.snapshot_cache is not None else None
 
     @retry_on_mongodb_error()
     @log_function_call
@@ -149,30 +426,55 @@ class DatabaseHandler:
             percentage_diff (dict): Yüzde değişim verileri.
 
         Returns:
-            pymongo.results.InsertOneResult: Ekleme sonucu.
+            pymongo.results.UpdateResult: Yazma sonucu.
         """
         db = self.connect()
         collection = db[config.MONGO_COLLECTION_PERCENTAGES]
 
-        # Aynı güne ait veri var mı kontrol et
-        existing_record = collection.find_one({'date': date})
-        if existing_record:
-            logger.warning(f"'{date}' tarihine ait yüzde değişim verisi zaten mevcut. Güncelleniyor...")
-            result = collection.replace_one(
-                {'date': date},
-                {'date': date, 'percentage_difference': percentage_diff}
-            )
-            logger.info(f"Yüzde değişim verisi güncellendi. Etkilenen kayıt sayısı: {result.modified_count}")
-            return result
+        # Aynı güne ait kayıt varsa değiştir, yoksa ekle (tek istek)
+        document = {
+            'date': date,
+            'percentage_difference': percentage_diff
+        }
+        result = self._upsert_by_date(collection, date, document)
+        if result.upserted_id is not None:
+            logger.info(f"Yüzde değişim verisi kaydedildi. Eklenen kayıt ID: {result.upserted_id}")
         else:
-            # Yeni kayıt ekle
-            document = {
-                'date': date,
-                'percentage_difference': percentage_diff
-            }
-            result = collection.insert_one(document)
-            logger.info(f"Yüzde değişim verisi kaydedildi. Eklenen kayıt ID: {result.inserted_id}")
-            return result
+            logger.info(f"'{date}' tarihine ait yüzde değişim verisi güncellendi. "
+                        f"Etkilenen kayıt sayısı: {result.modified_count}")
+        return result
+
+    @retry_on_mongodb_error()
+    @log_function_call
+    def upsert_returns(self, date, document):
+        """
+        Çok ufuklu getiri belgesini tarihe göre ekler veya değiştirir.
+
+        Args:
+            date (str): Veri tarihi.
+            document (dict): Tüm zaman ufuklarının getirilerini içeren belge.
+
+        Returns:
+            pymongo.results.UpdateResult: Yazma sonucu.
+        """
+        db = self.connect()
+        return self._upsert_by_date(db[config.MONGO_COLLECTION_RETURNS], date, document)
+
+    @retry_on_mongodb_error()
+    @log_function_call
+    def upsert_quote_provenance(self, date, document):
+        """
+        Kaynak bazındaki teklifleri ve uzlaşı bilgisini tarihe göre ekler veya değiştirir.
+
+        Args:
+            date (str): Veri tarihi.
+            document (dict): Consolidation.provenance_document ile oluşturulan belge.
+
+        Returns:
+            pymongo.results.UpdateResult: Yazma sonucu.
+        """
+        db = self.connect()
+        return self._upsert_by_date(db[config.MONGO_COLLECTION_PROVENANCE], date, document)
 
     @retry_on_mongodb_error()
     @log_function_call
@@ -183,12 +485,20 @@ class DatabaseHandler:
         Returns:
             dict or None: En son altın fiyat kaydı.
         """
+        if self.snapshot_cache is not None:
+            cached = self.snapshot_cache.get_latest()
+            if cached is not None:
+                logger.debug("En son fiyat verisi önbellekten alındı: %s", cached['date'])
+                return cached
+
         db = self.connect()
         collection = db[config.MONGO_COLLECTION_PRICES]
 
         latest_document = collection.find_one(sort=[('date', -1)])
         if latest_document:
             logger.info(f"En son fiyat verisi bulundu: {latest_document['date']}")
+            if self.snapshot_cache is not None:
+                self.snapshot_cache.put(latest_document, latest=True)
         else:
             logger.warning("Hiç fiyat verisi bulunamadı.")
 
@@ -206,13 +516,175 @@ class DatabaseHandler:
         Returns:
             dict or None: İstenen tarihe ait altın fiyat kaydı.
         """
+        if self.snapshot_cache is not None:
+            cached = self.snapshot_cache.get(date)
+            if cached is not None:
+                logger.debug("'%s' tarihine ait veri önbellekten alındı.", date)
+                return cached
+
         db = self.connect()
         collection = db[config.MONGO_COLLECTION_PRICES]
 
         document = collection.find_one({'date': date})
         if document:
             logger.info(f"'{date}' tarihine ait veri bulundu.")
+            if self.snapshot_cache is not None:
+                self.snapshot_cache.put(document)
         else:
             logger.warning(f"'{date}' tarihine ait veri bulunamadı.")
 
-        return document
\ No newline at end of file
+        return document
+
+    @retry_on_mongodb_error()
+    @log_function_call
+    def get_recent_gold_prices(self, limit):
+        """
+        En son 'limit' adet fiyat kaydını tek sorguda getirir ve önbelleğe alır.
+
+        Args:
+            limit (int): Getirilecek kayıt sayısı.
+
+        Returns:
+            list: Tarihe göre artan sırada fiyat belgeleri (son eleman en son kayıt).
+        """
+        db = self.connect()
+        collection = db[config.MONGO_COLLECTION_PRICES]
+
+        documents = list(collection.find().sort('date', -1).limit(limit))
+        documents.reverse()
+        logger.info(f"Son {len(documents)} fiyat kaydı getirildi.")
+
+        if self.snapshot_cache is not None:
+            for position, document in enumerate(documents, start=1):
+                self.snapshot_cache.put(document, latest=position == len(documents))
+        return documents
+
+    def iter_gold_prices(self, start_date=None, end_date=None, batch_size=config.BACKFILL_BATCH_SIZE,
+                         updated_after=None):
+        """
+        Fiyat belgelerini tarihe göre artan sırada parti parti döndürür. Her parti yeniden denenen tek
+        bir sorguyla tamamen okunur; bağlantı hatasından sonra okuma son alınan tarihten sürer.
+
+        Args:
+            start_date (str, optional): Başlangıç tarihi (dahil, YYYY-MM-DD).
+            end_date (str, optional): Bitiş tarihi (dahil, YYYY-MM-DD).
+            batch_size (int): Bir sorguda alınacak belge sayısı.
+            updated_after (datetime, optional): Verilirse yalnızca bu zamandan sonra yazılan belgeler.
+
+        Yields:
+            dict: {'date', 'data'} alanlarını içeren belgeler.
+        """
+        last_date = None
+        while True:
+            documents = self._read_gold_prices_batch(start_date, end_date, last_date, batch_size, updated_after)
+            yield from documents
+            if len(documents) < batch_size:
+                return
+            last_date = documents[-1]['date']
+
+    @retry_on_mongodb_error()
+    @log_function_call
+    def _read_gold_prices_batch(self, start_date, end_date, after_date, batch_size, updated_after=None):
+        """
+        Tarih aralığındaki belgelerden after_date'ten sonraki en fazla batch_size tanesini getirir.
+
+        Args:
+            start_date (str or None): Başlangıç tarihi (dahil).
+            end_date (str or None): Bitiş tarihi (dahil).
+            after_date (str or None): Önceki partinin son tarihi (hariç).
+            batch_size (int): Getirilecek en fazla belge sayısı.
+            updated_after (datetime, optional): Verilirse yalnızca bu zamandan sonra yazılan belgeler.
+
+        Returns:
+            list: Tarihe göre artan sırada {'date', 'data'} belgeleri.
+        """
+        db = self.connect()
+        collection = db[config.MONGO_COLLECTION_PRICES]
+
+        date_filter = {}
+        if after_date:
+            date_filter['$gt'] = after_date
+        elif start_date:
+            date_filter['$gte'] = start_date
+        if end_date:
+            date_filter['$lte'] = end_date
+        query = {'date': date_filter} if date_filter else {}
+        if updated_after is not None:
+            query['updated_at'] = {'$gt': updated_after}
+
+        return list(collection.find(query, {'_id': 0, 'date': 1, 'data': 1})
+                    .sort('date', ASCENDING).limit(batch_size))
+
+    @retry_on_mongodb_error()
+    @log_function_call
+    def bulk_upsert_percentage_differences(self, items, batch_size=config.BACKFILL_BATCH_SIZE):
+        """
+        Yüzde değişim belgelerini toplu yazma ile tarihe göre ekler veya değiştirir.
+
+        Args:
+            items (iterable): (tarih, yüzde_değişim_sözlüğü) çiftleri.
+            batch_size (int): Bir toplu yazmadaki en fazla işlem sayısı.
+
+        Returns:
+            int: Eklenen veya güncellenen belge sayısı.
+        """
+        db = self.connect()
+        collection = db[config.MONGO_COLLECTION_PERCENTAGES]
+
+        written = 0
+        operations = []
+        for date, percentage_diff in items:
+            operations.append(ReplaceOne(
+                {'date': date},
+                {'date': date, 'percentage_difference': percentage_diff},
+                upsert=True
+            ))
+            if len(operations) >= batch_size:
+                result = collection.bulk_write(operations, ordered=False)
+                written += result.upserted_count + result.modified_count
+                operations = []
+
+        if operations:
+            result = collection.bulk_write(operations, ordered=False)
+            written += result.upserted_count + result.modified_count
+
+        logger.info(f"Toplu yazma tamamlandı: {written} yüzde değişim belgesi eklendi/güncellendi.")
+        return written
+
+    @retry_on_mongodb_error()
+    @log_function_call
+    def get_state(self, key):
+        """
+        İşlem durumu koleksiyonundan bir kaydı getirir (ör. hesaplama kontrol noktası).
+
+        Args:
+            key (str): Durum anahtarı.
+
+        Returns:
+            dict or None: Durum kaydı.
+        """
+        db = self.connect()
+        return db[config.MONGO_COLLECTION_STATE].find_one({'_id': key})
+
+    @retry_on_mongodb_error()
+    @log_function_call
+    def set_state(self, key, values, increments=None, expected=None):
+        """
+        İşlem durumu kaydını günceller, yoksa oluşturur.
+
+        Args:
+            key (str): Durum anahtarı.
+            values (dict): Kaydedilecek alanlar.
+            increments (dict, optional): Artırılacak sayaç alanları ({alan: miktar}).
+            expected (dict, optional): Kaydın güncellenmesi için sahip olması gereken alan değerleri.
+                Verilirse kayıt yalnızca bu değerlerle eşleşiyorsa güncellenir, yoksa oluşturulmaz.
+
+        Returns:
+            pymongo.results.UpdateResult: Yazma sonucu.
+        """
+        db = self.connect()
+        update = {'$set': values}
+        if increments:
+            update['$inc'] = increments
+        return db[config.MONGO_COLLECTION_STATE].update_one({**(expected or {}), '_id': key}, update,
+                                                            upsert=expected is None)
@@ -0,0 +1,35 @@
+"""
+Parmak izi modülü - Fiyat anlık görüntüleri için içerik özetleri üretir.
+"""
+import hashlib
+import json
+
+
+def normalize_prices(prices_data):
+    """
+    Fiyat sözlüğünü anahtar sırasından bağımsız, karşılaştırılabilir biçime getirir.
+
+    Args:
+        prices_data (dict): {altın_türü: {'Alış Fiyatı': ..., 'Satış Fiyatı': ...}} sözlüğü.
+
+    Returns:
+        list: Altın türüne göre sıralı [tür, alış, satış] listeleri.
+    """
+    return [
+        [gold_type, float(prices.get('Alış Fiyatı', 0.0)), float(prices.get('Satış Fiyatı', 0.0))]
+        for gold_type, prices in sorted((prices_data or {}).items())
+    ]
+
+
+def snapshot_fingerprint(prices_data):
+    """
+    Fiyat sözlüğünün içerik özetini hesaplar. Aynı fiyatlar her zaman aynı özeti verir.
+
+    Args:
+        prices_data (dict): Fiyat sözlüğü.
+
+    Returns:
+        str: SHA-1 özeti (onaltılık).
+    """
+    payload = json.dumps(normalize_prices(prices_data), ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
@@ -0,0 +1,96 @@
+"""
+HTTP istemci modülü - Veri kaynaklarının paylaştığı, ana makine başına havuzlanmış oturumları yönetir.
+"""
+import threading
+from urllib.parse import urlsplit
+
+import config
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Ana makine (scheme://netloc) başına açık tutulan oturumlar
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def _host_key(url):
+    """
+    URL'den oturum anahtarını üretir.
+
+    Args:
+        url (str): İstek URL'si.
+
+    Returns:
+        str: 'scheme://netloc' biçiminde anahtar.
+    """
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def _create_session():
+    """
+    Bağlantı havuzlu ve keep-alive açık yeni bir oturum oluşturur.
+
+    Returns:
+        requests.Session: Yapılandırılmış oturum.
+    """
+    # requests yalnızca ilk oturum açılırken yüklenir (veri çekmeyen modlar etkilenmez)
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+
+    # Yeniden denemeler kaynak katmanında yapılır, burada kapalı
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=config.HTTP_POOL_MAXSIZE, max_retries=0)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    session.headers.update({
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive',
+    })
+    return session
+
+
+def get_session(url):
+    """
+    URL'nin ana makinesi için paylaşılan oturumu döndürür, yoksa oluşturur.
+
+    Args:
+        url (str): İstek URL'si.
+
+    Returns:
+        requests.Session: Ana makineye ait oturum.
+    """
+    key = _host_key(url)
+    session = _sessions.get(key)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(key)
+            if session is None:
+                logger.info(f"Yeni HTTP oturumu oluşturuluyor: {key}")
+                session = _create_session()
+                _sessions[key] = session
+    return session
+
+
+def default_timeout():
+    """
+    Varsayılan (bağlantı, okuma) zaman aşımı çiftini döndürür.
+
+    Returns:
+        tuple: (bağlantı_süresi, okuma_süresi) saniye cinsinden.
+    """
+    return config.HTTP_CONNECT_TIMEOUT_SECONDS, config.HTTP_READ_TIMEOUT_SECONDS
+
+
+def close_all_sessions():
+    """
+    Açık tüm HTTP oturumlarını kapatır.
+    """
+    with _sessions_lock:
+        for key, session in _sessions.items():
+            logger.debug("HTTP oturumu kapatılıyor: %s", key)
+            session.close()
+        _sessions.clear()
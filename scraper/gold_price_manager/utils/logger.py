@@ -1,20 +1,139 @@
 """
 Loglama modülü - Uygulama loglarını yönetir.
+
+Tüm logger'lar süreç genelinde tek bir kuyruğa yazar; konsol ve dosya çıktısı ayrı bir dinleyici
+iş parçacığında yapılır. Böylece log G/Ç işlemleri çağıran iş parçacığını bekletmez.
 """
+import atexit
 import logging
+import math
+import queue
 import sys
+import threading
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from functools import wraps
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 import config
+from utils.metrics import registry as metrics
 
 # Logger formatı
 LOG_FORMAT = '%(asctime)s [%(levelname)s] %(name)s: %(message)s'
 
+# Log dosyası başına (kuyruk işleyicisi, dinleyici) çiftleri
+_pipelines = {}
+_pipelines_lock = threading.Lock()
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Belirli seviyenin altındaki kayıtları çağrı noktası (logger, satır) başına örnekleyen filtre.
+
+    Oran 0.1 ise her çağrı noktasının ilk kaydı ve ardından her 10 kayıttan biri geçer;
+    WARNING ve üzeri kayıtlar hiçbir zaman atılmaz.
+    """
+
+    def __init__(self, rate, max_level=logging.INFO):
+        """
+        Args:
+            rate (float): Geçirilecek kayıt oranı (0-1].
+            max_level (int): Örneklenecek en yüksek seviye.
+        """
+        super().__init__()
+        self.rate = rate
+        self.max_level = max_level
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if self.rate >= 1 or record.levelno > self.max_level:
+            return True
+
+        key = (record.name, record.lineno)
+        with self._lock:
+            count = self._counts.get(key, 0) + 1
+            self._counts[key] = count
+        return math.ceil(count * self.rate) != math.ceil((count - 1) * self.rate)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Kaydı kuyruğa biçimlendirmeden koyan işleyici.
+
+    Yalnızca mesaj argümanları sabitlenir; zaman damgası ve düzen biçimlendirmesi dinleyici
+    iş parçacığında, her çıktı işleyicisinin kendi biçimlendiricisiyle yapılır.
+    """
+
+    def prepare(self, record):
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+def _get_queue_handler(log_file):
+    """
+    Log dosyası için süreç genelinde tek kuyruk işleyicisini döndürür; ilk çağrıda konsol ve
+    dosya işleyicilerini dinleyici iş parçacığıyla başlatır.
+
+    Args:
+        log_file (str): Log dosyası yolu.
+
+    Returns:
+        logging.handlers.QueueHandler: Paylaşılan kuyruk işleyicisi.
+    """
+    pipeline = _pipelines.get(log_file)
+    if pipeline is not None:
+        return pipeline[0]
+
+    with _pipelines_lock:
+        pipeline = _pipelines.get(log_file)
+        if pipeline is None:
+            # Formatter oluştur
+            formatter = logging.Formatter(LOG_FORMAT, datefmt=config.DATETIME_FORMAT)
+
+            # Console handler
+            console_handler = logging.StreamHandler(sys.stdout)
+            console_handler.setFormatter(formatter)
+
+            # Dosya handler (rotasyonlu)
+            file_handler = RotatingFileHandler(
+                log_file, maxBytes=10 * 1024 * 1024, backupCount=5
+            )
+            file_handler.setFormatter(formatter)
+
+            log_queue = queue.SimpleQueue()
+            queue_handler = DeferredQueueHandler(log_queue)
+            queue_handler.addFilter(SamplingFilter(config.LOG_SAMPLE_RATE))
+
+            listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+            listener.start()
+
+            pipeline = (queue_handler, listener)
+            _pipelines[log_file] = pipeline
+    return pipeline[0]
+
+
+def shutdown_logging():
+    """
+    Dinleyicileri durdurur; kuyruktaki tüm kayıtlar yazıldıktan sonra döner. Süreç sonunda
+    otomatik çağrılır.
+    """
+    with _pipelines_lock:
+        for queue_handler, listener in _pipelines.values():
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+        _pipelines.clear()
+
+
+atexit.register(shutdown_logging)
+
 
 def setup_logger(name=None, level=None, log_file=None):
     """
-    Belirtilen yapılandırmayla bir logger oluşturur.
+    Belirtilen yapılandırmayla bir logger döndürür. Aynı ad için tekrar çağrılabilir;
+    paylaşılan kuyruk işleyicisi bir kez eklenir.
 
     Args:
         name (str, optional): Logger adı. Varsayılan: None (kök logger).
@@ -34,31 +153,17 @@ def setup_logger(name=None, level=None, log_file=None):
     logger = logging.getLogger(name)
     logger.setLevel(level)
 
-    # Aynı handler'ları tekrar eklememek için temizle
-    if logger.handlers:
-        logger.handlers.clear()
-
-    # Formatter oluştur
-    formatter = logging.Formatter(LOG_FORMAT, datefmt=config.DATETIME_FORMAT)
-
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-
-    # Dosya handler (rotasyonlu)
-    file_handler = RotatingFileHandler(
-        log_file, maxBytes=10 * 1024 * 1024, backupCount=5
-    )
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    queue_handler = _get_queue_handler(log_file)
+    if queue_handler not in logger.handlers:
+        logger.addHandler(queue_handler)
 
     return logger
 
 
 def log_function_call(func):
     """
-    Fonksiyon çağrılarını loglayan decorator.
+    Fonksiyon çağrılarını loglayan ve ölçüm açıksa süresini, hata durumunu ve döngü içindeki
+    yerini kaydeden decorator.
 
     Args:
         func (callable): Loglanacak fonksiyon.
@@ -67,16 +172,23 @@ def log_function_call(func):
         callable: Decorator wrapper fonksiyonu.
     """
     logger = setup_logger(func.__module__)
+    span_name = func.__qualname__
 
+    @wraps(func)
     def wrapper(*args, **kwargs):
-        logger.debug(f"Çağrılan fonksiyon: {func.__name__}")
+        logger.debug("Çağrılan fonksiyon: %s", func.__name__)
+        span = metrics.start_span(span_name) if metrics.enabled else None
         try:
             result = func(*args, **kwargs)
-            logger.debug(f"Fonksiyon tamamlandı: {func.__name__}")
-            return result
         except Exception as e:
-            logger.error(f"Fonksiyon başarısız: {func.__name__}, Hata: {str(e)}")
+            if span is not None:
+                metrics.end_span(span, failed=True)
+            logger.error("Fonksiyon başarısız: %s, Hata: %s", func.__name__, e)
             raise
+        if span is not None:
+            metrics.end_span(span)
+        logger.debug("Fonksiyon tamamlandı: %s", func.__name__)
+        return result
 
     return wrapper
 
@@ -90,10 +202,12 @@ def custom_print(*args, **kwargs):
         *args: Loglanacak bileşenler.
         **kwargs: Ek parametreler.
     """
-    logger = setup_logger("custom_print")
+    logger = logging.getLogger("custom_print")
+    if not logger.handlers:
+        setup_logger("custom_print")
     message = " ".join(str(arg) for arg in args)
     logger.info(message)
 
 
 # Uygulama çapında kullanılacak ana logger
-app_logger = setup_logger("gold_price_manager")
\ No newline at end of file
+app_logger = setup_logger("gold_price_manager")
@@ -0,0 +1,385 @@
+"""
+Bellek içi veritabanı modülü - DatabaseHandler'ın kullandığı MongoDB işlemlerinin sunucu gerektirmeyen karşılığı.
+
+MONGO_CONNECTION_STRING 'memory://' ile başlıyorsa kullanılır; çevrimdışı çalıştırma ve ölçümler içindir.
+Yalnızca işleyicinin ihtiyaç duyduğu sorgu ve güncelleme işleçleri desteklenir; veriler süreç sonunda kaybolur.
+"""
+import copy
+import threading
+
+from bson import ObjectId
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+MEMORY_SCHEME = 'memory://'
+
+_COMPARISONS = {
+    '$eq': lambda value, operand: value == operand,
+    '$ne': lambda value, operand: value != operand,
+    '$gt': lambda value, operand: value is not None and value > operand,
+    '$gte': lambda value, operand: value is not None and value >= operand,
+    '$lt': lambda value, operand: value is not None and value < operand,
+    '$lte': lambda value, operand: value is not None and value <= operand,
+    '$in': lambda value, operand: value in operand,
+}
+
+
+def _field_values(document, field):
+    """
+    Noktalı alan yolunun değerlerini döndürür; yol üzerindeki dizilerin her öğesine inilir
+    (ör. 'ticks.ts' tüm okumaların zaman damgaları).
+    """
+    values = [document]
+    for part in field.split('.'):
+        next_values = []
+        for value in values:
+            items = value if isinstance(value, list) else [value]
+            next_values.extend(item[part] for item in items if isinstance(item, dict) and part in item)
+        values = next_values
+    return values or [None]
+
+
+def _matches(document, query):
+    """
+    Belgenin eşitlik ve karşılaştırma işleçlerinden oluşan sorguya uyup uymadığını kontrol eder.
+    Dizi değerlerinde MongoDB'deki gibi herhangi bir öğenin koşula uyması yeterlidir; '$ne' için
+    hiçbir öğe eşit olmamalıdır.
+
+    Raises:
+        NotImplementedError: Desteklenmeyen işleç kullanılırsa.
+    """
+    for field, condition in query.items():
+        values = _field_values(document, field)
+        if isinstance(condition, dict) and condition and all(key.startswith('$') for key in condition):
+            for operator, operand in condition.items():
+                if operator not in _COMPARISONS:
+                    raise NotImplementedError(f"Bellek içi veritabanı '{operator}' işlecini desteklemiyor.")
+                if operator == '$ne':
+                    if any(value == operand for value in values):
+                        return False
+                elif not any(_COMPARISONS[operator](value, operand) for value in values):
+                    return False
+        elif condition not in values:
+            return False
+    return True
+
+
+def _project(document, projection):
+    if not projection:
+        return copy.deepcopy(document)
+
+    included = {field for field, flag in projection.items() if flag and field != '_id'}
+    if included:
+        result = {field: copy.deepcopy(document[field]) for field in included if field in document}
+        if projection.get('_id', 1) and '_id' in document:
+            result['_id'] = document['_id']
+        return result
+
+    return {field: copy.deepcopy(value) for field, value in document.items() if projection.get(field, 1)}
+
+
+class UpdateResult:
+    def __init__(self, matched_count=0, modified_count=0, upserted_id=None):
+        self.matched_count = matched_count
+        self.modified_count = modified_count
+        self.upserted_id = upserted_id
+
+
+class BulkWriteResult:
+    def __init__(self, results):
+        self.matched_count = sum(result.matched_count for result in results)
+        self.modified_count = sum(result.modified_count for result in results)
+        self.upserted_count = sum(1 for result in results if result.upserted_id is not None)
+
+
+class _BulkOperations:
+    """
+    pymongo toplu yazma işlemlerinin (_add_to_bulk) eklendiği, işlemleri sırayla toplayan alıcı.
+    İşlemlerin özel alanları okunmaz; her işlem kendisini add_* çağrılarıyla tanımlar.
+    """
+
+    def __init__(self):
+        self.operations = []
+
+    def add_insert(self, document):
+        self.operations.append(('insert_one', (document,), {}))
+
+    def add_replace(self, selector, replacement, upsert=False, **options):
+        self.operations.append(('replace_one', (selector, replacement), {'upsert': upsert}))
+
+    def add_update(self, selector, update, multi=False, upsert=False, **options):
+        if multi:
+            raise NotImplementedError("Bellek içi veritabanı çoklu güncellemeyi desteklemiyor.")
+        self.operations.append(('update_one', (selector, update), {'upsert': upsert}))
+
+    def add_delete(self, selector, limit, **options):
+        raise NotImplementedError("Bellek içi veritabanı toplu silmeyi desteklemiyor.")
+
+
+class MemoryCursor:
+    """
+    find() sonucunu sıralama ve sınırlamayla döndüren imleç.
+    """
+
+    def __init__(self, documents, projection):
+        self._documents = documents
+        self._projection = projection
+        self._sort = []
+        self._limit = 0
+
+    def sort(self, key, direction=1):
+        self._sort = key if isinstance(key, list) else [(key, direction)]
+        return self
+
+    def limit(self, count):
+        self._limit = count
+        return self
+
+    def batch_size(self, _):
+        return self
+
+    def __iter__(self):
+        documents = self._documents
+        # Çok alanlı sıralama son anahtardan başlayarak kararlı sıralamayla yapılır;
+        # None değerler MongoDB'deki gibi en küçük sayılır
+        for field, direction in reversed(self._sort):
+            documents = sorted(documents, key=lambda document: (document.get(field) is not None, document.get(field)),
+                               reverse=direction < 0)
+        if self._limit:
+            documents = documents[:self._limit]
+        return (_project(document, self._projection) for document in documents)
+
+
+class MemoryCollection:
+    """
+    Belgeleri eklenme sırasıyla listede tutan koleksiyon.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.indexes = {}
+        self._documents = []
+        self._lock = threading.RLock()
+
+    def create_index(self, keys, name=None, **options):
+        """
+        İndeksi kaydeder; sorgular tam tarama yapar. Tekil indekslerin kısıtı yazmalarda uygulanır.
+
+        Raises:
+            DuplicateKeyError: Tekil indeks mevcut mükerrer belgeler üzerinde oluşturulursa.
+        """
+        index_name = name or '_'.join(f"{field}_{direction}" for field, direction in keys)
+        with self._lock:
+            if options.get('unique'):
+                seen = []
+                for document in self._documents:
+                    key = self._index_key(document, keys)
+                    if key in seen:
+                        raise self._duplicate_key_error(index_name, keys, key)
+                    seen.append(key)
+            self.indexes[index_name] = {'key': keys, **options}
+        return index_name
+
+    @staticmethod
+    def _index_key(document, keys):
+        # Eksik alanlar MongoDB'deki gibi null sayılır
+        return [_field_values(document, field)[0] for field, _ in keys]
+
+    def _duplicate_key_error(self, index_name, keys, key):
+        duplicate = {field: value for (field, _), value in zip(keys, key)}
+        return DuplicateKeyError(f"E11000 duplicate key error collection: {self.name} index: {index_name} "
+                                 f"dup key: {duplicate}", code=11000)
+
+    def _check_unique(self, document, replacing=None):
+        """
+        Belgenin tekil indeksleri ihlal etmediğini kontrol eder.
+
+        Args:
+            document (dict): Yazılacak belge.
+            replacing (dict, optional): Yerine yazılan belge; karşılaştırmaya katılmaz.
+
+        Raises:
+            DuplicateKeyError: Aynı anahtarlı başka bir belge varsa.
+        """
+        for index_name, index in self.indexes.items():
+            if not index.get('unique'):
+                continue
+            key = self._index_key(document, index['key'])
+            for other in self._documents:
+                if other is not replacing and self._index_key(other, index['key']) == key:
+                    raise self._duplicate_key_error(index_name, index['key'], key)
+
+    def _find_position(self, query):
+        for position, document in enumerate(self._documents):
+            if _matches(document, query):
+                return position
+        return None
+
+    def index_information(self):
+        return dict(self.indexes)
+
+    def _find_documents(self, query):
+        return [document for document in self._documents if _matches(document, query or {})]
+
+    def find(self, query=None, projection=None):
+        with self._lock:
+            return MemoryCursor(self._find_documents(query), projection)
+
+    def find_one(self, query=None, projection=None, sort=None):
+        cursor = self.find(query, projection)
+        if sort:
+            cursor.sort(sort)
+        return next(iter(cursor.limit(1)), None)
+
+    def count_documents(self, query):
+        with self._lock:
+            return len(self._find_documents(query))
+
+    def insert_one(self, document):
+        with self._lock:
+            document = copy.deepcopy(document)
+            document.setdefault('_id', ObjectId())
+            self._check_unique(document)
+            self._documents.append(document)
+        return UpdateResult(upserted_id=document['_id'])
+
+    @staticmethod
+    def _seed(query):
+        # Upsert ile oluşan belgeye sorgudaki eşitlik alanları eklenir
+        return {field: copy.deepcopy(value) for field, value in query.items()
+                if not isinstance(value, dict) and '.' not in field}
+
+    def replace_one(self, query, replacement, upsert=False):
+        with self._lock:
+            position = self._find_position(query)
+            if position is not None:
+                document = self._documents[position]
+                new_document = copy.deepcopy(replacement)
+                new_document['_id'] = document['_id']
+                self._check_unique(new_document, replacing=document)
+                self._documents[position] = new_document
+                return UpdateResult(1, int(new_document != document))
+
+            if not upsert:
+                return UpdateResult()
+            new_document = {**self._seed(query), **copy.deepcopy(replacement)}
+            new_document.setdefault('_id', ObjectId())
+            self._check_unique(new_document)
+            self._documents.append(new_document)
+            return UpdateResult(upserted_id=new_document['_id'])
+
+    @staticmethod
+    def _apply_update(document, update, inserting):
+        for operator, fields in update.items():
+            for field, operand in fields.items():
+                if operator == '$set':
+                    document[field] = copy.deepcopy(operand)
+                elif operator == '$setOnInsert':
+                    if inserting:
+                        document[field] = copy.deepcopy(operand)
+                elif operator == '$inc':
+                    document[field] = document.get(field, 0) + operand
+                elif operator == '$push':
+                    document.setdefault(field, []).append(copy.deepcopy(operand))
+                elif operator == '$min':
+                    document[field] = operand if field not in document else min(document[field], operand)
+                elif operator == '$max':
+                    document[field] = operand if field not in document else max(document[field], operand)
+                else:
+                    raise NotImplementedError(f"Bellek içi veritabanı '{operator}' işlecini desteklemiyor.")
+
+    def update_one(self, query, update, upsert=False):
+        with self._lock:
+            position = self._find_position(query)
+            if position is not None:
+                document = self._documents[position]
+                updated = copy.deepcopy(document)
+                self._apply_update(updated, update, inserting=False)
+                self._check_unique(updated, replacing=document)
+                self._documents[position] = updated
+                return UpdateResult(1, int(updated != document))
+
+            if not upsert:
+                return UpdateResult()
+            document = self._seed(query)
+            self._apply_update(document, update, inserting=True)
+            document.setdefault('_id', ObjectId())
+            self._check_unique(document)
+            self._documents.append(document)
+            return UpdateResult(upserted_id=document['_id'])
+
+    def bulk_write(self, operations, ordered=True):
+        """
+        pymongo işlemlerini (InsertOne, ReplaceOne, UpdateOne) sırayla uygular.
+
+        Raises:
+            BulkWriteError: Bir işlem tekil indeksi ihlal ederse. Sıralı yazmada ilk hatada durulur,
+                sırasızda kalan işlemler uygulanır.
+        """
+        bulk = _BulkOperations()
+        for operation in operations:
+            operation._add_to_bulk(bulk)
+
+        results = []
+        write_errors = []
+        for position, (method, args, kwargs) in enumerate(bulk.operations):
+            try:
+                results.append(getattr(self, method)(*args, **kwargs))
+            except DuplicateKeyError as e:
+                write_errors.append({'index': position, 'code': e.code, 'errmsg': str(e)})
+                if ordered:
+                    break
+
+        result = BulkWriteResult(results)
+        if write_errors:
+            raise BulkWriteError({
+                'writeErrors': write_errors, 'writeConcernErrors': [], 'upserted': [],
+                'nInserted': 0, 'nUpserted': result.upserted_count,
+                'nMatched': result.matched_count, 'nModified': result.modified_count, 'nRemoved': 0,
+            })
+        return result
+
+
+class MemoryDatabase:
+    def __init__(self, name):
+        self.name = name
+        self._collections = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name):
+        collection = self._collections.get(name)
+        if collection is None:
+            with self._lock:
+                collection = self._collections.setdefault(name, MemoryCollection(name))
+        return collection
+
+    def list_collection_names(self):
+        return list(self._collections)
+
+
+class _Admin:
+    @staticmethod
+    def command(name):
+        return {'ok': 1.0}
+
+
+class MemoryClient:
+    """
+    MongoClient yerine kullanılan, veritabanlarını bellekte tutan istemci.
+    """
+
+    def __init__(self, connection_string=MEMORY_SCHEME):
+        self.connection_string = connection_string
+        self.admin = _Admin()
+        self._databases = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name):
+        database = self._databases.get(name)
+        if database is None:
+            with self._lock:
+                database = self._databases.setdefault(name, MemoryDatabase(name))
+        return database
+
+    def close(self):
+        # Veriler süreç boyunca korunur; yeni istemci aynı bağlantı dizesiyle boş başlar
+        pass
@@ -0,0 +1,349 @@
+"""
+Ölçüm modülü - log_function_call ile sarılan fonksiyonların süre histogramlarını, çağrı ve hata
+sayılarını ve döngü başına iç içe süre ağacını tutar.
+
+Etkin döngü bağlama (contextvars) özgüdür: zamanlayıcıda eşzamanlı çalışan her iş kendi döngü ağacını
+oluşturur; bağlamı kopyalanarak başlatılan iş parçacıklarının aralıkları da o döngüye eklenir.
+
+Ölçüm kapalıyken (config.METRICS_ENABLED) sarmalayıcı yalnızca tek bir bayrak kontrolü yapar.
+"""
+import bisect
+import contextvars
+import json
+import os
+import threading
+import time
+
+import config
+
+# Histogram kova üst sınırları (saniye)
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+METRIC_PREFIX = 'gold_price'
+
+
+class FunctionStats:
+    """
+    Bir fonksiyonun toplam çağrı, hata ve süre histogramı.
+    """
+
+    __slots__ = ('calls', 'errors', 'seconds', 'max_seconds', 'buckets')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        # Son kova DURATION_BUCKETS'ın üzerindeki (+Inf) süreler içindir
+        self.buckets = [0] * (len(DURATION_BUCKETS) + 1)
+
+    def observe(self, seconds, failed):
+        self.calls += 1
+        self.errors += failed
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.buckets[bisect.bisect_left(DURATION_BUCKETS, seconds)] += 1
+
+    def quantile(self, q):
+        """
+        Histogramdan yaklaşık yüzdelik değeri (ilgili kovanın üst sınırı) döndürür.
+
+        Args:
+            q (float): 0-1 arası yüzdelik.
+
+        Returns:
+            float or None: Saniye cinsinden üst sınır; çağrı yoksa None.
+        """
+        if not self.calls:
+            return None
+        target = q * self.calls
+        cumulative = 0
+        for position, count in enumerate(self.buckets):
+            cumulative += count
+            if cumulative >= target:
+                return DURATION_BUCKETS[position] if position < len(DURATION_BUCKETS) else self.max_seconds
+        return self.max_seconds
+
+    def to_dict(self):
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'total_ms': self.seconds * 1000,
+            'mean_ms': self.seconds / self.calls * 1000 if self.calls else 0.0,
+            'max_ms': self.max_seconds * 1000,
+            'p50_ms': (self.quantile(0.5) or 0.0) * 1000,
+            'p95_ms': (self.quantile(0.95) or 0.0) * 1000,
+        }
+
+
+class SpanNode:
+    """
+    Döngü süre ağacında bir düğüm; aynı ebeveyn altında aynı adlı çağrılar birleştirilir.
+    """
+
+    __slots__ = ('name', 'calls', 'errors', 'seconds', 'children')
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.children = {}
+
+    def child(self, name):
+        node = self.children.get(name)
+        if node is None:
+            node = self.children.setdefault(name, SpanNode(name))
+        return node
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'calls': self.calls,
+            'errors': self.errors,
+            'total_ms': self.seconds * 1000,
+            'children': [child.to_dict() for child in self.children.values()]
+        }
+
+
+class MetricsRegistry:
+    """
+    Süreç genelinde fonksiyon istatistiklerini ve etkin döngünün süre ağacını tutan kayıt.
+    """
+
+    def __init__(self, enabled=False):
+        """
+        Args:
+            enabled (bool): Ölçüm açık mı.
+        """
+        self.enabled = enabled
+        self.functions = {}
+        self.last_cycle = None
+        self.last_cycles = {}  # Kök adı -> o addaki son tamamlanan döngü
+        self.collectors = {}
+        self._cycle = contextvars.ContextVar(f"metrics_cycle_{id(self)}", default=None)  # (kök, başlangıç)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._dump_lock = threading.Lock()
+
+    @property
+    def cycle(self):
+        """
+        Returns:
+            SpanNode or None: Geçerli bağlamdaki etkin döngünün kökü.
+        """
+        active = self._cycle.get()
+        return active[0] if active else None
+
+    def register_collector(self, name, func):
+        """
+        Dışa aktarımda okunacak bir durum kaynağı kaydeder (ör. devre kesiciler).
+
+        Args:
+            name (str): Ölçüm adı.
+            func (callable): {etiket: {alan: değer}} sözlüğü döndüren fonksiyon; Prometheus
+                çıktısına yalnızca sayısal alanlar yazılır.
+        """
+        self.collectors[name] = func
+
+    def start_span(self, name):
+        """
+        Bir ölçüm aralığı başlatır. Aynı iş parçacığındaki açık aralığın altına, yoksa geçerli bağlamdaki
+        etkin döngünün köküne eklenir (bağlamı kopyalanan paralel çekim iş parçacıkları dahil).
+
+        Args:
+            name (str): Aralık (fonksiyon) adı.
+
+        Returns:
+            tuple: end_span'e verilecek belirteç.
+        """
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+
+        parent = stack[-1][1] if stack else self.cycle
+        node = None
+        if parent is not None:
+            with self._lock:
+                node = parent.child(name)
+
+        token = (name, node, time.perf_counter())
+        stack.append(token)
+        return token
+
+    def end_span(self, token, failed=False):
+        """
+        Aralığı kapatır; süreyi histograma ve döngü ağacına işler.
+
+        Args:
+            token (tuple): start_span'in döndürdüğü belirteç.
+            failed (bool): Çağrı hatayla bittiyse True.
+        """
+        name, node, started = token
+        seconds = time.perf_counter() - started
+        self._local.stack.pop()
+
+        with self._lock:
+            stats = self.functions.get(name)
+            if stats is None:
+                stats = self.functions[name] = FunctionStats()
+            stats.observe(seconds, failed)
+            if node is not None:
+                node.calls += 1
+                node.errors += failed
+                node.seconds += seconds
+
+    def start_cycle(self, name='cycle'):
+        """
+        Geçerli bağlamda yeni bir döngü süre ağacı başlatır.
+
+        Args:
+            name (str): Kök düğüm adı.
+        """
+        self._cycle.set((SpanNode(name), time.perf_counter()))
+
+    def end_cycle(self, failed=False):
+        """
+        Geçerli bağlamdaki etkin döngüyü kapatır.
+
+        Args:
+            failed (bool): Döngü başarısız olduysa True.
+
+        Returns:
+            SpanNode or None: Tamamlanan döngünün kök düğümü.
+        """
+        active = self._cycle.get()
+        if active is None:
+            return None
+        self._cycle.set(None)
+
+        cycle, started = active
+        with self._lock:
+            cycle.calls = 1
+            cycle.errors = int(failed)
+            cycle.seconds = time.perf_counter() - started
+            self.last_cycle = self.last_cycles[cycle.name] = cycle
+        return cycle
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: Fonksiyon istatistikleri, son döngünün ve kök adı başına son döngülerin süre ağaçları.
+        """
+        with self._lock:
+            result = {
+                'functions': {name: stats.to_dict() for name, stats in sorted(self.functions.items())},
+                'last_cycle': self.last_cycle.to_dict() if self.last_cycle else None,
+                'cycles': {name: cycle.to_dict() for name, cycle in sorted(self.last_cycles.items())}
+            }
+        for name, func in self.collectors.items():
+            result[name] = func()
+        return result
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self):
+        """
+        Returns:
+            str: Prometheus metin biçiminde ölçümler.
+        """
+        lines = [
+            f'# HELP {METRIC_PREFIX}_function_duration_seconds Fonksiyon çağrı süreleri',
+            f'# TYPE {METRIC_PREFIX}_function_duration_seconds histogram',
+        ]
+        with self._lock:
+            functions = sorted(self.functions.items())
+            for name, stats in functions:
+                cumulative = 0
+                for bound, count in zip(DURATION_BUCKETS + ('+Inf',), stats.buckets):
+                    cumulative += count
+                    lines.append(f'{METRIC_PREFIX}_function_duration_seconds_bucket'
+                                 f'{{function="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'{METRIC_PREFIX}_function_duration_seconds_sum{{function="{name}"}} {stats.seconds}')
+                lines.append(f'{METRIC_PREFIX}_function_duration_seconds_count{{function="{name}"}} {stats.calls}')
+
+            lines.append(f'# HELP {METRIC_PREFIX}_function_errors_total Hatayla biten çağrılar')
+            lines.append(f'# TYPE {METRIC_PREFIX}_function_errors_total counter')
+            for name, stats in functions:
+                lines.append(f'{METRIC_PREFIX}_function_errors_total{{function="{name}"}} {stats.errors}')
+
+            if self.last_cycles:
+                lines.append(f'# HELP {METRIC_PREFIX}_cycle_span_seconds Son döngüdeki iç içe aralık süreleri')
+                lines.append(f'# TYPE {METRIC_PREFIX}_cycle_span_seconds gauge')
+                pending = [(name, cycle) for name, cycle in sorted(self.last_cycles.items())]
+                while pending:
+                    path, node = pending.pop(0)
+                    lines.append(f'{METRIC_PREFIX}_cycle_span_seconds{{path="{path}"}} {node.seconds}')
+                    pending.extend((f'{path}/{child.name}', child) for child in node.children.values())
+
+        for name, func in self.collectors.items():
+            for label, fields in sorted(func().items()):
+                for field, value in fields.items():
+                    if isinstance(value, (int, float)) and not isinstance(value, bool):
+                        lines.append(f'{METRIC_PREFIX}_{name}_{field}{{name="{label}"}} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, path=None, output_format=None):
+        """
+        Ölçümleri dosyaya yazar (dosya atomik olarak değiştirilir). Eşzamanlı çağrılar sırayla yazar;
+        her yazma kendi geçici dosyasını kullanır.
+
+        Args:
+            path (str, optional): Hedef dosya. Varsayılan: config.METRICS_FILE.
+            output_format (str, optional): 'json' veya 'prometheus'. Varsayılan: config.METRICS_FORMAT.
+
+        Returns:
+            str or None: Yazılan dosya yolu; hedef yoksa None.
+        """
+        path = path or config.METRICS_FILE
+        if not path:
+            return None
+
+        output_format = output_format or config.METRICS_FORMAT
+        temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._dump_lock:
+            content = self.to_prometheus() if output_format == 'prometheus' else self.to_json()
+            with open(temporary_path, 'w', encoding='utf-8') as metrics_file:
+                metrics_file.write(content)
+            os.replace(temporary_path, path)
+        return path
+
+    def reset(self):
+        """
+        Tüm istatistikleri sıfırlar.
+        """
+        with self._lock:
+            self.functions.clear()
+            self.last_cycle = None
+            self.last_cycles.clear()
+        self._cycle.set(None)
+
+
+def summarize_cycle(cycle, limit=5):
+    """
+    Döngü ağacındaki en uzun süren fonksiyonları (alt çağrılar dahil) tek satırlık özete çevirir.
+
+    Args:
+        cycle (SpanNode): Döngü kökü.
+        limit (int): Özete girecek fonksiyon sayısı.
+
+    Returns:
+        str: 'toplam=..., ad=süre, ...' biçiminde özet.
+    """
+    totals = {}
+    pending = list(cycle.children.values())
+    while pending:
+        node = pending.pop()
+        totals[node.name] = totals.get(node.name, 0.0) + node.seconds
+        pending.extend(node.children.values())
+
+    slowest = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:limit]
+    parts = [f"toplam={cycle.seconds * 1000:.0f}ms"]
+    parts.extend(f"{name}={seconds * 1000:.0f}ms" for name, seconds in slowest)
+    return ", ".join(parts)
+
+
+# Süreç genelinde kullanılan kayıt
+registry = MetricsRegistry(enabled=config.METRICS_ENABLED)
@@ -0,0 +1,338 @@
+"""
+Ham sayfa arşivi modülü - Kaynaklardan çekilen sayfaları sıkıştırılmış ve içerik adresli olarak saklar.
+
+Dizin yapısı:
+    objects/<sha256[:2]>/<sha256>.zst|.gz   Sayfa içeriği (aynı içerik bir kez yazılır)
+    index/<kaynak>/<YYYY-MM-DD>.jsonl       Çekim başına bir satır (UTC zaman sırasıyla)
+
+Yazma işlemleri arka plandaki tek bir iş parçacığında yapılır; toplama döngüsü yalnızca kuyruğa ekler.
+Kuyruk doluysa sayfa beklemeden atlanır. zstd sıkıştırması isteğe bağlı 'zstandard' paketiyle yapılır;
+paket kurulu değilse gzip kullanılır.
+"""
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import queue
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import config
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+_EXTENSIONS = {'zstd': '.zst', 'gzip': '.gz'}
+_UNSAFE_NAME = re.compile(r'[^A-Za-z0-9_.-]')
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def resolve_codec(codec):
+    """
+    İstenen sıkıştırma biçimini kullanılabilir olanla eşleştirir.
+
+    Args:
+        codec (str): 'zstd' veya 'gzip'.
+
+    Returns:
+        str: Kullanılacak biçim; zstandard kurulu değilse 'gzip'.
+
+    Raises:
+        ValueError: Biçim tanınmıyorsa.
+    """
+    if codec not in _EXTENSIONS:
+        raise ValueError(f"Geçersiz arşiv sıkıştırma biçimi: '{codec}' (zstd veya gzip)")
+    if codec == 'zstd' and _zstandard() is None:
+        logger.warning("'zstandard' paketi kurulu değil, sayfa arşivi gzip ile sıkıştırılacak.")
+        return 'gzip'
+    return codec
+
+
+class PageArchive:
+    """
+    Sayfaları SHA-256 özetine göre tekilleştirip kaynak ve gün bazında dizinleyen arşiv.
+    """
+
+    def __init__(self, directory=None, codec=None, level=None, queue_size=None):
+        """
+        Args:
+            directory (str, optional): Arşiv dizini. Varsayılan: config.PAGE_ARCHIVE_DIR.
+            codec (str, optional): 'zstd' veya 'gzip'. Varsayılan: config.PAGE_ARCHIVE_CODEC.
+            level (int, optional): Sıkıştırma düzeyi. Varsayılan: config.PAGE_ARCHIVE_LEVEL.
+            queue_size (int, optional): Yazılmayı bekleyen en fazla sayfa. Varsayılan: config.PAGE_ARCHIVE_QUEUE_SIZE.
+        """
+        self.directory = Path(directory or config.PAGE_ARCHIVE_DIR)
+        self.codec = resolve_codec(codec or config.PAGE_ARCHIVE_CODEC)
+        self.level = config.PAGE_ARCHIVE_LEVEL if level is None else level
+        self.dropped = 0
+        self._saturated = False
+        self._queue = queue.Queue(maxsize=queue_size or config.PAGE_ARCHIVE_QUEUE_SIZE)
+        self._writer = None
+        self._writer_lock = threading.Lock()
+
+    # Yazma tarafı
+
+    def submit(self, source, content, fetched_at=None, url=None, status_code=None, complete=True):
+        """
+        Sayfayı arka planda arşivlenmek üzere kuyruğa ekler; hiçbir zaman beklemez.
+
+        Args:
+            source (str): Kaynak adı.
+            content (bytes): Ham sayfa içeriği.
+            fetched_at (datetime, optional): Çekim zamanı (UTC). Varsayılan: şimdi.
+            url (str, optional): Sayfanın adresi.
+            status_code (int, optional): HTTP durum kodu.
+            complete (bool): Sayfanın tamamı okunduysa True (akış modunda tablo sonrası okunmaz).
+
+        Returns:
+            bool: Kuyruğa eklendiyse True, kuyruk dolu olduğu için atlandıysa False.
+        """
+        if not content:
+            return False
+
+        self._ensure_writer()
+        entry = {
+            'source': source,
+            'ts': fetched_at or datetime.now(timezone.utc),
+            'url': url,
+            'status': status_code,
+            'complete': complete,
+        }
+        try:
+            self._queue.put_nowait((entry, bytes(content)))
+        except queue.Full:
+            self.dropped += 1
+            # Kuyruk dolu kaldığı sürece yalnızca ilk atlama loglanır
+            if not self._saturated:
+                self._saturated = True
+                logger.warning(f"[{source}] Sayfa arşivi kuyruğu dolu, sayfalar arşivlenmeden atlanıyor "
+                               f"(toplam {self.dropped}).")
+            return False
+        self._saturated = False
+        return True
+
+    def _ensure_writer(self):
+        if self._writer is not None and self._writer.is_alive():
+            return
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._run, name='page-archive-writer', daemon=True)
+                self._writer.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self.write(*item)
+            except Exception as e:
+                logger.error(f"Sayfa arşive yazılamadı: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """
+        Kuyruktaki tüm sayfalar yazılana kadar bekler.
+        """
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.join()
+
+    def close(self, timeout=10):
+        """
+        Kuyruktaki sayfaları yazar ve arka plan iş parçacığını durdurur.
+
+        Args:
+            timeout (float): Beklenecek en uzun süre (saniye).
+        """
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join(timeout)
+
+    def write(self, entry, content):
+        """
+        Sayfayı eşzamanlı olarak yazar: içerik yoksa nesne olarak, her durumda dizine bir satır olarak.
+
+        Args:
+            entry (dict): {'source', 'ts', 'url', 'status', 'complete'} bilgileri.
+            content (bytes): Ham sayfa içeriği.
+
+        Returns:
+            dict: Dizine yazılan satır.
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        stored = self._store_object(digest, content)
+
+        timestamp = entry['ts'].astimezone(timezone.utc)
+        record = {
+            'ts': timestamp.isoformat(),
+            'sha256': digest,
+            'size': len(content),
+            'url': entry.get('url'),
+            'status': entry.get('status'),
+            'complete': entry.get('complete', True),
+        }
+        index_path = self._index_path(entry['source'], timestamp.strftime(config.DATE_FORMAT))
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(index_path, 'a', encoding='utf-8') as index_file:
+            index_file.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+        logger.debug("[%s] Sayfa arşivlendi: %s (%d byte, %s)", entry['source'], digest[:12], len(content),
+                     'yeni' if stored else 'mevcut')
+        return record
+
+    def _object_path(self, digest, codec):
+        return self.directory / 'objects' / digest[:2] / f"{digest}{_EXTENSIONS[codec]}"
+
+    def _index_path(self, source, date):
+        return self.directory / 'index' / _UNSAFE_NAME.sub('_', source) / f"{date}.jsonl"
+
+    def _store_object(self, digest, content):
+        # Aynı içerik herhangi bir biçimde zaten varsa yeniden sıkıştırılmaz
+        if any(self._object_path(digest, codec).exists() for codec in _EXTENSIONS):
+            return False
+
+        if self.codec == 'zstd':
+            compressed = _zstandard().ZstdCompressor(level=self.level).compress(content)
+        else:
+            compressed = gzip.compress(content, compresslevel=min(self.level, 9), mtime=0)
+
+        path = self._object_path(digest, self.codec)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(temporary_path, 'wb') as object_file:
+            object_file.write(compressed)
+        os.replace(temporary_path, path)
+        return True
+
+    # Okuma tarafı
+
+    def read_object(self, digest):
+        """
+        İçerik özetine göre sayfayı açar.
+
+        Args:
+            digest (str): SHA-256 özeti.
+
+        Returns:
+            bytes: Ham sayfa içeriği.
+
+        Raises:
+            FileNotFoundError: Nesne arşivde yoksa.
+        """
+        for codec in _EXTENSIONS:
+            path = self._object_path(digest, codec)
+            if path.exists():
+                data = path.read_bytes()
+                if codec == 'gzip':
+                    return gzip.decompress(data)
+                zstandard = _zstandard()
+                if zstandard is None:
+                    raise ImportError("zstd ile sıkıştırılmış sayfayı açmak için 'zstandard' paketi gerekli.")
+                return zstandard.ZstdDecompressor().decompress(data)
+        raise FileNotFoundError(f"Arşivde '{digest}' özetli sayfa bulunamadı.")
+
+    def sources(self):
+        """
+        Returns:
+            list: Arşivde dizini bulunan kaynak adları.
+        """
+        index_dir = self.directory / 'index'
+        return sorted(path.name for path in index_dir.iterdir() if path.is_dir()) if index_dir.exists() else []
+
+    def iter_entries(self, source, start, end):
+        """
+        Kaynağın verilen zaman aralığındaki çekimlerini sırayla döndürür; yalnızca aralıktaki günlerin
+        dizin dosyaları okunur.
+
+        Args:
+            source (str): Kaynak adı.
+            start (datetime): Başlangıç (dahil, UTC).
+            end (datetime): Bitiş (hariç, UTC).
+
+        Yields:
+            dict: Dizin satırı ('ts' datetime olarak).
+        """
+        start, end = start.astimezone(timezone.utc), end.astimezone(timezone.utc)
+        day = start.date()
+        while day <= end.date():
+            index_path = self._index_path(source, day.strftime(config.DATE_FORMAT))
+            if index_path.exists():
+                with open(index_path, encoding='utf-8') as index_file:
+                    for line in index_file:
+                        if not line.strip():
+                            continue
+                        record = json.loads(line)
+                        record['ts'] = datetime.fromisoformat(record['ts'])
+                        if start <= record['ts'] < end:
+                            yield record
+            day += timedelta(days=1)
+
+    def iter_pages(self, source, start, end):
+        """
+        Kaynağın verilen zaman aralığındaki sayfalarını içerikleriyle döndürür; yeniden işleme içindir.
+
+        Args:
+            source (str): Kaynak adı.
+            start (datetime): Başlangıç (dahil, UTC).
+            end (datetime): Bitiş (hariç, UTC).
+
+        Yields:
+            tuple: (dizin_satırı, ham_içerik) çifti.
+        """
+        for record in self.iter_entries(source, start, end):
+            yield record, self.read_object(record['sha256'])
+
+
+def get_archive():
+    """
+    Süreç genelinde paylaşılan arşivi döndürür; kapanışta kuyruktaki sayfalar yazılır.
+
+    Returns:
+        PageArchive: Arşiv.
+    """
+    global _archive
+    if _archive is None:
+        with _archive_lock:
+            if _archive is None:
+                _archive = PageArchive()
+                atexit.register(_archive.close)
+    return _archive
+
+
+def archive_page(source, raw_data):
+    """
+    fetch_data sonucundaki ham içeriği arşiv kuyruğuna ekler. İçeriği olmayan (ör. 304) yanıtlar atlanır;
+    arşivleme hataları yalnızca loglanır.
+
+    Args:
+        source (str): Kaynak adı.
+        raw_data: fetch_data tarafından döndürülen ham veri ('content' özniteliği olmalı).
+    """
+    content = getattr(raw_data, 'content', None)
+    if not content:
+        return
+    try:
+        get_archive().submit(
+            source,
+            content,
+            url=getattr(raw_data, 'source_url', None),
+            status_code=getattr(raw_data, 'status_code', None),
+            # Akış modunda tablo bitince okuma bırakılır; arşivlenen sayfa o durumda eksiktir
+            complete=not getattr(raw_data, 'stopped_early', False),
+        )
+    except Exception as e:
+        logger.warning(f"[{source}] Sayfa arşive eklenemedi: {str(e)}")
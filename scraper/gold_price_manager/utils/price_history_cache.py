@@ -0,0 +1,310 @@
+"""
+Fiyat geçmişi önbelleği modülü - Tüm fiyat geçmişini bellek eşlemli, sütunlu bir dosyada yerel olarak tutar.
+"""
+import json
+import os
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+
+import config
+from models.price_matrix import PRICE_FIELDS, PriceMatrix
+from utils.logger import setup_logger, log_function_call
+
+logger = setup_logger(__name__)
+
+META_FILE = 'meta.json'
+DATA_FILE_PATTERN = re.compile(r'prices(?:-(\d+))?\.f64$')
+CACHE_VERSION = 2
+
+# Eşitlemede 'updated_at' karşılaştırmasına eklenen pay: süreçler arası saat farkı ve eşitleme
+# sırasında tamamlanan yazmalar kaçırılmaz (bu aralıktaki günler yeniden okunur)
+SYNC_OVERLAP = timedelta(minutes=10)
+
+# Süreç içi yazma kilidi (önbelleğe tek süreç yazar)
+_write_lock = threading.Lock()
+
+
+class PriceHistoryCache:
+    """
+    Fiyat geçmişini (tarih, altın türü, alış/satış) boyutlu float64 dizisi olarak diskte tutan önbellek.
+
+    Veri dosyası kapasiteli olarak ayrılır ve numpy.memmap ile açılır; okuma tarafı kopyasız görünüm alır.
+    Tarih ve altın türü dizinleri meta.json dosyasındadır ve veri yazıldıktan sonra atomik olarak değiştirilir.
+    Büyütme her seferinde yeni sürüm numaralı bir veri dosyasına yapılır; yeni dosya yalnızca ona işaret eden
+    meta.json yazıldığında yayınlanır, böylece yarıda kalan büyütme yayınlanmış dosyanın şeklini bozmaz.
+    """
+
+    def __init__(self, directory=None):
+        """
+        Args:
+            directory (str, optional): Önbellek dizini. Varsayılan: config.PRICE_CACHE_DIR.
+        """
+        self.directory = Path(directory or config.PRICE_CACHE_DIR)
+        self.meta_path = self.directory / META_FILE
+
+    def _read_meta(self):
+        """
+        Returns:
+            dict or None: Meta bilgisi; önbellek yoksa veya sürümü farklıysa None.
+        """
+        if not self.meta_path.exists():
+            return None
+        with open(self.meta_path, encoding='utf-8') as meta_file:
+            meta = json.load(meta_file)
+        if meta.get('version') != CACHE_VERSION:
+            logger.warning("Fiyat önbelleği sürümü farklı, yeniden oluşturulması gerekiyor.")
+            return None
+        if not (self.directory / meta['data_file']).exists():
+            logger.warning(f"Fiyat önbelleği veri dosyası bulunamadı: {meta['data_file']}")
+            return None
+        return meta
+
+    def _write_meta(self, meta):
+        """
+        Meta bilgisini atomik olarak yazar (veri dosyasını yayınlar) ve artık kullanılmayan veri dosyalarını siler.
+        """
+        temporary_path = self.meta_path.with_suffix('.tmp')
+        with open(temporary_path, 'w', encoding='utf-8') as meta_file:
+            json.dump(meta, meta_file, ensure_ascii=False)
+        os.replace(temporary_path, self.meta_path)
+
+        for path in self.directory.iterdir():
+            if DATA_FILE_PATTERN.match(path.name) and path.name != meta['data_file']:
+                try:
+                    path.unlink()
+                except OSError as e:
+                    # Örn. dosya başka bir süreçte açık; sonraki yazmada yeniden denenir
+                    logger.debug("Eski önbellek veri dosyası silinemedi: %s (%s)", path.name, e)
+
+    def _open_data(self, meta, mode):
+        """
+        Meta bilgisinin işaret ettiği veri dosyasını açar.
+
+        Raises:
+            ValueError: Dosya boyutu meta bilgisindeki kapasiteyle uyuşmuyorsa.
+        """
+        shape = (meta['capacity'], meta['type_capacity'], len(PRICE_FIELDS))
+        path = self.directory / meta['data_file']
+        expected_size = int(np.prod(shape)) * np.dtype(np.float64).itemsize
+        if path.stat().st_size != expected_size:
+            raise ValueError(f"Fiyat önbelleği veri dosyası meta bilgisiyle uyuşmuyor: {meta['data_file']}")
+        return np.memmap(path, dtype=np.float64, mode=mode, shape=shape)
+
+    def _next_data_file(self):
+        generations = [int(match.group(1) or 0) for match in map(DATA_FILE_PATTERN.match, os.listdir(self.directory))
+                       if match]
+        return f"prices-{max(generations, default=0) + 1}.f64"
+
+    def _allocate(self, meta, capacity, type_capacity, old_data=None, old_shape=(0, 0), insert_at=None):
+        """
+        Veri dosyasını yeni kapasiteyle yeni sürüm numaralı dosyada ayırır ve mevcut satırları kopyalar.
+        Meta bilgisi yalnızca bellekte güncellenir; yeni dosya çağıran taraf meta bilgisini yazınca yayınlanır.
+
+        Args:
+            meta (dict): Meta bilgisi.
+            capacity (int): Yeni tarih kapasitesi.
+            type_capacity (int): Yeni altın türü kapasitesi.
+            old_data (numpy.memmap, optional): Kopyalanacak mevcut veri.
+            old_shape (tuple): Mevcut verideki (tarih, altın türü) sayıları.
+            insert_at (int, optional): Boş bırakılacak satır; sonraki satırlar bir aşağı kaydırılır.
+        """
+        data_file = self._next_data_file()
+        data = np.memmap(self.directory / data_file, dtype=np.float64, mode='w+',
+                         shape=(capacity, type_capacity, len(PRICE_FIELDS)))
+        data[:] = np.nan
+        rows, types = old_shape
+        if old_data is not None and rows:
+            if insert_at is None or insert_at >= rows:
+                data[:rows, :types] = old_data[:rows, :types]
+            else:
+                data[:insert_at, :types] = old_data[:insert_at, :types]
+                data[insert_at + 1:rows + 1, :types] = old_data[insert_at:rows, :types]
+        data.flush()
+        del data
+
+        meta['data_file'] = data_file
+        meta['capacity'] = capacity
+        meta['type_capacity'] = type_capacity
+
+    def load_matrix(self, start_date=None, end_date=None):
+        """
+        Önbelleği salt okunur açar ve istenen tarih aralığını kopyasız matris olarak döndürür.
+
+        Args:
+            start_date (str, optional): Başlangıç tarihi (dahil).
+            end_date (str, optional): Bitiş tarihi (dahil).
+
+        Returns:
+            PriceMatrix or None: Matris; önbellek yoksa None.
+        """
+        meta = self._read_meta()
+        if meta is None:
+            return None
+
+        dates = meta['dates']
+        first = np.searchsorted(dates, start_date, side='left') if start_date else 0
+        last = np.searchsorted(dates, end_date, side='right') if end_date else len(dates)
+
+        data = self._open_data(meta, 'r')
+        values = data[first:last, :len(meta['gold_types'])]
+        return PriceMatrix(dates[first:last], meta['gold_types'], values)
+
+    @log_function_call
+    def append(self, date, prices_data):
+        """
+        Bir günün fiyatlarını önbelleğe ekler; tarih son kayıtla aynıysa satırı yerinde günceller.
+
+        Son kayıttan eski bir tarih gelirse sıralamayı korumak için satırlar kaydırılır. Büyütme ve kaydırma
+        yeni veri dosyasında yapılır; yeni dosya ona işaret eden meta bilgisi yazılınca yayınlanır.
+
+        Args:
+            date (str): Fiyat tarihi (YYYY-MM-DD).
+            prices_data (dict): Altın fiyat verileri.
+        """
+        with _write_lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            meta = self._read_meta()
+            if meta is None:
+                meta = {'version': CACHE_VERSION, 'dates': [], 'gold_types': []}
+                self._allocate(meta, config.PRICE_CACHE_INITIAL_ROWS, max(len(prices_data), 1) * 2)
+
+            # Yeni altın türleri ve kapasite (mevcut dosyanın şekli türler eklenmeden önce saklanır)
+            old_shape = (len(meta['dates']), len(meta['gold_types']))
+            type_index = {gold_type: position for position, gold_type in enumerate(meta['gold_types'])}
+            for gold_type in prices_data:
+                if gold_type not in type_index:
+                    type_index[gold_type] = len(meta['gold_types'])
+                    meta['gold_types'].append(gold_type)
+
+            dates = meta['dates']
+            row = int(np.searchsorted(dates, date, side='left'))
+            exists = row < len(dates) and dates[row] == date
+            rows_needed = len(dates) + (0 if exists else 1)
+            grow = rows_needed > meta['capacity'] or len(meta['gold_types']) > meta['type_capacity']
+            shift = not exists and row < len(dates)
+
+            if grow or shift:
+                # Büyütme ve araya ekleme yeni dosyada yapılır; yarıda kalan işlem tarihlerle satırları kaydırmaz
+                old_data = self._open_data(meta, 'r')
+                self._allocate(
+                    meta,
+                    max(meta['capacity'], rows_needed * 2) if rows_needed > meta['capacity'] else meta['capacity'],
+                    max(meta['type_capacity'], len(meta['gold_types']) * 2)
+                    if len(meta['gold_types']) > meta['type_capacity'] else meta['type_capacity'],
+                    old_data=old_data,
+                    old_shape=old_shape,
+                    insert_at=None if exists else row
+                )
+                del old_data
+
+            if not exists:
+                dates.insert(row, date)
+
+            data = self._open_data(meta, 'r+')
+            data[row] = np.nan
+            for gold_type, prices in prices_data.items():
+                column = type_index[gold_type]
+                data[row, column, 0] = prices.get(PRICE_FIELDS[0], np.nan)
+                data[row, column, 1] = prices.get(PRICE_FIELDS[1], np.nan)
+            data.flush()
+            del data
+
+            self._write_meta(meta)
+
+    @log_function_call
+    def rebuild(self, db_handler):
+        """
+        Önbelleği veritabanındaki tüm fiyat geçmişinden yeniden oluşturur.
+
+        Args:
+            db_handler (DatabaseHandler): Veritabanı işleyicisi.
+
+        Returns:
+            int: Önbellekteki tarih sayısı.
+        """
+        started_at = datetime.now(timezone.utc)
+        matrix = PriceMatrix.from_documents(db_handler.iter_gold_prices())
+        with _write_lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            meta = {'version': CACHE_VERSION, 'dates': [], 'gold_types': []}
+            self._allocate(meta, max(len(matrix) * 2, config.PRICE_CACHE_INITIAL_ROWS),
+                           max(len(matrix.gold_types) * 2, 1))
+
+            data = self._open_data(meta, 'r+')
+            data[:len(matrix), :len(matrix.gold_types)] = matrix.values
+            data.flush()
+            del data
+
+            meta['dates'] = matrix.dates
+            meta['gold_types'] = matrix.gold_types
+            meta['synced_at'] = started_at.isoformat()
+            self._write_meta(meta)
+
+        logger.info(f"Fiyat önbelleği yeniden oluşturuldu: {len(matrix)} tarih × {len(matrix.gold_types)} altın türü")
+        return len(matrix)
+
+    @log_function_call
+    def sync(self, db_handler):
+        """
+        Önbelleği veritabanıyla eşitler: önbellek yoksa (veya hiç eşitlenmediyse) yeniden oluşturur. Varsa
+        son eşitlemeden beri yazılmış eski günleri ve son önbellekli tarihten itibaren (o gün dahil) eksik
+        kayıtları ekler. Eski günlerin değişikliği belgelerdeki 'updated_at' alanından anlaşılır.
+
+        Args:
+            db_handler (DatabaseHandler): Veritabanı işleyicisi.
+
+        Returns:
+            int: Eklenen veya güncellenen tarih sayısı.
+        """
+        meta = self._read_meta()
+        if meta is None or not meta['dates'] or 'synced_at' not in meta:
+            return self.rebuild(db_handler)
+
+        started_at = datetime.now(timezone.utc)
+        last_date = meta['dates'][-1]
+        updated_after = datetime.fromisoformat(meta['synced_at']) - SYNC_OVERLAP
+
+        updated = 0
+        for document in db_handler.iter_gold_prices(end_date=last_date, updated_after=updated_after):
+            if document['date'] != last_date:
+                self.append(document['date'], document.get('data', {}))
+                updated += 1
+        for document in db_handler.iter_gold_prices(last_date):
+            self.append(document['date'], document.get('data', {}))
+            updated += 1
+
+        with _write_lock:
+            meta = self._read_meta()
+            meta['synced_at'] = started_at.isoformat()
+            self._write_meta(meta)
+        return updated
+
+
+def load_history(db_handler, start_date=None, end_date=None, batch_size=config.BACKFILL_BATCH_SIZE):
+    """
+    Fiyat geçmişini önbellek etkinse eşitlenmiş önbellekten, değilse veritabanından matris olarak yükler.
+
+    Args:
+        db_handler (DatabaseHandler): Veritabanı işleyicisi.
+        start_date (str, optional): Başlangıç tarihi (dahil).
+        end_date (str, optional): Bitiş tarihi (dahil).
+        batch_size (int): Veritabanından okurken parti boyutu.
+
+    Returns:
+        PriceMatrix: Fiyat matrisi.
+    """
+    if config.PRICE_CACHE_ENABLED:
+        try:
+            cache = PriceHistoryCache()
+            cache.sync(db_handler)
+            matrix = cache.load_matrix(start_date, end_date)
+            if matrix is not None:
+                return matrix
+        except (OSError, ValueError) as e:
+            logger.warning(f"Fiyat önbelleği okunamadı, veritabanı kullanılacak: {str(e)}")
+
+    return PriceMatrix.from_documents(db_handler.iter_gold_prices(start_date, end_date, batch_size=batch_size))
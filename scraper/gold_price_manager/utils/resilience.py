@@ -0,0 +1,288 @@
+"""
+Dayanıklılık modülü - Veri kaynakları ve veritabanı çağrıları için ortak yeniden deneme katmanı.
+
+Denemeler arasında üstel artan ve rastgele dağıtılmış (full jitter) bekleme uygulanır; beklemeler
+döngünün toplam süre bütçesini aşamaz ve kapanma isteğiyle hemen kesilir. Her kaynak ve veritabanı
+için bir devre kesici art arda hatalardan sonra çağrıları bir süre beklemeden reddeder.
+"""
+import contextvars
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+import config
+from utils.logger import setup_logger
+from utils.metrics import registry as metrics
+
+logger = setup_logger(__name__)
+
+# Devre kesici durumları
+STATE_CLOSED = 'closed'        # Çağrılar normal geçer
+STATE_OPEN = 'open'            # Çağrılar beklemeden reddedilir
+STATE_HALF_OPEN = 'half_open'  # Tek bir deneme çağrısına izin verilir
+STATE_CODES = {STATE_CLOSED: 0, STATE_OPEN: 1, STATE_HALF_OPEN: 2}
+
+# Etkin döngünün süre sınırı (time.monotonic); paralel çekim iş parçacıklarına bağlamla aktarılır
+_cycle_deadline = contextvars.ContextVar('cycle_deadline', default=None)
+
+# Kapanma isteğinde bekleyen tüm yeniden denemeleri uyandıran olay
+_shutdown_event = threading.Event()
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+class CircuitOpenError(Exception):
+    """
+    Devre kesici açıkken yapılan çağrıda fırlatılır.
+    """
+
+
+class RetryPolicy:
+    """
+    Üstel artan, rastgele dağıtılmış bekleme süreleri üreten yeniden deneme politikası.
+    """
+
+    def __init__(self, max_attempts=config.RETRY_ATTEMPTS, base_delay=config.RETRY_DELAY_SECONDS,
+                 max_delay=config.RETRY_MAX_DELAY_SECONDS, multiplier=2.0):
+        """
+        Args:
+            max_attempts (int): İlk çağrı dahil en fazla deneme sayısı.
+            base_delay (float): İlk yeniden denemeden önceki en uzun bekleme (saniye).
+            max_delay (float): Bir beklemenin üst sınırı (saniye).
+            multiplier (float): Her denemede üst sınırın çarpanı.
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+
+    def delay(self, attempt):
+        """
+        Verilen başarısız denemeden sonraki bekleme süresini döndürür (full jitter).
+
+        Args:
+            attempt (int): Başarısız deneme sırası (1'den başlar).
+
+        Returns:
+            float: Bekleme süresi (saniye).
+        """
+        ceiling = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """
+    Art arda hata sayısı eşiği aşınca açılan, bekleme süresinden sonra tek deneme çağrısına
+    izin veren devre kesici.
+    """
+
+    def __init__(self, name, failure_threshold=config.CIRCUIT_FAILURE_THRESHOLD,
+                 reset_seconds=config.CIRCUIT_RESET_SECONDS):
+        """
+        Args:
+            name (str): Kesici adı (ör. 'source:UzmanPara', 'mongodb:gold_prices').
+            failure_threshold (int): Devreyi açan art arda hata sayısı.
+            reset_seconds (float): Açık devrenin deneme çağrısına izin vermeden önce beklediği süre.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.opened_total = 0
+        self.rejected_total = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        Çağrıya izin verilip verilmediğini kontrol eder.
+
+        Raises:
+            CircuitOpenError: Devre açıksa veya deneme çağrısı sürüyorsa.
+        """
+        with self._lock:
+            if self.state == STATE_OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+                self.state = STATE_HALF_OPEN
+                self._trial_running = False
+
+            if self.state == STATE_CLOSED:
+                return
+            if self.state == STATE_HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return
+
+            self.rejected_total += 1
+            retry_in = max(0.0, self.reset_seconds - (time.monotonic() - self._opened_at))
+        raise CircuitOpenError(f"'{self.name}' devresi açık, çağrı reddedildi "
+                               f"(yeniden deneme {retry_in:.0f} sn sonra).")
+
+    def record_success(self):
+        with self._lock:
+            if self.state != STATE_CLOSED:
+                logger.info(f"'{self.name}' devresi kapandı.")
+            self.state = STATE_CLOSED
+            self.failures = 0
+            self._trial_running = False
+
+    def release_trial(self):
+        """
+        Yeniden denenmeyen bir hatayla biten deneme çağrısının kilidini bırakır; durum değişmez ve
+        sonraki çağrı yeni deneme olarak geçer.
+        """
+        with self._lock:
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.state == STATE_HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != STATE_OPEN:
+                    self.opened_total += 1
+                    logger.warning(f"'{self.name}' devresi açıldı: {self.failures} art arda hata, "
+                                   f"{self.reset_seconds:.0f} sn boyunca çağrılar reddedilecek.")
+                self.state = STATE_OPEN
+                self._opened_at = time.monotonic()
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: Kesicinin durumu ve sayaçları.
+        """
+        with self._lock:
+            return {
+                'state': self.state,
+                'state_code': STATE_CODES[self.state],
+                'consecutive_failures': self.failures,
+                'opened_total': self.opened_total,
+                'rejected_total': self.rejected_total,
+            }
+
+
+def get_breaker(name):
+    """
+    Ad için süreç genelinde paylaşılan devre kesiciyi döndürür.
+
+    Args:
+        name (str): Kesici adı.
+
+    Returns:
+        CircuitBreaker: Devre kesici.
+    """
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(name, CircuitBreaker(name))
+    return breaker
+
+
+def breaker_states():
+    """
+    Returns:
+        dict: Kesici adına göre durum ve sayaçlar.
+    """
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.snapshot() for breaker in breakers}
+
+
+metrics.register_collector('circuit_breaker', breaker_states)
+
+
+@contextmanager
+def cycle_deadline(seconds=config.CYCLE_DEADLINE_SECONDS):
+    """
+    Blok içindeki yeniden denemeler için toplam süre bütçesi belirler. Bütçe bittikten sonra
+    yeni bekleme yapılmaz; son hata hemen fırlatılır.
+
+    Args:
+        seconds (float): Süre bütçesi; 0 veya daha azsa sınırsız.
+    """
+    token = _cycle_deadline.set(time.monotonic() + seconds if seconds > 0 else None)
+    try:
+        yield
+    finally:
+        _cycle_deadline.reset(token)
+
+
+def remaining_budget():
+    """
+    Returns:
+        float or None: Etkin döngünün kalan süresi (saniye); bütçe yoksa None.
+    """
+    deadline = _cycle_deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def request_shutdown():
+    """
+    Bekleyen tüm yeniden denemeleri keser; sonraki hatalar beklemeden fırlatılır.
+    """
+    _shutdown_event.set()
+
+
+def call_with_retry(func, retry_on, name, policy=None, breaker=None):
+    """
+    Fonksiyonu yeniden deneme politikası ve devre kesiciyle çağırır.
+
+    Args:
+        func (callable): Argümansız çağrılacak fonksiyon.
+        retry_on (tuple): Yeniden denenecek hata türleri; diğer hatalar hemen fırlatılır.
+        name (str): Loglarda kullanılacak ad.
+        policy (RetryPolicy, optional): Politika. Varsayılan: yapılandırmadaki değerler.
+        breaker (CircuitBreaker, optional): Devre kesici.
+
+    Returns:
+        Fonksiyonun dönüş değeri.
+
+    Raises:
+        CircuitOpenError: Devre açıksa.
+        Exception: Denemeler, süre bütçesi veya kapanma nedeniyle bitince son hata.
+    """
+    policy = policy or RetryPolicy()
+    attempt = 0
+
+    while True:
+        if breaker is not None:
+            breaker.allow()
+
+        attempt += 1
+        try:
+            result = func()
+        except retry_on as e:
+            if breaker is not None:
+                breaker.record_failure()
+            logger.warning(f"[{name}] Hata: {str(e)}. Deneme {attempt}/{policy.max_attempts}.")
+
+            if breaker is not None and breaker.state == STATE_OPEN:
+                logger.error(f"[{name}] Devre açıldı, yeniden denenmeyecek. Son hata: {str(e)}")
+                raise
+            if attempt >= policy.max_attempts:
+                logger.error(f"[{name}] Maksimum deneme sayısına ulaşıldı. Son hata: {str(e)}")
+                raise
+
+            delay = policy.delay(attempt)
+            remaining = remaining_budget()
+            if remaining is not None and remaining <= delay:
+                logger.error(f"[{name}] Döngü süre bütçesi doldu, yeniden denenmeyecek. Son hata: {str(e)}")
+                raise
+
+            logger.info(f"[{name}] {delay:.1f} saniye sonra yeniden denenecek...")
+            if _shutdown_event.wait(delay):
+                logger.warning(f"[{name}] Kapanma istendi, yeniden denenmeyecek.")
+                raise
+            continue
+        except BaseException:
+            # Yeniden denenmeyen hatalar (ör. ayrıştırma hatası) devreyi açmaz ama deneme kilidini bırakır
+            if breaker is not None:
+                breaker.release_trial()
+            raise
+
+        if breaker is not None:
+            breaker.record_success()
+        return result
+
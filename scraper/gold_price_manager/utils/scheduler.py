@@ -0,0 +1,445 @@
+"""
+Zamanlayıcı modülü - Birden fazla işi cron ifadeleri veya sabit aralıklarla tek süreçte çalıştırır.
+
+Desteklenenler: 5 alanlı cron ifadeleri (dakika saat gün ay haftanın_günü), '@every 30s/5m/1h/1d',
+'@hourly', '@daily', rastgele gecikme (jitter), çakışma önleme, kaçırılan çalıştırma politikası ve
+sinyalle düzgün kapanma.
+"""
+import contextvars
+import random
+import re
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import config
+from utils.logger import setup_logger
+from utils.metrics import registry as metrics, summarize_cycle
+from utils.resilience import cycle_deadline, request_shutdown
+
+logger = setup_logger(__name__)
+
+# Kaçırılan çalıştırma politikaları
+MISFIRE_SKIP = 'skip'          # Kaçırılanları atla, bir sonraki zamanı bekle
+MISFIRE_RUN_ONCE = 'run_once'  # Kaçırılanların yerine bir kez hemen çalıştır
+MISFIRE_RUN_ALL = 'run_all'    # Kaçırılan her zaman için sırayla çalıştır
+MISFIRE_POLICIES = (MISFIRE_SKIP, MISFIRE_RUN_ONCE, MISFIRE_RUN_ALL)
+
+_ALIASES = {
+    '@hourly': '0 * * * *',
+    '@daily': '0 0 * * *',
+    '@midnight': '0 0 * * *',
+    '@weekly': '0 0 * * 0',
+    '@monthly': '0 0 1 * *',
+}
+
+_EVERY_PATTERN = re.compile(r'^@every\s+(\d+)\s*([smhd])$')
+_UNIT_SECONDS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# Döngü başına en uzun bekleme (saat değişikliklerine ve kapanmaya hızlı tepki için)
+_MAX_WAIT_SECONDS = 30
+
+# run_all politikasında işin bitip bitmediğinin yeniden kontrol aralığı
+_BUSY_RETRY = timedelta(seconds=1)
+
+
+class CronExpression:
+    """
+    5 alanlı cron ifadesi. Alanlar '*', 'a', 'a-b', '*/n', 'a-b/n' ve virgüllü listeleri destekler;
+    haftanın günü 0-6 (0 ve 7 pazar). Gün ve haftanın günü alanlarından ikisi de kısıtlıysa
+    biri eşleşmesi yeterlidir (standart cron davranışı).
+    """
+
+    _FIELDS = (('minute', 0, 59), ('hour', 0, 23), ('day', 1, 31), ('month', 1, 12), ('weekday', 0, 7))
+
+    def __init__(self, expression):
+        """
+        Args:
+            expression (str): Cron ifadesi.
+
+        Raises:
+            ValueError: İfade geçersizse.
+        """
+        self.expression = expression
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron ifadesi 5 alan içermelidir: '{expression}'")
+
+        self.restricted = {}
+        for (name, low, high), part in zip(self._FIELDS, parts):
+            setattr(self, name, self._parse_field(part, low, high))
+            self.restricted[name] = part != '*'
+
+        # 7 ve 0 pazar; Python'da pazartesi 0, pazar 6
+        self.weekday = {(day - 1) % 7 for day in self.weekday}
+
+    @staticmethod
+    def _parse_field(field, low, high):
+        values = set()
+        for item in field.split(','):
+            step = 1
+            if '/' in item:
+                item, step_text = item.split('/', 1)
+                step = int(step_text)
+                if step <= 0:
+                    raise ValueError(f"Geçersiz adım: '{field}'")
+
+            if item == '*':
+                start, end = low, high
+            elif '-' in item:
+                start, end = (int(value) for value in item.split('-', 1))
+            else:
+                start = int(item)
+                end = high if step > 1 else start
+
+            if start < low or end > high or start > end:
+                raise ValueError(f"Cron alanı aralık dışında: '{field}' ({low}-{high})")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, moment):
+        day_ok = moment.day in self.day
+        weekday_ok = moment.weekday() in self.weekday
+        if self.restricted['day'] and self.restricted['weekday']:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, moment):
+        """
+        Verilen andan sonraki ilk eşleşen dakikayı bulur.
+
+        Args:
+            moment (datetime): Başlangıç anı.
+
+        Returns:
+            datetime: Sonraki çalıştırma zamanı.
+
+        Raises:
+            ValueError: Beş yıl içinde eşleşme yoksa (ör. '0 0 31 2 *').
+        """
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+
+        while candidate < limit:
+            if candidate.month not in self.month:
+                year, month = (candidate.year + 1, 1) if candidate.month == 12 else (candidate.year, candidate.month + 1)
+                candidate = candidate.replace(year=year, month=month, day=1, hour=0, minute=0)
+            elif not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hour:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minute:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+
+        raise ValueError(f"Cron ifadesi hiçbir zaman eşleşmiyor: '{self.expression}'")
+
+    def __str__(self):
+        return self.expression
+
+
+class IntervalSchedule:
+    """
+    Sabit aralıklı zamanlama. Sonraki zaman, bitiş anından değil planlanan zamandan hesaplanır;
+    böylece uzun süren çalıştırmalar takvimi kaydırmaz.
+    """
+
+    def __init__(self, seconds):
+        """
+        Args:
+            seconds (float): Aralık (saniye).
+        """
+        if seconds <= 0:
+            raise ValueError("Aralık pozitif olmalıdır.")
+        self.interval = timedelta(seconds=seconds)
+
+    def next_after(self, moment):
+        return moment + self.interval
+
+    def __str__(self):
+        return f"@every {int(self.interval.total_seconds())}s"
+
+
+def parse_schedule(text):
+    """
+    Zamanlama tanımını ayrıştırır.
+
+    Args:
+        text (str): Cron ifadesi, takma ad (@hourly, @daily, ...) veya '@every N[smhd]'.
+
+    Returns:
+        CronExpression or IntervalSchedule: Zamanlama nesnesi.
+
+    Raises:
+        ValueError: Tanım geçersizse.
+    """
+    text = text.strip()
+    match = _EVERY_PATTERN.match(text)
+    if match:
+        return IntervalSchedule(int(match.group(1)) * _UNIT_SECONDS[match.group(2)])
+    return CronExpression(_ALIASES.get(text, text))
+
+
+def parse_job_specs(text):
+    """
+    'ad=zamanlama;ad=zamanlama' biçimindeki iş tanımlarını ayrıştırır.
+
+    Args:
+        text (str): İş tanımları (ör. 'collect=*/1 * * * *;calculate=@hourly').
+
+    Returns:
+        list: (iş_adı, zamanlama) çiftleri.
+
+    Raises:
+        ValueError: Bir tanım geçersizse.
+    """
+    specs = []
+    for item in text.split(';'):
+        if not item.strip():
+            continue
+        if '=' not in item:
+            raise ValueError(f"İş tanımı 'ad=zamanlama' biçiminde olmalıdır: '{item.strip()}'")
+        name, schedule = item.split('=', 1)
+        specs.append((name.strip(), parse_schedule(schedule)))
+    return specs
+
+
+class Job:
+    """
+    Zamanlanmış bir iş ve çalışma durumu.
+    """
+
+    def __init__(self, name, func, schedule, jitter_seconds=0.0, misfire_policy=MISFIRE_RUN_ONCE,
+                 misfire_grace_seconds=60.0):
+        """
+        Args:
+            name (str): İş adı.
+            func (callable): Çalıştırılacak fonksiyon; False döndürürse çalıştırma başarısız sayılır.
+            schedule (CronExpression or IntervalSchedule): Zamanlama.
+            jitter_seconds (float): Her çalıştırmaya eklenecek en fazla rastgele gecikme.
+            misfire_policy (str): Kaçırılan çalıştırma politikası (MISFIRE_*).
+            misfire_grace_seconds (float): Bu süreden fazla gecikilen çalıştırma kaçırılmış sayılır.
+        """
+        if misfire_policy not in MISFIRE_POLICIES:
+            raise ValueError(f"Geçersiz kaçırılan çalıştırma politikası: '{misfire_policy}'")
+
+        self.name = name
+        self.func = func
+        self.schedule = schedule
+        self.jitter = timedelta(seconds=jitter_seconds)
+        self.misfire_policy = misfire_policy
+        self.misfire_grace = timedelta(seconds=misfire_grace_seconds)
+
+        self.scheduled_at = None  # Takvimdeki (gecikmesiz) zaman
+        self.run_at = None        # Gecikme eklenmiş çalıştırma zamanı
+        self.pending_runs = 0     # run_all politikasında bekleyen çalıştırmalar
+        self.running = False
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.last_started = None
+        self.last_duration = None
+
+    def plan(self, after):
+        """
+        'after' anından sonraki takvim zamanını ve gecikmeli çalıştırma zamanını belirler.
+
+        Args:
+            after (datetime): Referans an.
+        """
+        self.scheduled_at = self.schedule.next_after(after)
+        self.apply_jitter()
+
+    def apply_jitter(self):
+        """
+        Çalıştırma zamanını takvim zamanına rastgele gecikme ekleyerek belirler.
+        """
+        jitter = self.jitter.total_seconds()
+        self.run_at = self.scheduled_at + timedelta(seconds=random.uniform(0, jitter)) if jitter else self.scheduled_at
+
+    def status(self):
+        """
+        Returns:
+            dict: İşin sayaçları ve zamanları.
+        """
+        return {
+            'schedule': str(self.schedule),
+            'next_run': self.run_at.strftime(config.DATETIME_FORMAT) if self.run_at else None,
+            'running': self.running,
+            'runs': self.runs,
+            'failures': self.failures,
+            'skipped': self.skipped,
+            'last_duration_seconds': self.last_duration,
+        }
+
+
+class Scheduler:
+    """
+    İşleri zamanı geldikçe ayrı iş parçacıklarında çalıştıran zamanlayıcı.
+
+    Aynı iş önceki çalıştırması bitmeden yeniden başlatılmaz; her çalıştırmanın yeniden denemeleri
+    config.CYCLE_DEADLINE_SECONDS bütçesiyle sınırlıdır. Durdurulduğunda yeni iş başlatmaz, bekleyen
+    yeniden denemeleri keser ve çalışan işlerin bitmesini bekler.
+    """
+
+    def __init__(self, jobs=None):
+        """
+        Args:
+            jobs (list, optional): Job nesneleri.
+        """
+        self.jobs = list(jobs or [])
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def add_job(self, job):
+        self.jobs.append(job)
+        return job
+
+    def stop(self, *_):
+        """
+        Zamanlayıcıyı durdurur (sinyal işleyicisi olarak da kullanılabilir).
+        """
+        if not self._stop_event.is_set():
+            logger.info("Zamanlayıcı durduruluyor; çalışan işlerin bitmesi bekleniyor...")
+        self._stop_event.set()
+        # Yeniden deneme beklemesindeki işler beklemeden sonlanır
+        request_shutdown()
+
+    def install_signal_handlers(self):
+        """
+        SIGINT ve SIGTERM geldiğinde zamanlayıcıyı düzgünce durdurur. Yalnızca ana iş parçacığından çağrılmalıdır.
+        """
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+
+    def _apply_misfire_policy(self, job, now):
+        """
+        İşin takvim zamanı geçtiyse kaçırılan çalıştırma politikasını uygular.
+
+        Returns:
+            bool: İş şimdi çalıştırılmalıysa True.
+        """
+        if now < job.run_at:
+            return False
+
+        if now - job.run_at <= job.misfire_grace:
+            return True
+
+        # Kaçırılan takvim zamanlarını say ve bir sonraki gelecek zamana ilerle
+        missed = 0
+        while job.scheduled_at <= now:
+            missed += 1
+            job.plan(job.scheduled_at)
+
+        if job.misfire_policy == MISFIRE_SKIP:
+            job.skipped += missed
+            logger.warning(f"'{job.name}' işi {missed} çalıştırmayı kaçırdı, atlanıyor. "
+                           f"Sonraki: {job.run_at.strftime(config.DATETIME_FORMAT)}")
+            return False
+
+        if job.misfire_policy == MISFIRE_RUN_ALL:
+            job.pending_runs += missed
+        logger.warning(f"'{job.name}' işi {missed} çalıştırmayı kaçırdı, şimdi çalıştırılıyor "
+                       f"({job.misfire_policy}).")
+        return True
+
+    def _run_job(self, job):
+        """
+        İşi çalıştırır. Ölçüm açıksa her çalıştırma kendi döngü ağacını oluşturur; eşzamanlı işlerin
+        aralıkları birbirine karışmaz (çağıran taraf işi ayrı bir bağlam kopyasında başlatır).
+        """
+        started = datetime.now()
+        if metrics.enabled:
+            metrics.start_cycle(f"job:{job.name}")
+        failed = True
+        try:
+            with cycle_deadline():
+                failed = job.func() is False
+        except Exception as e:
+            logger.error(f"'{job.name}' işi hata ile sonlandı: {str(e)}", exc_info=True)
+        finally:
+            cycle = metrics.end_cycle(failed=failed) if metrics.enabled else None
+            duration = (datetime.now() - started).total_seconds()
+            with self._lock:
+                job.running = False
+                job.runs += 1
+                job.failures += failed
+                job.last_duration = duration
+            logger.info(f"'{job.name}' işi {'başarısız oldu' if failed else 'tamamlandı'} "
+                        f"({duration:.1f} sn). Sonraki: {job.run_at.strftime(config.DATETIME_FORMAT)}")
+            if cycle is not None:
+                logger.info(f"'{job.name}' işi süreleri: {summarize_cycle(cycle)}")
+                try:
+                    metrics.dump()
+                except OSError as e:
+                    logger.warning(f"Ölçümler yazılamadı: {str(e)}")
+
+    def _dispatch(self, job, now):
+        """
+        İşi çakışma kontrolüyle başlatır ve bir sonraki zamanı planlar.
+        """
+        with self._lock:
+            busy = job.running
+            if not busy:
+                job.running = True
+                job.last_started = now
+
+        if busy and job.pending_runs:
+            # run_all: kaçırılan çalıştırmalar önceki çalıştırma bitince sırayla yapılır
+            job.run_at = now + _BUSY_RETRY
+            return
+
+        if busy:
+            job.skipped += 1
+            logger.warning(f"'{job.name}' işi hâlâ çalışıyor, bu çalıştırma atlandı.")
+        elif job.pending_runs:
+            job.pending_runs -= 1
+
+        # Sonraki zaman bitiş anından değil takvimdeki zamandan hesaplanır
+        if job.pending_runs:
+            job.run_at = now + _BUSY_RETRY
+        elif job.scheduled_at <= now:
+            job.plan(job.scheduled_at)
+        else:
+            job.apply_jitter()
+
+        if not busy:
+            self._executor.submit(contextvars.copy_context().run, self._run_job, job)
+
+    def run(self, run_immediately=False):
+        """
+        Durdurulana kadar işleri çalıştırır.
+
+        Args:
+            run_immediately (bool): True ise tüm işler başlangıçta bir kez hemen çalıştırılır.
+        """
+        if not self.jobs:
+            logger.warning("Zamanlanmış iş yok, zamanlayıcı başlatılmadı.")
+            return
+
+        now = datetime.now()
+        for job in self.jobs:
+            job.plan(now)
+            if run_immediately:
+                job.run_at = now
+            logger.info(f"İş zamanlandı: '{job.name}' ({job.schedule}), "
+                        f"ilk çalıştırma: {job.run_at.strftime(config.DATETIME_FORMAT)}")
+
+        self._executor = ThreadPoolExecutor(max_workers=len(self.jobs), thread_name_prefix='job')
+        try:
+            while not self._stop_event.is_set():
+                now = datetime.now()
+                for job in self.jobs:
+                    if self._apply_misfire_policy(job, now):
+                        self._dispatch(job, now)
+
+                next_run = min(job.run_at for job in self.jobs)
+                wait_seconds = (next_run - datetime.now()).total_seconds()
+                self._stop_event.wait(min(max(wait_seconds, 0.05), _MAX_WAIT_SECONDS))
+        finally:
+            self._executor.shutdown(wait=True)
+            logger.info("Zamanlayıcı durdu. " + ", ".join(
+                f"{job.name}: {job.runs} çalıştırma, {job.failures} hata, {job.skipped} atlama" for job in self.jobs))
@@ -0,0 +1,174 @@
+"""
+Anlık görüntü önbelleği modülü - Tarihe göre fiyat belgelerini süreç içinde boyut sınırı, TTL ve LRU ile önbelleğe alır.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+import config
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Veritabanı başına süreç genelinde paylaşılan önbellekler
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+class SnapshotCache:
+    """
+    Tarih anahtarlı fiyat belgelerini tutan, en az kullanılanı atan ve süresi dolanı yok sayan önbellek.
+
+    En son tarih ayrıca tutulur; böylece 'en son kayıt' sorgusu da önbellekten karşılanabilir. Başka
+    süreçler o günü güncelleyebildiği veya daha yeni bir gün yazabildiği için en son kayıt ve o günün
+    belgesi yalnızca kısa bir süre (latest_ttl_seconds) geçerli sayılır.
+    Döndürülen belgeler kopyadır, çağıranın değişiklikleri önbelleği etkilemez.
+    """
+
+    def __init__(self, max_entries=config.SNAPSHOT_CACHE_MAX_ENTRIES, ttl_seconds=config.SNAPSHOT_CACHE_TTL_SECONDS,
+                 latest_ttl_seconds=config.SNAPSHOT_CACHE_LATEST_TTL_SECONDS):
+        """
+        Args:
+            max_entries (int): En fazla tutulacak belge sayısı.
+            ttl_seconds (float): Bir belgenin geçerli sayılacağı süre (saniye).
+            latest_ttl_seconds (float): En son kaydın geçerli sayılacağı süre (saniye); ttl_seconds'tan
+                uzunsa ttl_seconds kullanılır.
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.latest_ttl_seconds = min(latest_ttl_seconds, ttl_seconds)
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._latest = None  # (tarih, geçerlilik_sonu)
+        self._lock = threading.Lock()
+
+    def _lookup(self, date, now):
+        entry = self._entries.get(date)
+        if entry is None:
+            return None
+        expires_at, document = entry
+        if expires_at <= now:
+            del self._entries[date]
+            return None
+        self._entries.move_to_end(date)
+        return document
+
+    def get(self, date):
+        """
+        Args:
+            date (str): İstenen tarih (YYYY-MM-DD).
+
+        Returns:
+            dict or None: Önbellekteki belgenin kopyası; yoksa veya süresi dolduysa None.
+        """
+        with self._lock:
+            document = self._lookup(date, time.monotonic())
+            if document is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return copy.deepcopy(document)
+
+    def get_latest(self):
+        """
+        Returns:
+            dict or None: En son tarihe ait belgenin kopyası; bilinmiyorsa None.
+        """
+        with self._lock:
+            now = time.monotonic()
+            document = None
+            if self._latest is not None and self._latest[1] > now:
+                document = self._lookup(self._latest[0], now)
+            if document is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return copy.deepcopy(document)
+
+    def put(self, document, latest=False):
+        """
+        Belgeyi önbelleğe ekler veya günceller.
+
+        Args:
+            document (dict): 'date' alanı içeren fiyat belgesi.
+            latest (bool): True ise belge en son kayıt olarak işaretlenir.
+        """
+        date = document['date']
+        with self._lock:
+            now = time.monotonic()
+            latest = latest or (self._latest is not None and date >= self._latest[0])
+            expires_at = now + (self.latest_ttl_seconds if latest else self.ttl_seconds)
+            self._entries[date] = (expires_at, copy.deepcopy(document))
+            self._entries.move_to_end(date)
+            if latest:
+                self._latest = (date, expires_at)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def refresh(self, date, prices_data, document_id=None):
+        """
+        Yazılan günün belgesini yerinde günceller ve en son kayıt olarak işaretler. Belge kimliği
+        verilmez ve önbellekte de bulunmazsa o gün geçersiz kılınır.
+
+        Args:
+            date (str): Yazılan tarih.
+            prices_data (dict): Yazılan fiyat verileri.
+            document_id (ObjectId, optional): Yeni eklenen belgenin kimliği.
+        """
+        with self._lock:
+            if document_id is None:
+                entry = self._entries.get(date)
+                document_id = entry[1].get('_id') if entry else None
+        if document_id is None:
+            self.invalidate(date)
+            return
+        self.put({'_id': document_id, 'date': date, 'data': prices_data}, latest=True)
+
+    def invalidate(self, date=None):
+        """
+        Bir tarihi veya (tarih verilmezse) tüm önbelleği geçersiz kılar.
+
+        Args:
+            date (str, optional): Geçersiz kılınacak tarih.
+        """
+        with self._lock:
+            if date is None:
+                self._entries.clear()
+                self._latest = None
+                return
+            self._entries.pop(date, None)
+            if self._latest is not None and self._latest[0] <= date:
+                self._latest = None
+
+    def stats(self):
+        """
+        Returns:
+            dict: İsabet, ıskalama, isabet oranı ve belge sayısı.
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / total if total else 0.0,
+                'entries': len(self._entries)
+            }
+
+
+def get_snapshot_cache(key):
+    """
+    Anahtar (bağlantı dizesi, veritabanı) için süreç genelinde paylaşılan önbelleği döndürür.
+
+    Args:
+        key (tuple): Önbellek anahtarı.
+
+    Returns:
+        SnapshotCache: Paylaşılan önbellek.
+    """
+    cache = _caches.get(key)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.setdefault(key, SnapshotCache())
+    return cache